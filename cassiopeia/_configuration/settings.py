@@ -1,4 +1,7 @@
-from typing import TypeVar, Type, Dict, Union, List
+from typing import TypeVar, Type, Dict, Union, List, Mapping, Any, Callable, Sequence, Iterable
+from concurrent.futures import ThreadPoolExecutor, Future
+from threading import Lock, get_ident
+import asyncio
 import logging
 import importlib
 import inspect
@@ -13,7 +16,115 @@ T = TypeVar("T")
 logging.basicConfig(format='%(asctime)s: %(message)s', datefmt='%Y-%m-%d %H:%M:%S', level=logging.WARNING)
 
 
-def create_pipeline(service_configs: Dict, enable_ghost_loading: bool, verbose: int = 0) -> DataPipeline:
+def _freeze(value: Any) -> Any:
+    # Converts a query into something hashable so identical queries can be recognized
+    if isinstance(value, Mapping):
+        return tuple(sorted(((key, _freeze(item)) for key, item in value.items()), key=lambda pair: pair[0]))
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    hash(value)
+    return value
+
+
+class CassiopeiaPipeline(DataPipeline):
+    """A DataPipeline that can also be awaited from asyncio code.
+
+    The async methods run the (synchronous) lookup on a worker thread so that the event loop is never blocked. Any Riot
+    API requests made during the lookup are sent on the calling event loop, where rate limiting and retry backoffs are
+    awaited rather than slept through.
+    """
+    def __init__(self, elements: Sequence[Union[DataSource, DataSink]], transformers: Iterable[DataTransformer] = None, max_async_workers: int = 32) -> None:
+        super().__init__(elements, transformers)
+        self._max_async_workers = max_async_workers
+        self._executor = None
+        self._executor_lock = Lock()
+        self._flights = {}  # type: Dict[Any, Future]
+        self._waiting = {}  # type: Dict[int, Future]  # The flight each thread is waiting on
+        self._flights_lock = Lock()
+
+    def get(self, type: Type[T], query: Mapping[str, Any]) -> T:
+        if not getattr(getattr(self, "_cache", None), "single_flight", False):
+            return super().get(type, query)
+
+        try:
+            key = (type, _freeze(query))
+        except TypeError:
+            return super().get(type, query)
+
+        # Concurrent requests for the same object share one lookup: the first thread runs it and the rest wait for it.
+        thread = get_ident()
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = Future()
+                flight.thread = thread
+                self._flights[key] = flight
+            elif self._waits_on(flight, thread):
+                # Waiting would deadlock, because the flight's leader is (maybe indirectly) waiting on a lookup this
+                # thread is running. This includes a lookup that needs itself.
+                flight = None
+            else:
+                self._waiting[thread] = flight
+        if not leader:
+            if flight is None:
+                return super().get(type, query)
+            try:
+                return flight.result()
+            finally:
+                with self._flights_lock:
+                    del self._waiting[thread]
+
+        try:
+            result = super().get(type, query)
+        except BaseException as error:
+            flight.set_exception(error)
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            with self._flights_lock:
+                del self._flights[key]
+
+    def _waits_on(self, flight: Future, thread: int) -> bool:
+        # Whether the leader of `flight` is `thread`, or is waiting on a flight that is led by (or waits on) `thread`.
+        # Must be called with the flights lock held.
+        seen = set()
+        while flight is not None and flight.thread not in seen:
+            if flight.thread == thread:
+                return True
+            seen.add(flight.thread)
+            flight = self._waiting.get(flight.thread)
+        return False
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self._max_async_workers, thread_name_prefix="cassiopeia")
+        return self._executor
+
+    async def run_async(self, function: Callable[..., T], *args, **kwargs) -> T:
+        from ..datastores.common import _running_for
+        loop = asyncio.get_event_loop()
+
+        def run():
+            with _running_for(loop):
+                return function(*args, **kwargs)
+
+        return await loop.run_in_executor(self._get_executor(), run)
+
+    async def get_async(self, type: Type[T], query: Mapping[str, Any]) -> T:
+        return await self.run_async(self.get, type, query)
+
+    async def get_many_async(self, type: Type[T], query: Mapping[str, Any]) -> List[T]:
+        return await self.run_async(lambda: list(self.get_many(type, query)))
+
+
+def create_pipeline(service_configs: Dict, enable_ghost_loading: bool, verbose: int = 0) -> CassiopeiaPipeline:
     transformers = []
 
     # Always use the Riot API transformers
@@ -58,7 +169,7 @@ def create_pipeline(service_configs: Dict, enable_ghost_loading: bool, verbose:
         enable_ghost_transformers(riotapi_transformer)
 
     services.append(PatchSource())
-    pipeline = DataPipeline(services, transformers)
+    pipeline = CassiopeiaPipeline(services, transformers)
 
     # Manually put the cache on the pipeline.
     for datastore in services:
@@ -198,7 +309,7 @@ class Settings(object):
         self.__plugins = settings.get("plugins", _defaults["plugins"])
 
         self.__pipeline_args = settings.get("pipeline", _defaults["pipeline"])
-        self.__pipeline = None  # type: DataPipeline
+        self.__pipeline = None  # type: CassiopeiaPipeline
 
         logging_config = settings.get("logging", _defaults["logging"])
         self.__default_print_calls = logging_config.get("print_calls", _defaults["logging"]["print_calls"])
@@ -216,7 +327,7 @@ class Settings(object):
         self.__default_region = region
 
     @property
-    def pipeline(self) -> DataPipeline:
+    def pipeline(self) -> CassiopeiaPipeline:
         if self.__pipeline is None:
             self.__pipeline = create_pipeline(service_configs=self.__pipeline_args,
                                               enable_ghost_loading=self.__enable_ghost_loading,
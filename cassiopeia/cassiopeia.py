@@ -1,10 +1,14 @@
-from typing import List, Set, Dict, Union, TextIO
+from typing import List, Set, Dict, Union, TextIO, Iterable
+from concurrent.futures import ThreadPoolExecutor
 import arrow
 import datetime
+import time
 
 from .data import Region, Queue, Season
 from .core import Champion, Summoner, Account, ChampionMastery, Rune, Item, Match, Map, SummonerSpell, Realms, ProfileIcon, LanguageStrings, CurrentMatch, ShardStatus, Versions, MatchHistory, Champions, ChampionMasteries, Runes, Items, SummonerSpells, Maps, FeaturedMatches, Locales, ProfileIcons, ChallengerLeague, MasterLeague, SummonerLeagues, LeagueEntries, Patch, VerificationString
+from .core.common import get_latest_version
 from .datastores import common as _common_datastore
+from .datastores.riotapi import common as _riotapi_datastore
 from ._configuration import Settings, load_config, get_default_config
 from . import configuration
 
@@ -43,6 +47,10 @@ def print_calls(calls: bool, api_key: bool = False):
     _common_datastore._print_api_key = api_key
 
 
+def request_priority(priority: str):
+    return _riotapi_datastore.request_priority(priority)
+
+
 # Data endpoints
 
 def get_league_positions(summoner: Summoner, region: Union[Region, str] = None) -> LeagueEntries:
@@ -68,6 +76,10 @@ def get_match(id, region: Union[Region, str] = None) -> Match:
     return Match(id=id, region=region)
 
 
+async def get_match_async(id, region: Union[Region, str] = None) -> Match:
+    return await configuration.settings.pipeline.run_async(lambda: get_match(id=id, region=region).load())
+
+
 def get_featured_matches(region: Union[Region, str] = None) -> FeaturedMatches:
     return FeaturedMatches(region=region)
 
@@ -88,6 +100,10 @@ def get_summoner(*, id: int = None, account: Union[Account, int] = None, name: s
     return Summoner(id=id, account=account, name=name, region=region)
 
 
+async def get_summoner_async(*, id: int = None, account: Union[Account, int] = None, name: str = None, region: Union[Region, str] = None) -> Summoner:
+    return await configuration.settings.pipeline.run_async(lambda: get_summoner(id=id, account=account, name=name, region=region).load())
+
+
 def get_champion(key: Union[str, int], region: Union[Region, str] = None) -> Champion:
     return get_champions(region=region)[key]
 
@@ -148,5 +164,58 @@ def get_version(date: datetime.date = None, region: Union[Region, str] = None) -
     return None
 
 
+_STATIC_DATA = {"champions": Champions, "items": Items, "runes": Runes, "summoner_spells": SummonerSpells, "maps": Maps, "profile_icons": ProfileIcons}
+
+
+def warm_up(regions: Iterable[Union[Region, str]] = None, versions: Iterable[str] = None, locales: Iterable[str] = None, kinds: Iterable[str] = None, max_workers: int = 8) -> Dict[str, float]:
+    """Loads static data concurrently so that it's already in the cache (and Data Dragon's indexes) when it's first used.
+
+    Every combination of the regions, versions, locales, and kinds of static data is loaded. The regions default to the
+    default region, the versions to each region's latest version, the locales to each region's default locale, and the
+    kinds to all of ``"champions"``, ``"items"``, ``"runes"``, ``"summoner_spells"``, ``"maps"``, and ``"profile_icons"``.
+
+    Returns the number of seconds each kind took to load (the slowest of its data sets), plus ``"versions"`` for finding
+    the latest versions and ``"total"``. If anything fails to load, the error is raised once everything else has finished.
+    """
+    if regions is None:
+        regions = [configuration.settings.default_region]
+    regions = [Region(region) for region in regions]
+    if locales is not None:
+        locales = list(locales)
+    kinds = list(_STATIC_DATA) if kinds is None else list(kinds)
+    for kind in kinds:
+        if kind not in _STATIC_DATA:
+            raise ValueError("Unknown kind of static data \"{}\". Valid kinds are {}.".format(kind, ", ".join(_STATIC_DATA)))
+
+    def timed(function, *args):
+        start = time.monotonic()
+        function(*args)
+        return time.monotonic() - start
+
+    def load(kind, region, version, locale):
+        len(_STATIC_DATA[kind](region=region, version=version, locale=locale))
+
+    timings = {}
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        if versions is None:
+            latest = {region: executor.submit(get_latest_version, region=region, endpoint=None) for region in regions}
+            region_versions = {region: [future.result()] for region, future in latest.items()}
+            timings["versions"] = time.monotonic() - start
+        else:
+            versions = list(versions)
+            region_versions = {region: versions for region in regions}
+
+        loads = [(kind, executor.submit(timed, load, kind, region, version, locale))
+                 for region in regions
+                 for version in region_versions[region]
+                 for locale in (locales if locales is not None else [region.default_locale])
+                 for kind in kinds]
+    for kind, future in loads:
+        timings[kind] = max(timings.get(kind, 0.0), future.result())
+    timings["total"] = time.monotonic() - start
+    return timings
+
+
 def get_verification_string(summoner: Summoner) -> VerificationString:
     return VerificationString(summoner=summoner)
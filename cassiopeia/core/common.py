@@ -1,12 +1,14 @@
 from abc import abstractmethod, abstractclassmethod
 import types
-from typing import Mapping, Set, Union, Optional, Type, Generator
+from typing import Mapping, Set, Union, Optional, Type, Generator, Tuple, Any, Callable, Dict
 import functools
 import logging
 from enum import Enum
 import arrow
 import datetime
 import inspect
+import time
+from weakref import WeakKeyDictionary
 
 from merakicommons.ghost import Ghost, ghost_load_on as _ghost_load_on
 from merakicommons.container import SearchableLazyList
@@ -16,6 +18,17 @@ from ..data import Region, Platform
 
 import json  # Can't use ujson here because of the encoder
 
+# These can't use the encoder either, so to_json converts the values it would handle before serializing with them
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
 
 LOGGER = logging.getLogger("core")
 
@@ -56,15 +69,52 @@ def provide_default_region(method):
     return default_region_wrapper
 
 
+# How long the latest versions are remembered for, in seconds (the same as the cache keeps realms)
+LATEST_VERSION_TIMEOUT = 6 * 60 * 60
+
+# The latest version and the latest version of each endpoint for each region, with the time they expire, for each pipeline
+_latest_versions = WeakKeyDictionary()  # type: WeakKeyDictionary
+
+
+def memoized_latest_versions(pipeline: Any, region: Union[Region, str], load: Callable[[], Tuple[str, Mapping[str, str]]]) -> Tuple[str, Mapping[str, str]]:
+    """Returns the latest version and the latest versions of each endpoint for a region, only calling ``load`` to look
+    them up if they haven't been in the last ``LATEST_VERSION_TIMEOUT`` seconds."""
+    try:
+        versions = _latest_versions[pipeline]
+    except KeyError:
+        versions = _latest_versions.setdefault(pipeline, {})  # type: Dict[Union[Region, str], Tuple[float, str, Mapping[str, str]]]
+    entry = versions.get(region)
+    if entry is None or entry[0] < time.monotonic():
+        version, latest_versions = load()
+        entry = versions[region] = (time.monotonic() + LATEST_VERSION_TIMEOUT, version, latest_versions)
+    return entry[1], entry[2]
+
+
 def get_latest_version(region: Union[Region, str], endpoint: Optional[str]):
-    from .staticdata.realm import Realms
+    def load():
+        from .staticdata.realm import Realms
+        realms = Realms(region=region)
+        return realms.version, realms.latest_versions
+
+    version, latest_versions = memoized_latest_versions(configuration.settings.pipeline, region, load)
     if endpoint is not None:
-        return Realms(region=region).latest_versions[endpoint]
+        return latest_versions[endpoint]
     else:
-        return Realms(region=region).version
+        return version
+
+
+def data_slots(renamed: Mapping[str, str], *fields: str) -> Tuple[str, ...]:
+    """Builds the ``__slots__`` of a CoreData type from the fields of its DTO, using the names they are renamed to.
+
+    A ``__dict__`` slot is kept for any other attributes (e.g. fields that Riot adds later), but Python only allocates the
+    dict if one of those is set. Attributes that were never set still raise ``AttributeError``.
+    """
+    return tuple(sorted({renamed.get(field, field) for field in fields})) + ("__dict__",)
 
 
 class CoreData(object):
+    __slots__ = ()
+
     @property
     @abstractclassmethod
     def _renamed(cls) -> Mapping[str, str]:
@@ -79,28 +129,60 @@ class CoreData(object):
             setattr(self, new_key, value)
         return self
 
-    def to_dict(self):
+    def to_dict(self, _convert: Callable[[Any], Any] = None):
+        # Reads every attribute that has been set, whether it is in a slot or in the instance dict
         d = {}
-        attrs = {attrname for attrname in dir(self)} - {attrname for attrname in dir(self.__class__)}
-        for attr in attrs:
-            v = getattr(self, attr)
-            if isinstance(v, CoreData):
-                v = v.to_dict()
-            elif hasattr(v, "__iter__") and not isinstance(v, str):
-                if isinstance(v, dict):
-                    new_v = {}
-                    for k, vi in v.items():
-                        if isinstance(vi, CoreData):
-                            new_v[k] = vi.to_dict()
-                        else:
-                            new_v[k] = vi
-                    v = new_v
-                else:
-                    v = [vi.to_dict() if isinstance(vi, CoreData) else vi for vi in v]
-            d[attr] = v
+        for attr in _slot_names(type(self)):
+            v = getattr(self, attr, _UNSET)
+            if v is not _UNSET:
+                d[attr] = v if type(v) in _PLAIN_TYPES else _to_builtin(v, _convert)
+        for attr, v in getattr(self, "__dict__", {}).items():
+            d[attr] = v if type(v) in _PLAIN_TYPES else _to_builtin(v, _convert)
         return d
 
 
+_SLOT_NAMES = {}  # type: Dict[type, Tuple[str, ...]]
+_UNSET = object()
+_PLAIN_TYPES = frozenset((str, int, float, bool, type(None)))
+
+
+def _slot_names(cls: type) -> Tuple[str, ...]:
+    # The slots of a CoreData type, worked out once per type
+    try:
+        return _SLOT_NAMES[cls]
+    except KeyError:
+        names = tuple(name for base in cls.__mro__ for name in base.__dict__.get("__slots__", ()) if name != "__dict__")
+        _SLOT_NAMES[cls] = names
+        return names
+
+
+def _to_builtin(value: Any, convert: Callable[[Any], Any] = None) -> Any:
+    # Turns CoreData into dicts and containers into dicts and lists, all the way down.
+    # Any other value is passed through `convert` if one is given.
+    if type(value) in _PLAIN_TYPES:
+        return value
+    elif isinstance(value, CoreData):
+        return value.to_dict(convert)
+    elif isinstance(value, dict):
+        return {k: _to_builtin(v, convert) for k, v in value.items()}
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        return [_to_builtin(v, convert) for v in value]
+    elif convert is not None:
+        return convert(value)
+    return value
+
+
+def _json_value(value: Any) -> Any:
+    # Converts the same values that CassiopeiaJsonEncoder does
+    if isinstance(value, Enum):
+        return value.name
+    elif isinstance(value, (datetime.datetime, arrow.Arrow)):
+        return value.isoformat()
+    elif isinstance(value, datetime.timedelta):
+        return value.seconds
+    return value
+
+
 class CoreDataList(list, CoreData):
     def __str__(self):
         return list.__str__(self)
@@ -189,27 +271,46 @@ class CassiopeiaObject(object):
                 self._data[_type] = _type(**insert_this)
         return self
 
-    def to_dict(self):
+    def to_dict(self, _convert: Callable[[Any], Any] = None):
         d = {}
         for data_type in self._data_types:
-            new = self._data[data_type].to_dict()
+            new = self._data[data_type].to_dict(_convert)
             d.update(new)
         return d
 
-    def to_json(self, **kwargs):
-        return json.dumps(self.to_dict(), cls=CassiopeiaJsonEncoder, **kwargs)
+    def to_json(self, fast: bool = False, **kwargs):
+        # With fast=True, orjson or ujson are used if one is installed and no formatting options for the json module are
+        # given. Their output has the same data, but isn't formatted the same way as the json module's (e.g. whitespace
+        # and escaping of non-ASCII characters).
+        if not fast or kwargs or (orjson is None and ujson is None):
+            return json.dumps(self.to_dict(), cls=CassiopeiaJsonEncoder, **kwargs)
+        d = self.to_dict(_json_value)
+        if orjson is not None:
+            return orjson.dumps(d, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        return ujson.dumps(d, escape_forward_slashes=False)
 
     def __json__(self, **kwargs):
         return self.to_json(**kwargs)
 
 
 class GetFromPipeline(type):
+    # For each class: whether its query needs a region, whether it needs a version, and the function that builds it.
+    # These are worked out the first time the class is constructed, because inspecting the signature is slow.
+    _construction = {}  # type: Dict[type, Tuple[bool, bool, Callable[..., dict]]]
+
     def __call__(cls: "CassiopeiaPipelineObject", *args, **kwargs):
-        if 'region' in inspect.signature(cls.__get_query_from_kwargs__).parameters:
+        try:
+            needs_region, needs_version, get_query = GetFromPipeline._construction[cls]
+        except KeyError:
+            get_query = cls.__get_query_from_kwargs__
+            needs_region = 'region' in inspect.signature(get_query).parameters
+            needs_version = hasattr(cls, "version") and cls.__name__ not in ["Realms", "Match"]
+            GetFromPipeline._construction[cls] = (needs_region, needs_version, get_query)
+        if needs_region:
             kwargs = add_region_to_kwargs(kwargs)
         pipeline = configuration.settings.pipeline
-        query = cls.__get_query_from_kwargs__(**kwargs)
-        if hasattr(cls, "version") and query.get("version", None) is None and cls.__name__ not in ["Realms", "Match"]:
+        query = get_query(**kwargs)
+        if needs_version and query.get("version", None) is None:
             query["version"] = get_latest_version(region=query["region"], endpoint=None)
         return pipeline.get(cls, query=query)
 
@@ -353,6 +454,57 @@ class CassiopeiaLazyList(SearchableLazyList, CassiopeiaPipelineObject):
     def __str__(self):
         return SearchableLazyList.__str__(self)
 
+    # The element attributes that `find`, `contains` and `[...]` look up in a hash index instead of searching every element
+    _indexed_attributes = ()  # type: Tuple[str, ...]
+
+    def _search_index(self) -> Tuple[Dict[Any, Any], Dict[str, Any]]:
+        """Returns the index of the elements by the values of their indexed attributes, and by their case-folded string values.
+
+        The index is built the first time it's needed, which generates the rest of the list, and is rebuilt if elements are added.
+        """
+        size = len(self)
+        try:
+            index, folded, indexed_size = self.__index
+            if indexed_size == size:
+                return index, folded
+        except AttributeError:
+            pass
+        index, folded = {}, {}
+        for element in list.__iter__(self):
+            for attribute in self._indexed_attributes:
+                value = getattr(element, attribute, None)
+                if value is None:
+                    continue
+                index.setdefault(value, element)
+                if isinstance(value, str):
+                    folded.setdefault(value.casefold(), element)
+        self.__index = index, folded, size
+        return index, folded
+
+    def _find_indexed(self, item: Any) -> Any:
+        # Only ints and strings are looked up in the index; bools would match ids, and other types are searched normally
+        if type(item) is int:
+            return self._search_index()[0].get(item)
+        if type(item) is str:
+            index, folded = self._search_index()
+            try:
+                return index[item]
+            except KeyError:
+                return folded.get(item.casefold())
+        return None
+
+    def find(self, item: Any, reverse: bool = False) -> Any:
+        if self._indexed_attributes and not reverse:
+            element = self._find_indexed(item)
+            if element is not None:
+                return element
+        return SearchableLazyList.find(self, item, reverse=reverse)
+
+    def contains(self, item: Any) -> bool:
+        if self._indexed_attributes and self._find_indexed(item) is not None:
+            return True
+        return SearchableLazyList.contains(self, item)
+
 
 class CassiopeiaJsonEncoder(json.JSONEncoder):
     def default(self, obj):
@@ -5,7 +5,7 @@ from merakicommons.container import searchable, SearchableList
 
 from .. import configuration
 from ..data import Region, Platform, Tier, Division, Queue
-from .common import CoreData, CoreDataList, CassiopeiaObject, CassiopeiaGhost, CassiopeiaLazyList, provide_default_region, ghost_load_on
+from .common import CoreData, CoreDataList, data_slots, CassiopeiaObject, CassiopeiaGhost, CassiopeiaLazyList, provide_default_region, ghost_load_on
 from ..dto.league import LeaguePositionDto, LeaguePositionsDto,  LeaguesListDto, LeagueListDto, MiniSeriesDto, ChallengerLeagueListDto, MasterLeagueListDto
 from .summoner import Summoner
 
@@ -23,6 +23,8 @@ class MiniSeriesData(CoreData):
 class LeaguePositionData(CoreData):
     _dto_type = LeaguePositionDto
     _renamed = {"miniSeries": "promos", "playerOrTeamId": "summonerId", "playerOrTeamName": "summonerName", "leagueName": "name", "queueType": "queue", "rank": "division"}
+    __slots__ = data_slots(_renamed, "region", "leagueId", "leagueName", "queueType", "tier", "rank", "playerOrTeamId", "playerOrTeamName",
+                           "leaguePoints", "wins", "losses", "veteran", "inactive", "freshBlood", "hotStreak", "miniSeries")
 
     def __call__(self, **kwargs):
         if "miniSeries" in kwargs:
@@ -1,14 +1,14 @@
 import functools
 import arrow
 import datetime
-from typing import List, Dict, Set, Union, Generator
+from typing import List, Dict, Set, Union, Generator, Tuple
 
 from merakicommons.cache import lazy, lazy_property
 from merakicommons.container import searchable, SearchableList, SearchableLazyList, SearchableDictionary
 
 from .. import configuration
 from ..data import Region, Platform, Tier, GameType, GameMode, Queue, Side, Season, Lane, Role, Key
-from .common import CoreData, CoreDataList, CassiopeiaObject, CassiopeiaGhost, CassiopeiaLazyList, provide_default_region, ghost_load_on
+from .common import CoreData, CoreDataList, data_slots, CassiopeiaObject, CassiopeiaGhost, CassiopeiaLazyList, provide_default_region, ghost_load_on
 from ..dto import match as dto
 from .patch import Patch
 from .summoner import Summoner
@@ -17,6 +17,7 @@ from .staticdata.rune import Rune
 from .staticdata.summonerspell import SummonerSpell
 from .staticdata.item import Item
 from .staticdata.map import Map
+from .staticdata.common import interned
 
 
 def load_match_on_attributeerror(method):
@@ -79,6 +80,9 @@ class PositionData(CoreData):
 
 class EventData(CoreData):
     _renamed = {"eventType": "type", "teamId": "side", "pointCaptured": "capturedPoint", "assistingParticipantIds": "assistingParticipants", "skillSlot": "skill"}
+    __slots__ = data_slots(_renamed, "type", "eventType", "timestamp", "participantId", "itemId", "skillSlot", "levelUpType", "wardType", "creatorId",
+                           "killerId", "victimId", "assistingParticipantIds", "position", "teamId", "buildingType", "laneType", "towerType",
+                           "monsterType", "monsterSubType", "beforeId", "afterId", "pointCaptured", "ascendedType")
 
     def __call__(self, **kwargs):
         if "position" in kwargs:
@@ -89,6 +93,8 @@ class EventData(CoreData):
 
 class ParticipantFrameData(CoreData):
     _renamed = {"totalGold": "goldEarned", "minionsKilled": "creepScore", "xp": "experience", "jungleMinionsKilled": "neutralMinionsKilled"}
+    __slots__ = data_slots(_renamed, "participantId", "position", "currentGold", "totalGold", "level", "xp", "minionsKilled", "jungleMinionsKilled",
+                           "dominionScore", "teamScore")
 
     def __call__(self, **kwargs):
         if "position" in kwargs:
@@ -136,10 +142,28 @@ class ParticipantTimelineData(CoreData):
 
 class ParticipantStatsData(CoreData):
     _renamed = {}
+    __slots__ = data_slots(_renamed, "participantId", "win", "champLevel", "kills", "deaths", "assists", "killingSprees", "largestKillingSpree",
+                           "largestMultiKill", "doubleKills", "tripleKills", "quadraKills", "pentaKills", "unrealKills", "largestCriticalStrike",
+                           "totalDamageDealt", "totalDamageDealtToChampions", "physicalDamageDealt", "physicalDamageDealtToChampions",
+                           "magicDamageDealt", "magicDamageDealtToChampions", "trueDamageDealt", "trueDamageDealtToChampions", "totalDamageTaken",
+                           "physicalDamageTaken", "magicalDamageTaken", "trueDamageTaken", "damageSelfMitigated", "damageDealtToObjectives",
+                           "damageDealtToTurrets", "totalHeal", "totalUnitsHealed", "timeCCingOthers", "totalTimeCrowdControlDealt",
+                           "longestTimeSpentLiving", "goldEarned", "goldSpent", "totalMinionsKilled", "neutralMinionsKilled",
+                           "neutralMinionsKilledTeamJungle", "neutralMinionsKilledEnemyJungle", "turretKills", "inhibitorKills", "visionScore",
+                           "wardsPlaced", "wardsKilled", "visionWardsBoughtInGame", "sightWardsBoughtInGame", "firstBloodKill", "firstBloodAssist",
+                           "firstTowerKill", "firstTowerAssist", "firstInhibitorKill", "firstInhibitorAssist", "item0", "item1", "item2", "item3",
+                           "item4", "item5", "item6", "combatPlayerScore", "objectivePlayerScore", "totalPlayerScore", "totalScoreRank",
+                           "playerScore0", "playerScore1", "playerScore2", "playerScore3", "playerScore4", "playerScore5", "playerScore6",
+                           "playerScore7", "playerScore8", "playerScore9", "perkPrimaryStyle", "perkSubStyle", "altarsCaptured",
+                           "altarsNeutralized", "nodeCapture", "nodeCaptureAssist", "nodeNeutralize", "nodeNeutralizeAssist", "teamObjective")
 
 
 class ParticipantData(CoreData):
     _renamed = {"participantId": "id", "spell1Id": "summonerSpellDId", "spell2Id": "summonerSpellFId", "highestAchievedSeasonTier": "rankLastSeason", "bot": "isBot", "profileIcon": "profileIconId"}
+    # Includes the fields of the participant's "player", which are merged in, and the ones set in __call__
+    __slots__ = data_slots(_renamed, "participantId", "championId", "spell1Id", "spell2Id", "highestAchievedSeasonTier", "masteries", "runes",
+                           "stats", "timeline", "side", "bot", "profileIcon", "summonerId", "summonerName", "accountId", "currentAccountId",
+                           "platformId", "currentPlatformId", "matchHistoryUri")
 
     def __call__(self, **kwargs):
         if "stats" in kwargs:
@@ -183,6 +207,8 @@ class TeamData(CoreData):
 
 class MatchReferenceData(CoreData):
     _renamed = {"account_id": "accountId", "gameId": "id", "champion": "championId", "teamId": "side", "platformId": "platform"}
+    __slots__ = data_slots(_renamed, "gameId", "platformId", "champion", "queue", "season", "lane", "role", "creation", "region", "account_id",
+                           "teamId")
 
     def __call__(self, **kwargs):
         if "timestamp" in kwargs:
@@ -350,7 +376,7 @@ class MatchHistory(CassiopeiaLazyList):
 
     @lazy_property
     def champions(self) -> Set[Champion]:
-        return {Champion(id=cid, region=self.region) for cid in self._data[MatchListData].championIds}
+        return {interned(Champion, id=cid, region=self.region) for cid in self._data[MatchListData].championIds}
 
     @property
     def begin_index(self) -> Union[int, None]:
@@ -394,6 +420,35 @@ class Position(CassiopeiaObject):
         return self._data[PositionData].y
 
 
+# The columns of Timeline.participant_frames_array and Timeline.events_table as (name, attribute, dtype).
+# Positions are stored under "position" on the data objects, and are read from there for the x and y columns.
+_PARTICIPANT_FRAME_COLUMNS = (("gold_earned", "goldEarned", "i4"), ("current_gold", "currentGold", "i4"), ("experience", "experience", "i4"),
+                              ("creep_score", "creepScore", "i4"), ("neutral_minions_killed", "neutralMinionsKilled", "i4"), ("level", "level", "i2"),
+                              ("x", "x", "i4"), ("y", "y", "i4"))
+_PARTICIPANT_FRAME_DTYPE = [(name, dtype) for name, attribute, dtype in _PARTICIPANT_FRAME_COLUMNS]
+
+_EVENT_COLUMNS = (("timestamp", "timestamp", "i8"), ("type", "type", "U24"), ("participant_id", "participantId", "i2"), ("creator_id", "creatorId", "i2"),
+                  ("killer_id", "killerId", "i2"), ("victim_id", "victimId", "i2"), ("team_id", "side", "i2"), ("item_id", "itemId", "i4"),
+                  ("before_id", "beforeId", "i4"), ("after_id", "afterId", "i4"), ("skill", "skill", "i2"), ("x", "x", "i4"), ("y", "y", "i4"),
+                  ("level_up_type", "levelUpType", "U24"), ("ward_type", "wardType", "U24"), ("building_type", "buildingType", "U24"),
+                  ("lane_type", "laneType", "U24"), ("tower_type", "towerType", "U24"), ("monster_type", "monsterType", "U24"),
+                  ("monster_sub_type", "monsterSubType", "U24"))
+_EVENT_DTYPE = [("frame", "i4")] + [(name, dtype) for name, attribute, dtype in _EVENT_COLUMNS]
+
+
+# The roles a participant can have in an event, and the EventData attribute that holds the participant ids for each
+_EVENT_ROLES = (("participant", "participantId"), ("creator", "creatorId"), ("killer", "killerId"), ("victim", "victimId"), ("assister", "assistingParticipants"))
+
+
+def _row(data: CoreData, columns) -> tuple:
+    position = getattr(data, "position", None)
+    row = []
+    for name, attribute, dtype in columns:
+        source = position if name in ("x", "y") else data
+        row.append(getattr(source, attribute, "" if dtype.startswith("U") else -1))
+    return tuple(row)
+
+
 @searchable({str: ["type", "tower_type", "ascended_type", "ward_type", "monster_type", "type", "monster_sub_type", "lane_type", "building_type"]})
 class Event(CassiopeiaObject):
     _data_types = {EventData}
@@ -539,11 +594,11 @@ class Frame(CassiopeiaObject):
     def timestamp(self) -> datetime.timedelta:
         return datetime.timedelta(seconds=self._data[FrameData].timestamp/1000)
 
-    @property
+    @lazy_property
     def participant_frames(self) -> Dict[int, ParticipantFrame]:
         return SearchableDictionary({k: ParticipantFrame.from_data(frame) for k, frame in self._data[FrameData].participantFrames.items()})
 
-    @property
+    @lazy_property
     def events(self) -> List[Event]:
         return SearchableList([Event.from_data(event) for event in self._data[FrameData].events])
 
@@ -573,6 +628,7 @@ class Timeline(CassiopeiaGhost):
 
     @CassiopeiaGhost.property(TimelineData)
     @ghost_load_on
+    @lazy
     def frames(self) -> List[Frame]:
         return SearchableList([Frame.from_data(frame) for frame in self._data[TimelineData].frames])
 
@@ -581,6 +637,90 @@ class Timeline(CassiopeiaGhost):
     def frame_interval(self) -> int:
         return self._data[TimelineData].frame_interval
 
+    @CassiopeiaGhost.property(TimelineData)
+    @ghost_load_on
+    def _frame_data(self) -> List[FrameData]:
+        return self._data[TimelineData].frames
+
+    @lazy_property
+    def _events_by_participant(self) -> Dict[tuple, List[Event]]:
+        # Built once: maps (participant id, None) to all of a participant's events, (participant id, role) to the events they
+        # had that role in, and (participant id, role, event type) to those events of one type. Events stay in time order.
+        index = {}
+        for frame in self.frames:
+            for event in frame.events:
+                data = event._data[EventData]
+                involved = []
+                for role, attribute in _EVENT_ROLES:
+                    ids = getattr(data, attribute, ())
+                    if not isinstance(ids, list):
+                        ids = (ids,)
+                    for id in ids:
+                        index.setdefault((id, role), []).append(event)
+                        index.setdefault((id, role, data.type), []).append(event)
+                        if id not in involved:
+                            involved.append(id)
+                for id in involved:
+                    index.setdefault((id, None), []).append(event)
+        return index
+
+    @lazy_property
+    def _frames_by_participant(self) -> Dict[int, Tuple[ParticipantFrame, ...]]:
+        # Shared by every ParticipantTimeline of this timeline, so the sequences are immutable
+        frames = {}
+        for frame in self.frames:
+            for id, participant_frame in frame.participant_frames.items():
+                frames.setdefault(id, []).append(participant_frame)
+        return {id: tuple(participant_frames) for id, participant_frames in frames.items()}
+
+    def _events_for(self, participant_id: int, role: str = None, type: str = None) -> SearchableList:
+        key = (participant_id, role) if type is None else (participant_id, role, type)
+        return SearchableList(self._events_by_participant.get(key, ()))
+
+    def participant_frames_array(self) -> "numpy.ndarray":
+        """Returns the participant frames as a NumPy structured array with shape (number of frames, number of participants).
+
+        Column j holds the participant with the j-th smallest participant id (usually participant j + 1). The fields are
+        gold_earned, current_gold, experience, creep_score, neutral_minions_killed, level, x and y, so e.g.
+        ``array["gold_earned"]`` is every participant's gold at every frame. Missing values are -1.
+
+        The array is built once and shared between calls, so it is read-only; copy it to change it.
+        """
+        return self._participant_frames_array
+
+    @lazy_property
+    def _participant_frames_array(self) -> "numpy.ndarray":
+        import numpy
+        frames = self._frame_data
+        participant_ids = sorted({pid for frame in frames for pid in frame.participantFrames})
+        missing = (-1,) * len(_PARTICIPANT_FRAME_COLUMNS)
+        rows = [[_row(frame.participantFrames[pid], _PARTICIPANT_FRAME_COLUMNS) if pid in frame.participantFrames else missing
+                 for pid in participant_ids]
+                for frame in frames]
+        array = numpy.array(rows, dtype=_PARTICIPANT_FRAME_DTYPE).reshape(len(frames), len(participant_ids))
+        array.flags.writeable = False
+        return array
+
+    def events_table(self) -> "numpy.ndarray":
+        """Returns every event in the timeline as a row of a NumPy structured array, in the order they happened.
+
+        The fields are frame (the index of the frame the event is in), timestamp (in milliseconds), type, participant_id,
+        creator_id, killer_id, victim_id, team_id, item_id, before_id, after_id, skill, x, y, level_up_type, ward_type,
+        building_type, lane_type, tower_type, monster_type and monster_sub_type. Missing numbers are -1 and missing
+        strings are empty.
+
+        The array is built once and shared between calls, so it is read-only; copy it to change it.
+        """
+        return self._events_table
+
+    @lazy_property
+    def _events_table(self) -> "numpy.ndarray":
+        import numpy
+        rows = [(i,) + _row(event, _EVENT_COLUMNS) for i, frame in enumerate(self._frame_data) for event in frame.events]
+        array = numpy.array(rows, dtype=_EVENT_DTYPE)
+        array.flags.writeable = False
+        return array
+
 
 class ParticipantTimeline(CassiopeiaObject):
     _data_types = {ParticipantTimelineData}
@@ -591,59 +731,25 @@ class ParticipantTimeline(CassiopeiaObject):
         self.__match = match
         return self
 
-    @property
-    def frames(self):
-        these = []
-        for frame in self.__match.timeline.frames:
-            for pid, pframe in frame.participant_frames.items():
-                if pid == self.id:
-                    these.append(pframe)
-        return these
+    @lazy_property
+    def frames(self) -> List[ParticipantFrame]:
+        return list(self.__match.timeline._frames_by_participant.get(self.id, ()))
 
     @property
     def events(self):
-        my_events = []
-        timeline = self.__match.timeline
-        for frame in timeline.frames:
-            for event in frame.events:
-                try:
-                    if event.participant_id == self.id:
-                        my_events.append(event)
-                except AttributeError:
-                    pass
-                try:
-                    if event.creator_id == self.id:
-                        my_events.append(event)
-                except AttributeError:
-                    pass
-                try:
-                    if event.killer_id == self.id:
-                        my_events.append(event)
-                except AttributeError:
-                    pass
-                try:
-                    if event.victim_id == self.id:
-                        my_events.append(event)
-                except AttributeError:
-                    pass
-                try:
-                    if self.id in event.assisting_participants:
-                        my_events.append(event)
-                except AttributeError:
-                    pass
-        return SearchableList(my_events)
+        return self.__match.timeline._events_for(self.id)
 
     @property
     def champion_kills(self):
-        return self.events.filter(lambda event: event.type == "CHAMPION_KILL" and event.killer_id == self.id)
+        return self.__match.timeline._events_for(self.id, "killer", "CHAMPION_KILL")
 
     @property
     def champion_deaths(self):
-        return self.events.filter(lambda event: event.type == "CHAMPION_KILL" and event.victim_id == self.id)
+        return self.__match.timeline._events_for(self.id, "victim", "CHAMPION_KILL")
 
     @property
     def champion_assists(self):
-        return self.events.filter(lambda event: event.type == "CHAMPION_KILL" and self.id in event.assisting_participants)
+        return self.__match.timeline._events_for(self.id, "assister", "CHAMPION_KILL")
 
     @property
     def lane(self) -> str:
@@ -831,7 +937,7 @@ class ParticipantStats(CassiopeiaObject):
                self._data[ParticipantStatsData].item6
         ]
         version = _choose_staticdata_version(self.__match)
-        return SearchableList([Item(id=id, version=version, region=self.__match.region) if id else None for id in ids])
+        return SearchableList([interned(Item, id=id, version=version, region=self.__match.region) if id else None for id in ids])
 
     @property
     @load_match_on_attributeerror
@@ -1106,7 +1212,7 @@ class Participant(CassiopeiaObject):
     @load_match_on_attributeerror
     def runes(self) -> Dict["Rune", int]:
         version = _choose_staticdata_version(self.__match)
-        return SearchableDictionary({Rune(id=rune_id, version=version, region=self.__match.region): perk_vars
+        return SearchableDictionary({interned(Rune, id=rune_id, version=version, region=self.__match.region): perk_vars
             for rune_id, perk_vars in self._data[ParticipantData].runes.items()})
 
     @lazy_property
@@ -1125,13 +1231,13 @@ class Participant(CassiopeiaObject):
     @load_match_on_attributeerror
     def summoner_spell_d(self) -> SummonerSpell:
         version = _choose_staticdata_version(self.__match)
-        return SummonerSpell(id=self._data[ParticipantData].summonerSpellDId, version=version, region=self.__match.region)
+        return interned(SummonerSpell, id=self._data[ParticipantData].summonerSpellDId, version=version, region=self.__match.region)
 
     @lazy_property
     @load_match_on_attributeerror
     def summoner_spell_f(self) -> SummonerSpell:
         version = _choose_staticdata_version(self.__match)
-        return SummonerSpell(id=self._data[ParticipantData].summonerSpellFId, version=version, region=self.__match.region)
+        return interned(SummonerSpell, id=self._data[ParticipantData].summonerSpellFId, version=version, region=self.__match.region)
 
     @lazy_property
     @load_match_on_attributeerror
@@ -1143,7 +1249,7 @@ class Participant(CassiopeiaObject):
     def champion(self) -> "Champion":
         # See ParticipantStats for info
         version = _choose_staticdata_version(self.__match)
-        return Champion(id=self._data[ParticipantData].championId, version=version, region=self.__match.region)
+        return interned(Champion, id=self._data[ParticipantData].championId, version=version, region=self.__match.region)
 
     # All the Player data from ParticipantIdentities.player is contained in the Summoner class.
     # The non-current accountId and platformId should never be relevant/used, and can be deleted from our type system.
@@ -1219,7 +1325,7 @@ class Team(CassiopeiaObject):
 
     @property
     def bans(self) -> List["Champion"]:
-        return [Champion(id=champion_id, version=self.__match.version, region=self.__match.region) if champion_id != -1 else None for champion_id in self._data[TeamData].bans]
+        return [interned(Champion, id=champion_id, version=self.__match.version, region=self.__match.region) if champion_id != -1 else None for champion_id in self._data[TeamData].bans]
 
     @property
     def baron_kills(self) -> int:
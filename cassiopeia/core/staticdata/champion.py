@@ -126,6 +126,7 @@ class ChampionData(CoreData):
 
 class Champions(CassiopeiaLazyList):
     _data_types = {ChampionListData}
+    _indexed_attributes = ("id", "key", "name")
 
     @provide_default_region
     def __init__(self, *, region: Union[Region, str] = None, version: str = None, locale: str = None, included_data: Set[str] = None):
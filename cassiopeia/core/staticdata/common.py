@@ -1,9 +1,61 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Type, TypeVar, Union, Tuple
+from weakref import WeakKeyDictionary
+
 from merakicommons.container import searchable
 from merakicommons.cache import lazy_property
 from PIL.Image import Image as PILImage
 
 from ... import configuration
-from ..common import CoreData, CassiopeiaObject
+from ...data import Region
+from ..common import CoreData, CassiopeiaObject, get_latest_version
+
+T = TypeVar("T")
+
+# How many shared static data instances are kept for each pipeline. This is enough for every champion, item, rune and
+# summoner spell of several versions and locales; past it, the least recently used ones are dropped.
+INTERNED_MAX_ENTRIES = 4096
+
+# The shared static data instances for each pipeline, keyed by (type, id, version, region, locale), least recently used first
+_interned = WeakKeyDictionary()  # type: WeakKeyDictionary
+_interned_lock = Lock()
+
+
+def interned(type: Type[T], id: int, region: Union[Region, str], version: str = None, locale: str = None) -> T:
+    """Returns the shared instance of a champion, item, summoner spell, etc. by id.
+
+    The first request for a piece of static data constructs it through the pipeline, and every later request with the
+    same id, version, region and locale returns that same object, so data that appears in every match (like the
+    champions, items and summoner spells of each participant) doesn't go through the pipeline again. If no version is
+    given, the latest version is used. Only the ``INTERNED_MAX_ENTRIES`` most recently used instances are kept.
+    """
+    region = Region(region)
+    if locale is None:
+        locale = region.default_locale
+    if version is None:
+        version = get_latest_version(region=region, endpoint=None)
+    pipeline = configuration.settings.pipeline
+    key = (type, id, version, region, locale)
+    with _interned_lock:
+        try:
+            instances = _interned[pipeline]
+        except KeyError:
+            instances = _interned[pipeline] = OrderedDict()  # type: OrderedDict[Tuple, CassiopeiaObject]
+        try:
+            instance = instances[key]
+        except KeyError:
+            pass
+        else:
+            instances.move_to_end(key)
+            return instance
+    # Constructing goes through the pipeline, so do it outside the lock
+    instance = type(id=id, version=version, region=region, locale=locale)
+    with _interned_lock:
+        instance = instances.setdefault(key, instance)
+        while len(instances) > INTERNED_MAX_ENTRIES:
+            instances.popitem(last=False)
+    return instance
 
 
 class SpriteData(CoreData):
@@ -69,6 +69,7 @@ class ItemData(CoreData):
 
 class Items(CassiopeiaLazyList):
     _data_types = {ItemListData}
+    _indexed_attributes = ("id", "name")
 
     @provide_default_region
     def __init__(self, *, region: Union[Region, str] = None, version: str = None, locale: str = None, included_data: Set[str] = None):
@@ -37,6 +37,7 @@ class MapData(CoreData):
 
 class Maps(CassiopeiaLazyList):
     _data_types = {MapListData}
+    _indexed_attributes = ("id", "name")
 
     @provide_default_region
     def __init__(self, *, region: Union[Region, str] = None, version: str = None, locale: str = None):
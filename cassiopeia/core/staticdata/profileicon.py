@@ -41,6 +41,7 @@ class ProfileIconData(CoreData):
 
 class ProfileIcons(CassiopeiaLazyList):
     _data_types = {ProfileIconListData}
+    _indexed_attributes = ("id", "name")
 
     @provide_default_region
     def __init__(self, *, region: Union[Region, str] = None, version: str = None, locale: str = None):
@@ -43,6 +43,7 @@ class RuneImageData(CoreData):
 
 class Runes(CassiopeiaLazyList):
     _data_types = {RuneListData}
+    _indexed_attributes = ("id", "name")
 
     @provide_default_region
     def __init__(self, *, region: Union[Region, str] = None, version: str = None, locale: str = None, included_data: Set[str] = None):
@@ -49,6 +49,7 @@ class SummonerSpellData(CoreData):
 
 class SummonerSpells(CassiopeiaLazyList):
     _data_types = {SummonerSpellListData}
+    _indexed_attributes = ("id", "key", "name")
 
     @provide_default_region
     def __init__(self, *, region: Union[Region, str] = None, version: str = None, locale: str = None, included_data: Set[str] = None):
@@ -119,7 +120,7 @@ class SpellVars(CassiopeiaObject):
         return self._data[SpellVarsData].key
 
 
-@searchable({str: ["name", "key", "keywords"]})
+@searchable({str: ["name", "key", "keywords"], int: ["id"]})
 class SummonerSpell(CassiopeiaGhost):
     _data_types = {SummonerSpellData}
 
@@ -3,3 +3,4 @@ from .riotapi import RiotAPI
 from .ddragon import DDragon
 from .ghost import UnloadedGhostStore
 from .patch import PatchSource
+from .sqlite import SQLiteStore
@@ -2,9 +2,9 @@ from typing import Type, Mapping, Any, Iterable, TypeVar, Tuple, Callable, Gener
 import datetime
 
 from datapipelines import DataSource, DataSink, PipelineContext, validate_query, NotFoundError
-from merakicommons.cache import Cache as CommonsCache
 
 from . import uniquekeys
+from .cachestore import CacheStore
 from ..core.staticdata.champion import ChampionData, ChampionListData, Champion, Champions
 from ..core.staticdata.rune import RuneData, RuneListData, Rune, Runes
 from ..core.staticdata.item import ItemData, ItemListData, Item, Items
@@ -61,8 +61,14 @@ default_expirations = {
 
 
 class Cache(DataSource, DataSink):
-    def __init__(self, expirations: Mapping[type, float] = None) -> None:
-        self._cache = CommonsCache()
+    def __init__(self, expirations: Mapping[type, float] = None, stripes: int = 16, single_flight: bool = True, max_entries: Mapping[type, int] = None, eviction_policy: str = "lru", sweep_interval: float = None, sweep_batch: int = 1000) -> None:
+        if max_entries is not None:
+            max_entries = {globals()[key] if isinstance(key, str) else key: value for key, value in max_entries.items()}
+        self._cache = CacheStore(stripes=stripes, max_entries=max_entries, eviction_policy=eviction_policy)
+        if sweep_interval is not None:
+            self._cache.start_sweeper(sweep_interval, sweep_batch)
+        # When set, a CassiopeiaPipeline lets only one thread at a time fetch a given object past the cache
+        self.single_flight = single_flight
         self._expirations = dict(expirations) if expirations is not None else default_expirations
         for key, value in list(self._expirations.items()):
             if isinstance(key, str):
@@ -115,31 +121,28 @@ class Cache(DataSource, DataSink):
                 yield key, item
 
     def _put(self, type: Type[T], item: T, key_function: Callable[[T], Any], context: PipelineContext = None) -> None:
-        try:
-            expire_seconds = self._expirations[type]
-        except KeyError:
-            expire_seconds = -1
-
-        if expire_seconds != 0:
-            keys = key_function(item)
-            for key in keys:
-                self._cache.put(type, key, item, expire_seconds)
+        self._put_many(type, (item,), key_function, context)
 
     def _put_many(self, type: Type[T], items: Iterable[T], key_function: Callable[[T], Any], context: PipelineContext = None) -> None:
-        expire_seconds = self._expirations.get(type, default_expirations[type])
-        for key, item in Cache._put_many_generator(items, key_function):
-            self._cache.put(type, key, item, expire_seconds)
+        expire_seconds = self._expirations.get(type, default_expirations.get(type, -1))
+        if expire_seconds != 0:
+            self._cache.put_many(type, Cache._put_many_generator(items, key_function), expire_seconds)
 
     def clear(self, type: Type[T] = None):
-        if type is None:
-            for key in self._cache._data:
-                self._cache._data[key].clear()
-        else:
-            self._cache._data[type].clear()
+        self._cache.clear(type)
 
     def expire(self, type: Type[T] = None):
         self._cache.expire(type)
 
+    def stop_sweeper(self) -> None:
+        self._cache.stop_sweeper()
+
+    def statistics(self, type: Type[T] = None) -> Mapping[Type[T], Mapping[str, int]]:
+        return self._cache.statistics(type)
+
+    def reset_statistics(self, type: Type[T] = None) -> None:
+        self._cache.reset_statistics(type)
+
 
     ###################
     # Champion Status #
@@ -180,8 +183,7 @@ class Cache(DataSource, DataSink):
     @put.register(ChampionStatusListData)
     def put_champion_status_list(self, item: ChampionStatusListData, context: PipelineContext = None) -> None:
         self._put(ChampionStatusListData, item, uniquekeys.for_champion_status_list, context=context)
-        for csd in item:
-            self._put(ChampionStatusData, csd, uniquekeys.for_champion_status, context=context)
+        self._put_many(ChampionStatusData, item, uniquekeys.for_champion_status, context=context)
 
     @put_many.register(ChampionStatusListData)
     def put_many_champion_status_list(self, items: Iterable[ChampionStatusListData], context: PipelineContext = None) -> None:
@@ -236,8 +238,7 @@ class Cache(DataSource, DataSink):
     @put.register(ChampionMasteries)
     def put_champion_masteries(self, item: ChampionMasteries, context: PipelineContext = None) -> None:
         self._put(ChampionMasteries, item, uniquekeys.for_champion_masteries, context=context)
-        for cm in item:
-            self._put(ChampionMastery, cm, uniquekeys.for_champion_mastery, context=context)
+        self._put_many(ChampionMastery, item, uniquekeys.for_champion_mastery, context=context)
 
     @put_many.register(ChampionMasteries)
     def put_many_champion_masteries(self, items: Iterable[ChampionMasteries], context: PipelineContext = None) -> None:
@@ -375,8 +376,7 @@ class Cache(DataSource, DataSink):
     @put.register(Champions)
     def put_champions(self, champions: Champions, context: PipelineContext = None) -> None:
         self._put(Champions, champions, uniquekeys.for_champions, context=context)
-        for champion in champions:
-            self._put(Champion, champion, uniquekeys.for_champion, context=context)
+        self._put_many(Champion, champions, uniquekeys.for_champion, context=context)
 
     @put_many.register(Champions)
     def put_many_champions(self, champions: Iterable[Champions], context: PipelineContext = None) -> None:
@@ -426,8 +426,7 @@ class Cache(DataSource, DataSink):
     @put.register(Items)
     def put_items(self, items: Items, context: PipelineContext = None) -> None:
         self._put(Items, items, uniquekeys.for_items, context=context)
-        for item in items:
-            self._put(Item, item, uniquekeys.for_item, context=context)
+        self._put_many(Item, items, uniquekeys.for_item, context=context)
 
     @put_many.register(Items)
     def put_many_items(self, many_items: Iterable[Items], context: PipelineContext = None) -> None:
@@ -526,8 +525,7 @@ class Cache(DataSource, DataSink):
     @put.register(Maps)
     def put_maps(self, item: Maps, context: PipelineContext = None) -> None:
         self._put(Maps, item, uniquekeys.for_maps, context=context)
-        for map in item:
-            self._put(Map, map, uniquekeys.for_map, context=context)
+        self._put_many(Map, item, uniquekeys.for_map, context=context)
 
     @put_many.register(Maps)
     def put_many_maps(self, items: Iterable[Maps], context: PipelineContext = None) -> None:
@@ -577,8 +575,7 @@ class Cache(DataSource, DataSink):
     @put.register(ProfileIcons)
     def put_profile_icons(self, item: ProfileIcons, context: PipelineContext = None) -> None:
         self._put(ProfileIcons, item, uniquekeys.for_profile_icons, context=context)
-        for profile_icon in item:
-            self._put(ProfileIcon, profile_icon, uniquekeys.for_profile_icon, context=context)
+        self._put_many(ProfileIcon, item, uniquekeys.for_profile_icon, context=context)
 
     @put_many.register(ProfileIcons)
     def put_many_profile_icons(self, items: Iterable[ProfileIcons], context: PipelineContext = None) -> None:
@@ -657,8 +654,7 @@ class Cache(DataSource, DataSink):
     @put.register(Runes)
     def put_runes(self, item: Runes, context: PipelineContext = None) -> None:
         self._put(Runes, item, uniquekeys.for_runes, context=context)
-        for rune in item:
-            self._put(Rune, rune, uniquekeys.for_rune, context=context)
+        self._put_many(Rune, item, uniquekeys.for_rune, context=context)
 
     @put_many.register(Runes)
     def put_many_runes(self, items: Iterable[Runes], context: PipelineContext = None) -> None:
@@ -708,8 +704,7 @@ class Cache(DataSource, DataSink):
     @put.register(SummonerSpells)
     def put_summoner_spells(self, item: SummonerSpells, context: PipelineContext = None) -> None:
         self._put(SummonerSpells, item, uniquekeys.for_summoner_spells, context=context)
-        for summoner_spell in item:
-            self._put(SummonerSpell, summoner_spell, uniquekeys.for_summoner_spell, context=context)
+        self._put_many(SummonerSpell, item, uniquekeys.for_summoner_spell, context=context)
 
     @put_many.register(SummonerSpells)
     def put_many_summoner_spells(self, items: Iterable[SummonerSpells], context: PipelineContext = None) -> None:
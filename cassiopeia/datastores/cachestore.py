@@ -0,0 +1,500 @@
+from collections import OrderedDict
+from heapq import heapify, heappop, heappush
+from itertools import count
+from threading import Event, Lock, Thread
+from time import monotonic
+from weakref import ref
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Tuple
+
+
+class EvictionPolicy(object):
+    """Decides which key to evict when a bounded stripe is full.
+
+    A policy only tracks keys; the stripe that owns it holds the values and calls it under the stripe's lock.
+    """
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+
+    def hit(self, key: Hashable) -> None:
+        pass
+
+    def miss(self, key: Hashable) -> None:
+        pass
+
+    def add(self, key: Hashable) -> None:
+        pass
+
+    def remove(self, key: Hashable) -> None:
+        pass
+
+    def victim(self) -> Hashable:
+        raise NotImplementedError
+
+    def admit(self, key: Hashable, victim: Hashable) -> bool:
+        return True
+
+    def clear(self) -> None:
+        pass
+
+
+class LRUPolicy(EvictionPolicy):
+    """Evicts the least recently used key."""
+    def __init__(self, capacity: int) -> None:
+        super().__init__(capacity)
+        self._order = OrderedDict()
+
+    def hit(self, key: Hashable) -> None:
+        self._order.move_to_end(key)
+
+    def add(self, key: Hashable) -> None:
+        self._order[key] = None
+
+    def remove(self, key: Hashable) -> None:
+        self._order.pop(key, None)
+
+    def victim(self) -> Hashable:
+        return next(iter(self._order))
+
+    def clear(self) -> None:
+        self._order.clear()
+
+
+class LFUPolicy(EvictionPolicy):
+    """Evicts the least frequently used key, and the least recently used of those on ties. All operations are O(1)."""
+    def __init__(self, capacity: int) -> None:
+        super().__init__(capacity)
+        self._counts = {}  # type: Dict[Hashable, int]
+        self._buckets = {}  # type: Dict[int, OrderedDict]
+        self._min_count = 0
+
+    def _unlink(self, key: Hashable, count: int) -> None:
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+
+    def hit(self, key: Hashable) -> None:
+        count = self._counts[key]
+        self._unlink(key, count)
+        if count == self._min_count and count not in self._buckets:
+            self._min_count = count + 1
+        self._counts[key] = count + 1
+        self._buckets.setdefault(count + 1, OrderedDict())[key] = None
+
+    def add(self, key: Hashable) -> None:
+        self._counts[key] = 1
+        self._buckets.setdefault(1, OrderedDict())[key] = None
+        self._min_count = 1
+
+    def remove(self, key: Hashable) -> None:
+        count = self._counts.pop(key, None)
+        if count is not None:
+            self._unlink(key, count)
+
+    def victim(self) -> Hashable:
+        if self._min_count not in self._buckets:
+            self._min_count = min(self._buckets)
+        return next(iter(self._buckets[self._min_count]))
+
+    def clear(self) -> None:
+        self._counts.clear()
+        self._buckets.clear()
+        self._min_count = 0
+
+
+class _CountMinSketch(object):
+    # Approximate access counts in a fixed amount of memory. Counts saturate at 15 and are halved every `sample_size`
+    # increments so that old popularity fades.
+    _SEEDS = (0x9E3779B1, 0x85EBCA77, 0xC2B2AE3D, 0x27D4EB2F)
+
+    def __init__(self, capacity: int) -> None:
+        bits = 4
+        while 1 << bits < capacity:
+            bits += 1
+        self._shift = 64 - bits
+        self._rows = [[0] * (1 << bits) for _ in self._SEEDS]
+        self._sample_size = 10 * max(capacity, 1)
+        self._increments = 0
+
+    def _indexes(self, key: Hashable) -> List[int]:
+        # Multiplicative hashing; the top bits of the product depend on every bit of the key's hash
+        h = hash(key)
+        return [(((h ^ seed) * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> self._shift for seed in self._SEEDS]
+
+    def increment(self, key: Hashable) -> None:
+        for row, index in zip(self._rows, self._indexes(key)):
+            if row[index] < 15:
+                row[index] += 1
+        self._increments += 1
+        if self._increments >= self._sample_size:
+            self._increments //= 2
+            for row in self._rows:
+                for index, count in enumerate(row):
+                    row[index] = count >> 1
+
+    def estimate(self, key: Hashable) -> int:
+        return min(row[index] for row, index in zip(self._rows, self._indexes(key)))
+
+    def clear(self) -> None:
+        for row in self._rows:
+            for index in range(len(row)):
+                row[index] = 0
+        self._increments = 0
+
+
+class TinyLFUPolicy(LRUPolicy):
+    """LRU eviction with a TinyLFU admission filter.
+
+    A new key only displaces the LRU victim if it has been asked for more often recently, so a scan over many keys that
+    are used once (e.g. crawling match histories) can't flush out the frequently used entries.
+    """
+    def __init__(self, capacity: int) -> None:
+        super().__init__(capacity)
+        self._sketch = _CountMinSketch(capacity)
+
+    def hit(self, key: Hashable) -> None:
+        self._sketch.increment(key)
+        super().hit(key)
+
+    def miss(self, key: Hashable) -> None:
+        self._sketch.increment(key)
+
+    def admit(self, key: Hashable, victim: Hashable) -> bool:
+        return self._sketch.estimate(key) > self._sketch.estimate(victim)
+
+    def clear(self) -> None:
+        super().clear()
+        self._sketch.clear()
+
+
+eviction_policies = {
+    "lru": LRUPolicy,
+    "lfu": LFUPolicy,
+    "tinylfu": TinyLFUPolicy
+}
+
+
+class _Stripe(object):
+    __slots__ = ("lock", "entries", "deadlines", "sequence", "policy", "hits", "misses", "inserts", "evictions", "expirations", "rejections")
+
+    def __init__(self, policy: Optional[EvictionPolicy]) -> None:
+        self.lock = Lock()
+        self.entries = {}  # type: Dict[Hashable, Tuple[Any, Optional[float]]]
+        # A min-heap of (expires, sequence, key) for entries with a timeout. Entries that are replaced or removed leave
+        # their old deadline behind; it is skipped when it reaches the top of the heap.
+        self.deadlines = []  # type: List[Tuple[float, int, Hashable]]
+        self.sequence = count()
+        self.policy = policy
+        self.hits = 0
+        self.misses = 0
+        self.inserts = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.rejections = 0
+
+    def discard(self, key: Hashable) -> None:
+        del self.entries[key]
+        if self.policy is not None:
+            self.policy.remove(key)
+
+    def add_deadline(self, key: Hashable, expires: float) -> None:
+        heappush(self.deadlines, (expires, next(self.sequence), key))
+        if len(self.deadlines) > 2 * len(self.entries) + 64:
+            # Mostly stale deadlines from overwritten entries; rebuild from the live ones
+            self.deadlines = [(expires, next(self.sequence), key) for key, (value, expires) in self.entries.items() if expires is not None]
+            heapify(self.deadlines)
+
+    def expire(self, now: float, limit: Optional[int] = None) -> Tuple[int, int]:
+        """Removes expired entries in deadline order, looking at no more than `limit` deadlines.
+
+        Returns the number of entries removed and the number of deadlines looked at.
+        """
+        removed = 0
+        examined = 0
+        deadlines = self.deadlines
+        while deadlines and deadlines[0][0] <= now and (limit is None or examined < limit):
+            expires, _, key = heappop(deadlines)
+            examined += 1
+            entry = self.entries.get(key)
+            if entry is not None and entry[1] == expires:
+                self.discard(key)
+                removed += 1
+        self.expirations += removed
+        return removed, examined
+
+
+class _TypeSegment(object):
+    """The entries for one type, split over a fixed number of stripes that are selected by key hash.
+
+    Each stripe has its own lock, so threads working with different keys rarely wait on each other. If the type has a
+    maximum number of entries, it is divided between the stripes so that their capacities add up to exactly that maximum
+    (a type bounded below the stripe count gets fewer stripes), and each stripe evicts on its own.
+    """
+    def __init__(self, stripes: int, max_entries: Optional[int] = None, policy: Callable[[int], EvictionPolicy] = LRUPolicy) -> None:
+        if max_entries is None:
+            self._stripes = [_Stripe(None) for _ in range(stripes)]
+        else:
+            max_entries = max(1, max_entries)
+            stripes = min(stripes, max_entries)
+            capacity, remainder = divmod(max_entries, stripes)
+            self._stripes = [_Stripe(policy(capacity + (i < remainder))) for i in range(stripes)]
+        self._next_stripe = 0
+
+    def _stripe(self, key: Hashable) -> _Stripe:
+        return self._stripes[hash(key) % len(self._stripes)]
+
+    def get(self, key: Hashable) -> Any:
+        stripe = self._stripe(key)
+        with stripe.lock:
+            try:
+                value, expires = stripe.entries[key]
+            except KeyError:
+                stripe.misses += 1
+                if stripe.policy is not None:
+                    stripe.policy.miss(key)
+                raise
+            if expires is not None and monotonic() >= expires:
+                stripe.discard(key)
+                stripe.expirations += 1
+                stripe.misses += 1
+                raise KeyError(key)
+            stripe.hits += 1
+            if stripe.policy is not None:
+                stripe.policy.hit(key)
+            return value
+
+    @staticmethod
+    def _insert(stripe: _Stripe, key: Hashable, value: Any, expires: Optional[float]) -> None:
+        # The caller holds the stripe's lock
+        policy = stripe.policy
+        if policy is not None:
+            if key in stripe.entries:
+                policy.hit(key)
+            else:
+                if len(stripe.entries) >= policy.capacity:
+                    victim = policy.victim()
+                    if not policy.admit(key, victim):
+                        stripe.rejections += 1
+                        return
+                    stripe.discard(victim)
+                    stripe.evictions += 1
+                policy.add(key)
+        stripe.entries[key] = (value, expires)
+        if expires is not None:
+            stripe.add_deadline(key, expires)
+        stripe.inserts += 1
+
+    def put(self, key: Hashable, value: Any, timeout: float = -1) -> None:
+        expires = None if timeout == -1 else monotonic() + timeout
+        stripe = self._stripe(key)
+        with stripe.lock:
+            self._insert(stripe, key, value, expires)
+
+    def put_many(self, items: Iterable[Tuple[Hashable, Any]], timeout: float = -1) -> None:
+        """Inserts (key, value) pairs, taking each stripe's lock once for the whole batch."""
+        expires = None if timeout == -1 else monotonic() + timeout
+        by_stripe = {}  # type: Dict[int, List[Tuple[Hashable, Any]]]
+        for key, value in items:
+            by_stripe.setdefault(hash(key) % len(self._stripes), []).append((key, value))
+        for index, batch in by_stripe.items():
+            stripe = self._stripes[index]
+            with stripe.lock:
+                for key, value in batch:
+                    self._insert(stripe, key, value, expires)
+
+    def delete(self, key: Hashable) -> None:
+        stripe = self._stripe(key)
+        with stripe.lock:
+            stripe.discard(key)
+
+    def contains(self, key: Hashable) -> bool:
+        stripe = self._stripe(key)
+        with stripe.lock:
+            return key in stripe.entries
+
+    def clear(self) -> None:
+        for stripe in self._stripes:
+            with stripe.lock:
+                stripe.entries.clear()
+                stripe.deadlines = []
+                if stripe.policy is not None:
+                    stripe.policy.clear()
+
+    def expire(self, limit: Optional[int] = None) -> Tuple[int, int]:
+        """Removes expired entries, looking at no more than `limit` deadlines in total.
+
+        The cost is proportional to the number of expired entries, not the size of the segment. Bounded sweeps start
+        at a different stripe each time so that every stripe gets its turn.
+        """
+        removed = 0
+        examined = 0
+        stripes = len(self._stripes)
+        start = self._next_stripe
+        self._next_stripe = (start + 1) % stripes
+        for i in range(stripes):
+            if limit is not None and examined >= limit:
+                break
+            stripe = self._stripes[(start + i) % stripes]
+            with stripe.lock:
+                stripe_removed, stripe_examined = stripe.expire(monotonic(), None if limit is None else limit - examined)
+            removed += stripe_removed
+            examined += stripe_examined
+        return removed, examined
+
+    def __len__(self) -> int:
+        return sum(len(stripe.entries) for stripe in self._stripes)
+
+    @property
+    def statistics(self) -> Dict[str, int]:
+        statistics = {"hits": 0, "misses": 0, "inserts": 0, "evictions": 0, "expirations": 0, "rejections": 0, "size": 0}
+        for stripe in self._stripes:
+            with stripe.lock:
+                statistics["hits"] += stripe.hits
+                statistics["misses"] += stripe.misses
+                statistics["inserts"] += stripe.inserts
+                statistics["evictions"] += stripe.evictions
+                statistics["expirations"] += stripe.expirations
+                statistics["rejections"] += stripe.rejections
+                statistics["size"] += len(stripe.entries)
+        return statistics
+
+    def reset_statistics(self) -> None:
+        for stripe in self._stripes:
+            with stripe.lock:
+                stripe.hits = 0
+                stripe.misses = 0
+                stripe.inserts = 0
+                stripe.evictions = 0
+                stripe.expirations = 0
+                stripe.rejections = 0
+
+
+class CacheStore(object):
+    """Thread-safe in-memory storage for the Cache datastore.
+
+    Entries are grouped by type and every type is lock-striped by key, so any number of threads can share one store.
+    Timeouts are in seconds, with -1 meaning the entry never expires. Types listed in `max_entries` are bounded and
+    evict according to `eviction_policy` ("lru", "lfu", or "tinylfu"). Hit, miss, insert, eviction, expiration, and
+    rejection counts are kept per type.
+
+    A bounded type never holds more than its `max_entries` keys, but the limit is split between the stripes and each
+    stripe evicts on its own, so a full stripe may evict while others have room, and the recency or frequency order is
+    only kept within each stripe. The limit counts keys, so an object stored under several keys counts once for each.
+
+    Expired entries are never returned, but they are only removed by `expire` or by the background thread started with
+    `start_sweeper`.
+    """
+    def __init__(self, stripes: int = 16, max_entries: Mapping[Any, int] = None, eviction_policy: str = "lru") -> None:
+        if stripes < 1:
+            raise ValueError("A cache needs at least one stripe.")
+        try:
+            self._policy = eviction_policies[eviction_policy.lower()]
+        except KeyError:
+            raise ValueError("Unknown eviction policy \"{}\". Valid policies are: {}".format(eviction_policy, ", ".join(sorted(eviction_policies))))
+        self._max_entries = dict(max_entries) if max_entries is not None else {}
+        self._stripe_count = stripes
+        self._segments = {}  # type: Dict[Any, _TypeSegment]
+        self._next_type = 0
+        self._lock = Lock()
+        self._sweeper = None  # type: Optional[_Sweeper]
+
+    def _segment(self, type: Any) -> _TypeSegment:
+        try:
+            return self._segments[type]
+        except KeyError:
+            with self._lock:
+                segment = self._segments.get(type)
+                if segment is None:
+                    segment = _TypeSegment(self._stripe_count, self._max_entries.get(type), self._policy)
+                    self._segments[type] = segment
+                return segment
+
+    def _types(self, type: Any = None) -> List[Any]:
+        if type is None:
+            with self._lock:
+                return list(self._segments)
+        return [type]
+
+    def get(self, type: Any, key: Hashable) -> Any:
+        return self._segment(type).get(key)
+
+    def put(self, type: Any, key: Hashable, value: Any, timeout: float = -1) -> None:
+        if timeout != 0:
+            self._segment(type).put(key, value, timeout)
+
+    def put_many(self, type: Any, items: Iterable[Tuple[Hashable, Any]], timeout: float = -1) -> None:
+        if timeout != 0:
+            self._segment(type).put_many(items, timeout)
+
+    def delete(self, type: Any, key: Hashable) -> None:
+        self._segment(type).delete(key)
+
+    def contains(self, type: Any, key: Hashable) -> bool:
+        return self._segment(type).contains(key)
+
+    def clear(self, type: Any = None) -> None:
+        for type in self._types(type):
+            self._segment(type).clear()
+
+    def expire(self, type: Any = None, limit: Optional[int] = None) -> int:
+        """Removes expired entries and returns how many were removed.
+
+        With a `limit`, at most that many expiry deadlines are looked at, so a single call has a bounded cost. Each call
+        starts at a different type so that every type gets its turn, even if one type has more expired entries than the
+        limit every time.
+        """
+        types = self._types(type)
+        if len(types) > 1:
+            start = self._next_type % len(types)
+            self._next_type = start + 1
+            types = types[start:] + types[:start]
+        removed = 0
+        for type in types:
+            if limit is not None and limit <= 0:
+                break
+            type_removed, examined = self._segment(type).expire(limit)
+            removed += type_removed
+            if limit is not None:
+                limit -= examined
+        return removed
+
+    def start_sweeper(self, interval: float = 1.0, batch: int = 1000) -> None:
+        """Starts a daemon thread that removes up to `batch` expired entries every `interval` seconds."""
+        if interval <= 0 or batch < 1:
+            raise ValueError("The sweep interval and batch size must be positive.")
+        self.stop_sweeper()
+        self._sweeper = _Sweeper(self, interval, batch)
+        self._sweeper.start()
+
+    def stop_sweeper(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.stop()
+            self._sweeper = None
+
+    def statistics(self, type: Any = None) -> Dict[Any, Dict[str, int]]:
+        return {type: self._segment(type).statistics for type in self._types(type)}
+
+    def reset_statistics(self, type: Any = None) -> None:
+        for type in self._types(type):
+            self._segment(type).reset_statistics()
+
+
+class _Sweeper(Thread):
+    # Only holds a weak reference to the store so that an abandoned store (and this thread) can be cleaned up
+    def __init__(self, store: CacheStore, interval: float, batch: int) -> None:
+        super().__init__(name="cassiopeia-cache-sweeper", daemon=True)
+        self._store = ref(store)
+        self._interval = interval
+        self._batch = batch
+        self._stopped = Event()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self._interval):
+            store = self._store()
+            if store is None:
+                return
+            store.expire(limit=self._batch)
+            del store
+
+    def stop(self) -> None:
+        self._stopped.set()
@@ -1,11 +1,19 @@
 import re
+import time
 import zlib
+import heapq
+import queue
+import asyncio
+from collections import defaultdict
 from contextlib import contextmanager, ExitStack
 from io import BytesIO
-from typing import Mapping, MutableMapping, Any, Union, Dict, List
-from urllib.parse import urlencode
+from threading import Lock, Event, Semaphore, Thread, local
+from typing import Mapping, MutableMapping, Any, Union, Dict, List, Iterable, Tuple, Generator, Optional, Callable
+from weakref import WeakKeyDictionary
+from urllib.parse import urlencode, urlsplit
 
-from pycurl import Curl
+import pycurl
+from pycurl import Curl, CurlShare
 from merakicommons.ratelimits import RateLimiter
 
 try:
@@ -22,6 +30,24 @@ except ImportError:
 _print_calls = True
 _print_api_key = False
 
+# Set on the worker threads that run pipeline lookups for asyncio code, so that the Riot API requests they make are sent
+# on the caller's event loop rather than blocking the worker.
+_async_context = local()
+
+
+def _event_loop() -> Optional[asyncio.AbstractEventLoop]:
+    return getattr(_async_context, "loop", None)
+
+
+@contextmanager
+def _running_for(loop: asyncio.AbstractEventLoop):
+    previous = _event_loop()
+    _async_context.loop = loop
+    try:
+        yield loop
+    finally:
+        _async_context.loop = previous
+
 
 class HTTPError(RuntimeError):
     def __init__(self, message, code, response_headers: Dict[str, str] = None):
@@ -30,17 +56,264 @@ class HTTPError(RuntimeError):
         self.response_headers = response_headers or {}
 
 
+class CurlPool(object):
+    """A per-host pool of reusable Curl handles.
+
+    Handles are kept open between requests so that keep-alive connections are reused, and every handle in the pool
+    shares one CurlShare for its DNS, TLS session, and connection caches. HTTP/2 is negotiated when the server
+    supports it, which lets concurrent requests to the same host multiplex over a single connection.
+    """
+    def __init__(self, max_idle_per_host: int = 16, http2: bool = True) -> None:
+        self._max_idle_per_host = max_idle_per_host
+        self._http2 = http2
+
+        self._share = CurlShare()
+        for lock_data in ("LOCK_DATA_DNS", "LOCK_DATA_SSL_SESSION", "LOCK_DATA_CONNECT"):
+            # Connection sharing requires libcurl >= 7.57; older versions still get the DNS and TLS session caches.
+            try:
+                self._share.setopt(pycurl.SH_SHARE, getattr(pycurl, lock_data))
+            except (AttributeError, pycurl.error):
+                pass
+
+        self._idle = defaultdict(list)  # type: Dict[str, List[Curl]]
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _host(url: Union[str, bytes]) -> str:
+        if isinstance(url, bytes):
+            url = url.decode("ISO-8859-1")
+        return urlsplit(url).netloc
+
+    def _configure(self, curl: Curl) -> Curl:
+        curl.setopt(pycurl.TCP_KEEPALIVE, 1)
+        if self._http2 and hasattr(pycurl, "CURL_HTTP_VERSION_2TLS"):
+            curl.setopt(pycurl.HTTP_VERSION, pycurl.CURL_HTTP_VERSION_2TLS)
+        if certifi:
+            curl.setopt(pycurl.CAINFO, certifi.where())
+        return curl
+
+    def acquire(self, url: Union[str, bytes]) -> Curl:
+        host = CurlPool._host(url)
+        with self._lock:
+            try:
+                curl = self._idle[host].pop()
+                self._hits += 1
+                return curl
+            except IndexError:
+                self._misses += 1
+        curl = Curl()
+        curl.setopt(pycurl.SHARE, self._share)
+        return self._configure(curl)
+
+    def release(self, url: Union[str, bytes], curl: Curl) -> None:
+        host = CurlPool._host(url)
+        # Resetting clears the per-request options but keeps the handle's live connections and its share.
+        curl.reset()
+        self._configure(curl)
+        with self._lock:
+            idle = self._idle[host]
+            if len(idle) < self._max_idle_per_host:
+                idle.append(curl)
+                return
+        curl.close()
+
+    @contextmanager
+    def connection(self, url: Union[str, bytes]) -> Curl:
+        curl = self.acquire(url)
+        try:
+            yield curl
+        except BaseException:
+            # Don't put a handle that failed mid-request back into the pool
+            curl.close()
+            raise
+        self.release(url, curl)
+
+    @property
+    def statistics(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "idle": sum(len(idle) for idle in self._idle.values())
+            }
+
+    def reset_statistics(self) -> None:
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+
+    def close(self) -> None:
+        with self._lock:
+            for idle in self._idle.values():
+                for curl in idle:
+                    curl.close()
+            self._idle.clear()
+
+
+# All HTTPClients share one pool unless they are given their own, so every datastore talking to the same host reuses the same connections.
+_default_pool = CurlPool()
+
+
+class _AsyncCurlMulti(object):
+    """Runs Curl transfers on an asyncio event loop.
+
+    libcurl's socket interface tells us which sockets to watch and when to time out, and the event loop calls back into
+    the multi handle when they are ready, so no thread or select() of our own is needed.
+    """
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._multi = pycurl.CurlMulti()
+        self._multi.setopt(pycurl.M_SOCKETFUNCTION, self._on_socket)
+        self._multi.setopt(pycurl.M_TIMERFUNCTION, self._on_timer)
+        try:
+            self._multi.setopt(pycurl.M_PIPELINING, pycurl.PIPE_MULTIPLEX)
+        except (AttributeError, pycurl.error):
+            pass
+        self._transfers = {}  # type: Dict[Curl, asyncio.Future]
+        self._timer = None
+
+    def _on_socket(self, event: int, fd: int, multi: pycurl.CurlMulti, data: Any) -> None:
+        self._loop.remove_reader(fd)
+        self._loop.remove_writer(fd)
+        if event in (pycurl.POLL_IN, pycurl.POLL_INOUT):
+            self._loop.add_reader(fd, self._on_action, fd, pycurl.CSELECT_IN)
+        if event in (pycurl.POLL_OUT, pycurl.POLL_INOUT):
+            self._loop.add_writer(fd, self._on_action, fd, pycurl.CSELECT_OUT)
+
+    def _on_timer(self, timeout_ms: int) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if timeout_ms >= 0:
+            self._timer = self._loop.call_later(timeout_ms / 1000, self._on_action, pycurl.SOCKET_TIMEOUT, 0)
+
+    def _on_action(self, fd: int, event: int) -> None:
+        while self._multi.socket_action(fd, event)[0] == pycurl.E_CALL_MULTI_PERFORM:
+            pass
+        while True:
+            remaining, succeeded, failed = self._multi.info_read()
+            for curl in succeeded:
+                self._finish(curl, None)
+            for curl, errno, message in failed:
+                self._finish(curl, pycurl.error(errno, message))
+            if remaining == 0:
+                break
+
+    def _finish(self, curl: Curl, error: Optional[Exception]) -> None:
+        self._multi.remove_handle(curl)
+        future = self._transfers.pop(curl)
+        if future.done():
+            return
+        if error is None:
+            future.set_result(curl.getinfo(curl.HTTP_CODE))
+        else:
+            future.set_exception(error)
+
+    async def perform(self, curl: Curl) -> int:
+        future = self._loop.create_future()
+        self._transfers[curl] = future
+        self._multi.add_handle(curl)
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if self._transfers.pop(curl, None) is not None:
+                self._multi.remove_handle(curl)
+            raise
+
+
+async def _enter_on_worker_thread(rate_limiter: RateLimiter, loop: asyncio.AbstractEventLoop) -> None:
+    # Waits for a permit on a worker thread, because waiting for a window to reset blocks. The thread can't be stopped,
+    # so if the waiting task is cancelled it still gets the permit eventually, and the permit is given back as soon as it
+    # does. Otherwise the permit would never be returned and the window would never reset.
+    entering = loop.run_in_executor(None, rate_limiter.__enter__)
+    try:
+        await asyncio.shield(entering)
+    except asyncio.CancelledError:
+        def release(entering: asyncio.Future) -> None:
+            if not entering.cancelled() and entering.exception() is None:
+                rate_limiter.__exit__(None, None, None)
+        entering.add_done_callback(release)
+        raise
+
+
+class _ResponseHeaders(dict):
+    # Response headers, looked up case-insensitively. HTTP/2 sends header names in lowercase, while HTTP/1.1 servers
+    # send them in any case, so the names are stored lowercased and every lookup is lowercased to match.
+
+    def __setitem__(self, name: str, value: str) -> None:
+        dict.__setitem__(self, name.lower(), value)
+
+    def __getitem__(self, name: str) -> str:
+        return dict.__getitem__(self, name.lower())
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and dict.__contains__(self, name.lower())
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return dict.get(self, name.lower(), default)
+
+
+class _ResponseBody(object):
+    # The write target for a response body. Gzipped bodies are decompressed chunk by chunk as they are received, so the
+    # decompression overlaps with the transfer and the compressed body is never held in memory as a whole.
+    # The response headers are always received before the body, so the Content-Encoding is known by the first write.
+
+    def __init__(self, response_headers: dict):
+        self._response_headers = response_headers
+        self._buffer = BytesIO()
+        self._decompressor = None
+        self._error = None
+
+    def write(self, chunk: bytes) -> None:
+        if self._decompressor is None:
+            if self._response_headers.get("Content-Encoding", "").upper() == "GZIP":
+                self._decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+            else:
+                self._decompressor = False
+        if self._decompressor and self._error is None:
+            try:
+                chunk = self._decompressor.decompress(chunk)
+            except zlib.error as error:
+                # Raising here would only make curl abort the transfer with a less useful error, so raise it from getvalue
+                self._error = error
+                return
+        self._buffer.write(chunk)
+
+    def getvalue(self) -> bytes:
+        if self._error is not None:
+            raise self._error
+        if self._decompressor:
+            self._buffer.write(self._decompressor.flush())
+        return self._buffer.getvalue()
+
+
 class HTTPClient(object):
+    def __init__(self, pool: CurlPool = None) -> None:
+        if pool is None:
+            self._pool = _default_pool
+        else:
+            self._pool = pool
+        self._multis = WeakKeyDictionary()  # type: WeakKeyDictionary[asyncio.AbstractEventLoop, _AsyncCurlMulti]
+
+    @property
+    def pool_statistics(self) -> Dict[str, int]:
+        return self._pool.statistics
+
     @staticmethod
-    def _execute(curl: Curl, close_connection: bool) -> int:
+    def _execute(curl: Curl) -> int:
         curl.perform()
-        status_code = curl.getinfo(curl.HTTP_CODE)
-        if close_connection:
-            curl.close()
-        return status_code
+        return curl.getinfo(curl.HTTP_CODE)
+
+    def _get(self, url: str, headers: Mapping[str, str] = None, rate_limiters: List[RateLimiter] = None, connection: Curl = None) -> (int, bytes, dict):
+        if connection is not None:
+            return HTTPClient._perform(url, headers, rate_limiters, connection)
+        with self._pool.connection(url) as curl:
+            return HTTPClient._perform(url, headers, rate_limiters, curl)
 
     @staticmethod
-    def _get(url: str, headers: Mapping[str, str] = None, rate_limiters: List[RateLimiter] = None, connection: Curl = None) -> (int, bytes, dict):
+    def _prepare(url: str, headers: Mapping[str, str], curl: Curl) -> (_ResponseBody, dict):
         if not headers:
             request_headers = ["Accept-Encoding: gzip"]
         else:
@@ -48,7 +321,7 @@ class HTTPClient(object):
             if "Accept-Encoding" not in headers:
                 request_headers.append("Accept-Encoding: gzip")
 
-        response_headers = {}
+        response_headers = _ResponseHeaders()
 
         def get_response_headers(header_line: bytes) -> None:
             header_line = header_line.decode("ISO-8859-1")
@@ -59,12 +332,10 @@ class HTTPClient(object):
             name, value = header_line.split(":", 1)
             response_headers[name.strip()] = value.strip()
 
-        buffer = BytesIO()
-
-        curl = connection if connection is not None else Curl()
+        buffer = _ResponseBody(response_headers)
 
         curl.setopt(curl.URL, url)
-        curl.setopt(curl.WRITEDATA, buffer)
+        curl.setopt(curl.WRITEFUNCTION, buffer.write)
         curl.setopt(curl.HEADERFUNCTION, get_response_headers)
         curl.setopt(curl.HTTPHEADER, request_headers)
         if certifi:
@@ -80,48 +351,51 @@ class HTTPClient(object):
                 else:
                     _url += "&api_key={}".format(headers["X-Riot-Token"])
             print("Making call: {}".format(_url))
+
+        return buffer, response_headers
+
+    @staticmethod
+    def _perform(url: str, headers: Mapping[str, str], rate_limiters: List[RateLimiter], curl: Curl) -> (int, bytes, dict):
+        buffer, response_headers = HTTPClient._prepare(url, headers, curl)
+
         if rate_limiters:
             with ExitStack() as stack:
                 # Enter each context manager / rate limiter
                 limiters = [stack.enter_context(rate_limiter) for rate_limiter in rate_limiters]
                 exit_limiters = stack.pop_all().__exit__
-                status_code = HTTPClient._execute(curl, connection is None)
+                status_code = HTTPClient._execute(curl)
             exit_limiters(None, None, None)
         else:
-            status_code = HTTPClient._execute(curl, connection is None)
+            status_code = HTTPClient._execute(curl)
 
         body = buffer.getvalue()
-
-        # Decompress if we got gzipped data
-        try:
-            content_encoding = response_headers["Content-Encoding"].upper()
-            if "GZIP" == content_encoding:
-                body = zlib.decompress(body, zlib.MAX_WBITS | 16)
-        except KeyError:
-            pass
-
         return status_code, body, response_headers
 
-    def get(self, url: str, parameters: MutableMapping[str, Any] = None, headers: Mapping[str, str] = None, rate_limiters: List[RateLimiter] = None, connection: Curl = None, encode_parameters: bool = True) -> (Union[dict, list, str, bytes], dict):
+    @staticmethod
+    def _url(url: str, parameters: MutableMapping[str, Any] = None, encode_parameters: bool = True) -> str:
         if parameters:
             if encode_parameters:
                 parameters = {k: str(v).lower() if isinstance(v, bool) else v for k, v in parameters.items()}
                 parameters = urlencode(parameters, doseq=True)
             url = "{url}?{params}".format(url=url, params=parameters)
+        return url
 
-        status_code, body, response_headers = HTTPClient._get(url, headers, rate_limiters, connection)
-
+    @staticmethod
+    def _parse(status_code: int, body: bytes, response_headers: dict) -> Union[dict, list, str, bytes]:
         content_type = response_headers.get("Content-Type", "application/octet-stream").upper()
 
         # Decode to text if a charset is included
         match = re.search("CHARSET=(\S+)", content_type)
         if match:
             encoding = match.group(1)
-            body = body.decode(encoding)
 
-            # Load JSON if necessary
-            if "APPLICATION/JSON" in content_type:
+            # Load JSON if necessary. UTF-8 is parsed straight from the bytes rather than making a decoded copy first.
+            if "APPLICATION/JSON" in content_type and encoding in ("UTF-8", "UTF8"):
                 body = json.loads(body)
+            else:
+                body = body.decode(encoding)
+                if "APPLICATION/JSON" in content_type:
+                    body = json.loads(body)
 
         # Handle errors
         if status_code >= 400:
@@ -134,7 +408,217 @@ class HTTPClient(object):
 
             raise HTTPError(message, status_code, response_headers)
 
-        return body, response_headers
+        return body
+
+    def get(self, url: str, parameters: MutableMapping[str, Any] = None, headers: Mapping[str, str] = None, rate_limiters: List[RateLimiter] = None, connection: Curl = None, encode_parameters: bool = True) -> (Union[dict, list, str, bytes], dict):
+        url = HTTPClient._url(url, parameters, encode_parameters)
+        status_code, body, response_headers = self._get(url, headers, rate_limiters, connection)
+        return HTTPClient._parse(status_code, body, response_headers), response_headers
+
+    async def get_async(self, url: str, parameters: MutableMapping[str, Any] = None, headers: Mapping[str, str] = None, rate_limiters: List[RateLimiter] = None, encode_parameters: bool = True) -> (Union[dict, list, str, bytes], dict):
+        """The asyncio version of ``get``. The transfer runs on the current event loop, and waiting on the rate limiters
+        doesn't block it."""
+        url = HTTPClient._url(url, parameters, encode_parameters)
+        loop = asyncio.get_event_loop()
+        try:
+            multi = self._multis[loop]
+        except KeyError:
+            multi = _AsyncCurlMulti(loop)
+            self._multis[loop] = multi
+
+        entered = []
+        try:
+            for rate_limiter in rate_limiters or ():
+                if hasattr(rate_limiter, "__aenter__"):
+                    await rate_limiter.__aenter__()
+                else:
+                    await _enter_on_worker_thread(rate_limiter, loop)
+                entered.append(rate_limiter)
+
+            curl = self._pool.acquire(url)
+            try:
+                buffer, response_headers = HTTPClient._prepare(url, headers, curl)
+                status_code = await multi.perform(curl)
+            except BaseException:
+                # Don't put a handle that failed mid-request back into the pool
+                curl.close()
+                raise
+        finally:
+            for rate_limiter in reversed(entered):
+                rate_limiter.__exit__(None, None, None)
+        self._pool.release(url, curl)
+
+        body = buffer.getvalue()
+        return HTTPClient._parse(status_code, body, response_headers), response_headers
+
+    def get_many(self, requests: Iterable[Tuple[str, MutableMapping[str, Any]]], headers: Mapping[str, str] = None, rate_limiters: List[RateLimiter] = None, max_in_flight: int = 16, ordered: bool = True, encode_parameters: bool = True, retry: Callable[[int, Exception], Optional[float]] = None) -> Generator[Tuple[int, Union[Tuple[Union[dict, list, str, bytes], dict], Exception]], None, None]:
+        """Makes many GET requests concurrently over one CurlMulti.
+
+        ``requests`` is an iterable of ``(url, parameters)`` pairs. At most ``max_in_flight`` of them are in flight at
+        once, and each holds a permit from every limiter in ``rate_limiters`` from when it is sent until its response
+        arrives, exactly as it would through ``get``.
+
+        Yields ``(index, response)`` pairs, where ``index`` is the position of the request in ``requests`` and
+        ``response`` is either a ``(body, response_headers)`` tuple or the ``HTTPError`` / ``pycurl.error`` the request
+        failed with. If ``ordered`` is True responses are yielded in request order, otherwise they are yielded as soon
+        as they complete.
+
+        When a request fails, ``retry(index, error)`` is asked how many seconds to wait before sending it again, or
+        None to give up and yield the error. A request that is waiting to be retried is parked without a slot or rate
+        limiter permit, so the other requests carry on in the meantime.
+        """
+        urls = [HTTPClient._url(url, parameters, encode_parameters) for url, parameters in requests]
+        if not urls:
+            return
+
+        # Requests are admitted on a separate thread because entering a rate limiter can block until its window resets,
+        # and that reset is only scheduled once a request in flight finishes and exits the limiter.
+        # Everything to send (new requests and retries) goes through `work`; None tells the admitter to stop.
+        work = queue.Queue()
+        for item in enumerate(urls):
+            work.put(item)
+        admitted = queue.Queue()
+        slots = Semaphore(max_in_flight)
+        cancelled = Event()
+        cancel_lock = Lock()
+
+        def admit() -> None:
+            try:
+                while True:
+                    item = work.get()
+                    if item is None:
+                        break
+                    index, url = item
+                    slots.acquire()
+                    limiters = ExitStack()
+                    if not cancelled.is_set():
+                        for rate_limiter in rate_limiters or ():
+                            limiters.enter_context(rate_limiter)
+                    with cancel_lock:
+                        if cancelled.is_set():
+                            limiters.close()
+                            return
+                        admitted.put((index, url, limiters))
+            except BaseException as error:
+                admitted.put(error)
+            else:
+                admitted.put(None)
+
+        admitter = Thread(target=admit, daemon=True)
+        admitter.start()
+
+        multi = pycurl.CurlMulti()
+        try:
+            multi.setopt(pycurl.M_PIPELINING, pycurl.PIPE_MULTIPLEX)
+        except (AttributeError, pycurl.error):
+            pass
+
+        active = {}  # type: Dict[Curl, Tuple[int, str, _ResponseBody, dict, ExitStack]]
+        finished = {}  # type: Dict[int, Union[Tuple[Union[dict, list, str, bytes], dict], Exception]]
+        parked = []  # type: List[Tuple[float, int, str]]  # A heap of (due time, index, url) for requests to retry
+        unfinished = [len(urls)]
+        next_index = 0
+        admitting = True
+
+        def finish(index: int, url: str, response: Union[Tuple[Union[dict, list, str, bytes], dict], Exception]) -> None:
+            if isinstance(response, Exception) and retry is not None:
+                delay = retry(index, response)
+                if delay is not None:
+                    heapq.heappush(parked, (time.monotonic() + delay, index, url))
+                    return
+            finished[index] = response
+            unfinished[0] -= 1
+            if unfinished[0] == 0:
+                work.put(None)
+
+        def complete(curl: Curl, error: Exception = None) -> None:
+            multi.remove_handle(curl)
+            index, url, buffer, response_headers, limiters = active.pop(curl)
+            limiters.close()
+            slots.release()
+            if error is not None:
+                curl.close()
+                finish(index, url, error)
+                return
+            status_code = curl.getinfo(curl.HTTP_CODE)
+            self._pool.release(url, curl)
+            body = buffer.getvalue()
+            try:
+                finish(index, url, (HTTPClient._parse(status_code, body, response_headers), response_headers))
+            except HTTPError as error:
+                finish(index, url, error)
+
+        try:
+            while admitting or active:
+                while parked and parked[0][0] <= time.monotonic():
+                    due, index, url = heapq.heappop(parked)
+                    work.put((index, url))
+
+                # Only wait on the admitter when there is nothing in flight to make progress on, and then only until the
+                # next parked request is due
+                while admitting:
+                    try:
+                        if active:
+                            item = admitted.get_nowait()
+                        elif parked:
+                            item = admitted.get(timeout=max(parked[0][0] - time.monotonic(), 0))
+                        else:
+                            item = admitted.get()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        admitting = False
+                        break
+                    if isinstance(item, BaseException):
+                        raise item
+                    index, url, limiters = item
+                    curl = self._pool.acquire(url)
+                    buffer, response_headers = HTTPClient._prepare(url, headers, curl)
+                    if url.startswith("https") and hasattr(pycurl, "PIPEWAIT"):
+                        # Wait for the connection to the host to negotiate HTTP/2 so the request is multiplexed onto it
+                        curl.setopt(pycurl.PIPEWAIT, 1)
+                    active[curl] = (index, url, buffer, response_headers, limiters)
+                    multi.add_handle(curl)
+
+                while multi.perform()[0] == pycurl.E_CALL_MULTI_PERFORM:
+                    pass
+                while True:
+                    remaining, succeeded, failed = multi.info_read()
+                    for curl in succeeded:
+                        complete(curl)
+                    for curl, errno, message in failed:
+                        complete(curl, pycurl.error(errno, message))
+                    if remaining == 0:
+                        break
+
+                if ordered:
+                    while next_index in finished:
+                        yield next_index, finished.pop(next_index)
+                        next_index += 1
+                else:
+                    for index in list(finished):
+                        yield index, finished.pop(index)
+
+                if active:
+                    multi.select(0.05)
+        finally:
+            with cancel_lock:
+                cancelled.set()
+                work.put(None)
+                while True:
+                    try:
+                        item = admitted.get_nowait()
+                    except queue.Empty:
+                        break
+                    if isinstance(item, tuple):
+                        item[2].close()
+            for _ in range(len(urls)):
+                slots.release()
+            for curl, (index, url, buffer, response_headers, limiters) in list(active.items()):
+                multi.remove_handle(curl)
+                curl.close()
+                limiters.close()
+            multi.close()
 
     @contextmanager
     def new_session(self) -> Curl:
@@ -1,5 +1,12 @@
-import copy
-from typing import Type, TypeVar, MutableMapping, Any, Iterable
+import os
+import re
+import shutil
+import tarfile
+import tempfile
+import threading
+from typing import Type, TypeVar, MutableMapping, Mapping, Any, Iterable, Tuple, Dict, List, Optional
+
+from merakicommons.cache import lazy_property
 
 from datapipelines import DataSource, PipelineContext, Query, NotFoundError, validate_query
 
@@ -15,7 +22,7 @@ from ..dto.staticdata.realm import RealmDto
 from ..dto.staticdata.map import MapDto, MapListDto
 from .common import HTTPClient, HTTPError
 from .riotapi.staticdata import _get_latest_version
-from .uniquekeys import _hash_included_data, convert_region_to_platform
+from .uniquekeys import convert_region_to_platform
 
 try:
     import ujson as json
@@ -25,14 +32,90 @@ except ImportError:
 T = TypeVar("T")
 
 
+_CDN_URL = "https://ddragon.leagueoflegends.com/cdn/"
+_BUNDLE_DATA_FILE = re.compile(r"^(?:\./)?((?:\d+\.)+\d+/data/[A-Za-z_]+/[A-Za-z]+\.json|languages\.json)$")
+
+
+class DDragonBundle(object):
+    """A local copy of Data Dragon, either the ``dragontail-<version>.tgz`` archive that Riot publishes or a directory it was
+    extracted to.
+
+    Files are only read when they are asked for. The data files in an archive are extracted to a temporary directory the
+    first time any of them is needed (the images, which are most of the archive, are skipped), because files in a gzipped
+    archive can't be read without decompressing everything before them.
+    """
+    def __init__(self, path: str) -> None:
+        if not os.path.exists(path):
+            raise ValueError("The Data Dragon bundle {} doesn't exist.".format(path))
+        self._path = path
+        self._extracted = None  # type: tempfile.TemporaryDirectory
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> str:
+        if os.path.isdir(self._path):
+            return self._path
+        with self._lock:
+            if self._extracted is None:
+                extracted = tempfile.TemporaryDirectory(prefix="cassiopeia-ddragon-")
+                with tarfile.open(self._path, "r:*") as archive:
+                    for member in archive:
+                        match = _BUNDLE_DATA_FILE.match(member.name)
+                        if not member.isfile() or match is None:
+                            continue
+                        destination = os.path.join(extracted.name, *match.group(1).split("/"))
+                        os.makedirs(os.path.dirname(destination), exist_ok=True)
+                        with archive.extractfile(member) as source, open(destination, "wb") as file:
+                            shutil.copyfileobj(source, file)
+                self._extracted = extracted
+        return self._extracted.name
+
+    def load(self, path: str) -> Optional[Any]:
+        """Returns the parsed JSON file at ``path`` (e.g. ``"8.1.1/data/en_US/item.json"``), or None if it isn't in the bundle.
+        Empty files (e.g. from an interrupted extraction) count as missing."""
+        try:
+            with open(os.path.join(self.directory, *path.split("/")), "rb") as file:
+                data = file.read()
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        if not data:
+            return None
+        return json.loads(data)
+
+    @lazy_property
+    def versions(self) -> List[str]:
+        """The versions of the data in the bundle, newest first."""
+        versions = [name for name in os.listdir(self.directory) if re.match(r"^(?:\d+\.)+\d+$", name) and os.path.isdir(os.path.join(self.directory, name, "data"))]
+        return sorted(versions, key=lambda version: tuple(int(part) for part in version.split(".")), reverse=True)
+
+    def realm(self, locale: str) -> Dict[str, Any]:
+        """Builds realm data that points at the newest version in the bundle, which offline is the latest version there is.
+
+        The max profile icon id is the largest id in the bundle's profile icons for that version, and is left out if the bundle
+        doesn't have them.
+        """
+        if not self.versions:
+            raise NotFoundError("The Data Dragon bundle {} doesn't contain any versions.".format(self._path))
+        version = self.versions[0]
+        realm = {"v": version, "dd": version, "lg": version, "css": version, "l": locale, "cdn": _CDN_URL[:-1], "store": None,
+                 "n": {name: version for name in ("item", "rune", "mastery", "summoner", "champion", "profileicon", "map", "language", "sticker")}}
+        icons = self.load("{version}/data/{locale}/profileicon.json".format(version=version, locale=locale))
+        if icons is not None and icons.get("data"):
+            realm["profileiconmax"] = max(int(icon["id"]) for icon in icons["data"].values())
+        return realm
+
+
 class DDragon(DataSource):
-    def __init__(self, http_client: HTTPClient = None) -> None:
+    def __init__(self, http_client: HTTPClient = None, bundle: str = None) -> None:
         if http_client is None:
             self._client = HTTPClient()
         else:
             self._client = http_client
+        self._bundle = DDragonBundle(bundle) if bundle is not None else None
 
         self._cache = {ChampionListDto: {}, RuneListDto: {}, ItemListDto: {}, SummonerSpellListDto: {}, MapListDto: {}}
+        # The lists' elements by id and by name for each (version, locale)
+        self._indexes = {ChampionListDto: {}, RuneListDto: {}, ItemListDto: {}, SummonerSpellListDto: {}, MapListDto: {}}
 
     @DataSource.dispatch
     def get(self, type: Type[T], query: MutableMapping[str, Any], context: PipelineContext = None) -> T:
@@ -42,12 +125,52 @@ class DDragon(DataSource):
     def get_many(self, type: Type[T], query: MutableMapping[str, Any], context: PipelineContext = None) -> Iterable[T]:
         pass
 
-    def calculate_hash(self, query):
-        hash = list(value for _, value in sorted(query.items()))
-        for i, value in enumerate(hash):
-            if isinstance(value, set):
-                hash[i] = _hash_included_data(value)
-        return tuple(hash)
+    def _get_json(self, url: str) -> Any:
+        if self._bundle is not None and url.startswith(_CDN_URL):
+            body = self._bundle.load(url[len(_CDN_URL):])
+            if body is not None:
+                return body
+        return json.loads(self._client.get(url)[0])
+
+    def _index(self, list_type: Type[T], version: str, locale: str, dto: T, id_field: str = "id", name_field: str = "name") -> Tuple[Dict[int, Any], Dict[str, Any]]:
+        """Indexes the champions, items, etc. in a list by id and name so single objects can be looked up without searching the list."""
+        data = dto["data"]
+        if isinstance(data, dict):
+            data = data.values()
+        ids, names = {}, {}
+        for element in data:
+            if element.get(id_field) is not None:
+                # Map ids are strings in DDragon
+                ids.setdefault(int(element[id_field]), element)
+            if element.get(name_field) is not None:
+                names.setdefault(element[name_field], element)
+        index = ids, names
+        self._indexes[list_type][version, locale] = index
+        return index
+
+    def _find(self, list_type: Type[T], query: MutableMapping[str, Any], context: PipelineContext, id_field: str = "id", name_field: str = "name") -> Mapping[str, Any]:
+        """Finds the champion, item, etc. in the query by id or name, getting and indexing its list first if it hasn't been already."""
+        locale = query["locale"] if "locale" in query else query["platform"].default_locale
+        try:
+            ids, names = self._indexes[list_type][query["version"], locale]
+        except KeyError:
+            list_query = {key: value for key, value in query.items() if key != "id" and key != "name"}
+            dto = context[context.Keys.PIPELINE].get(list_type, query=list_query)
+            # The list may have come from another data source, in which case it hasn't been indexed yet
+            try:
+                ids, names = self._indexes[list_type][query["version"], locale]
+            except KeyError:
+                ids, names = self._index(list_type, query["version"], locale, dto, id_field=id_field, name_field=name_field)
+
+        if "id" in query:
+            found = ids.get(query["id"])
+        elif "name" in query:
+            found = names.get(query["name"])
+        else:
+            raise RuntimeError("Impossible!")
+        if found is None:
+            raise NotFoundError
+        return found
 
     #############
     # Champions #
@@ -63,35 +186,14 @@ class DDragon(DataSource):
     @get.register(ChampionDto)
     @validate_query(_validate_get_champion_query, convert_region_to_platform)
     def get_champion(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> ChampionDto:
-        champions_query = copy.deepcopy(query)
-        if "id" in champions_query:
-            champions_query.pop("id")
-        if "name" in champions_query:
-            champions_query.pop("name")
-        champions = context[context.Keys.PIPELINE].get(ChampionListDto, query=champions_query)
-
-        def find_matching_attribute(list_of_dtos, attrname, attrvalue):
-            for dto in list_of_dtos:
-                if dto.get(attrname, None) == attrvalue:
-                    return dto
-
-        # The `data` is a list of champion data instances
-        if "id" in query:
-            find = "id", query["id"]
-        elif "name" in query:
-            find = "name", query["name"]
-        else:
-            raise RuntimeError("Impossible!")
-        champion = find_matching_attribute(champions["data"].values(), *find)
-        if champion is None:
-            raise NotFoundError
+        champion = ChampionDto(self._find(ChampionListDto, query, context))
         champion["region"] = query["platform"].region.value
         champion["version"] = query["version"]
         if "locale" in query:
             champion["locale"] = query["locale"]
         if "includedData" in query:
             champion["includedData"] = query["includedData"]
-        return ChampionDto(champion)
+        return champion
 
     _validate_get_champion_list_query = Query. \
         has("platform").as_(Platform).also. \
@@ -105,9 +207,9 @@ class DDragon(DataSource):
         locale = query["locale"] if "locale" in query else query["platform"].default_locale
         query["locale"] = locale
 
-        ahash = self.calculate_hash(query)
+        key = query["platform"], query["version"], locale
         try:
-            return self._cache[ChampionListDto][ahash]
+            return self._cache[ChampionListDto][key]
         except KeyError:
             pass
 
@@ -116,7 +218,7 @@ class DDragon(DataSource):
             locale=locale
         )
         try:
-            body = json.loads(self._client.get(url)[0])
+            body = self._get_json(url)
         except HTTPError as e:
             raise NotFoundError(str(e)) from e
 
@@ -175,7 +277,8 @@ class DDragon(DataSource):
         body["includedData"] = {"all"}
         body["dataById"] = True
         result = ChampionListDto(body)
-        self._cache[ChampionListDto][ahash] = result
+        self._cache[ChampionListDto][key] = result
+        self._index(ChampionListDto, query["version"], locale, result)
         return result
 
     ############
@@ -188,11 +291,15 @@ class DDragon(DataSource):
     @get.register(VersionListDto)
     @validate_query(_validate_get_versions_query, convert_region_to_platform)
     def get_versions(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> VersionListDto:
-        url = "https://ddragon.leagueoflegends.com/api/versions.json"
-        try:
-            body = json.loads(self._client.get(url)[0])
-        except HTTPError as e:
-            raise NotFoundError(str(e)) from e
+        if self._bundle is not None:
+            # A bundle pins the available versions, so the remote list isn't merged in even when online
+            body = self._bundle.versions
+        else:
+            url = "https://ddragon.leagueoflegends.com/api/versions.json"
+            try:
+                body = self._get_json(url)
+            except HTTPError as e:
+                raise NotFoundError(str(e)) from e
 
         return VersionListDto({
             "region": query["platform"].region.value,
@@ -210,12 +317,14 @@ class DDragon(DataSource):
     @validate_query(_validate_get_realms_query, convert_region_to_platform)
     def get_realms(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> RealmDto:
         region = query["platform"].region
-        url = "https://ddragon.leagueoflegends.com/realms/{region}.json".format(region=region.value.lower())
-        try:
-            body = json.loads(self._client.get(url)[0])
-
-        except HTTPError as e:
-            raise NotFoundError(str(e)) from e
+        if self._bundle is not None:
+            body = self._bundle.realm(query["platform"].default_locale)
+        else:
+            url = "https://ddragon.leagueoflegends.com/realms/{region}.json".format(region=region.value.lower())
+            try:
+                body = self._get_json(url)
+            except HTTPError as e:
+                raise NotFoundError(str(e)) from e
 
         body["region"] = query["platform"].region.value
         return RealmDto(body)
@@ -232,7 +341,7 @@ class DDragon(DataSource):
     def get_languages(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> LanguagesDto:
         url = "https://ddragon.leagueoflegends.com/cdn/languages.json"
         try:
-            body = json.loads(self._client.get(url)[0])
+            body = self._get_json(url)
         except HTTPError as e:
             raise NotFoundError(str(e)) from e
 
@@ -252,33 +361,12 @@ class DDragon(DataSource):
     @get.register(MapDto)
     @validate_query(_validate_get_map_query, convert_region_to_platform)
     def get_map(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> MapDto:
-        maps_query = copy.deepcopy(query)
-        if "id" in maps_query:
-            maps_query.pop("id")
-        if "name" in maps_query:
-            maps_query.pop("name")
-        maps = context[context.Keys.PIPELINE].get(MapListDto, query=maps_query)
-
-        def find_matching_attribute(list_of_dtos, attrname, attrvalue):
-            for dto in list_of_dtos:
-                if dto.get(attrname, None) == attrvalue:
-                    return dto
-
-        # The `data` is a list of map data instances
-        if "id" in query:
-            find = "mapId", str(query["id"])
-        elif "name" in query:
-            find = "mapName", query["name"]
-        else:
-            raise RuntimeError("Impossible!")
-        map = find_matching_attribute(maps["data"].values(), *find)
-        if map is None:
-            raise NotFoundError
+        map = MapDto(self._find(MapListDto, query, context, id_field="mapId", name_field="mapName"))
         map["region"] = query["platform"].region.value
         map["version"] = query["version"]
         if "locale" in query:
             map["locale"] = query["locale"]
-        return MapDto(map)
+        return map
 
     _validate_get_map_list_query = Query. \
         has("platform").as_(Platform).also. \
@@ -291,9 +379,9 @@ class DDragon(DataSource):
         locale = query["locale"] if "locale" in query else query["platform"].default_locale
         query["locale"] = locale
 
-        ahash = self.calculate_hash(query)
+        key = query["platform"], query["version"], locale
         try:
-            return self._cache[MapListDto][ahash]
+            return self._cache[MapListDto][key]
         except KeyError:
             pass
 
@@ -302,7 +390,7 @@ class DDragon(DataSource):
             locale=locale
         )
         try:
-            body = json.loads(self._client.get(url)[0])
+            body = self._get_json(url)
         except HTTPError as e:
             raise NotFoundError(str(e)) from e
 
@@ -314,7 +402,8 @@ class DDragon(DataSource):
             map["mapName"] = map.pop("MapName")
             map["mapId"] = map.pop("MapId")
         result = MapListDto(body)
-        self._cache[MapListDto][ahash] = result
+        self._cache[MapListDto][key] = result
+        self._index(MapListDto, query["version"], locale, result, id_field="mapId", name_field="mapName")
         return result
 
     ####################
@@ -336,7 +425,7 @@ class DDragon(DataSource):
             locale=locale
         )
         try:
-            body = json.loads(self._client.get(url)[0])
+            body = self._get_json(url)
         except HTTPError as e:
             raise NotFoundError(str(e)) from e
 
@@ -358,40 +447,14 @@ class DDragon(DataSource):
     @get.register(RuneDto)
     @validate_query(_validate_get_rune_query, convert_region_to_platform)
     def get_rune(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> RuneDto:
-        runes_query = copy.deepcopy(query)
-        if "id" in runes_query:
-            runes_query.pop("id")
-        if "name" in runes_query:
-            runes_query.pop("name")
-        runes = context[context.Keys.PIPELINE].get(RuneListDto, query=runes_query)
-
-        def find_matching_attribute(list_of_dtos, attrname, attrvalue):
-            for dto in list_of_dtos:
-                if dto.get(attrname, None) == attrvalue:
-                    return dto
-
-        # The `data` is a list of rune data instances
-        if "id" in query:
-            find = "id", query["id"]
-        elif "name" in query:
-            find = "name", query["name"]
-        else:
-            raise RuntimeError("Impossible!")
-        if isinstance(runes["data"], list):
-            rune = find_matching_attribute(runes["data"], *find)
-        elif isinstance(runes["data"], dict):
-            rune = find_matching_attribute(runes["data"].values(), *find)
-        else:
-            raise ValueError("The runes data from DDragon came back in an unexpected format. Please report this on Github!")
-        if rune is None:
-            raise NotFoundError
+        rune = RuneDto(self._find(RuneListDto, query, context))
         rune["region"] = query["platform"].region.value
         rune["version"] = query["version"]
         if "locale" in query:
             rune["locale"] = query["locale"]
         if "includedData" in query:
             rune["includedData"] = query["includedData"]
-        return RuneDto(rune)
+        return rune
 
     _validate_get_rune_list_query = Query. \
         has("platform").as_(Platform).also. \
@@ -405,9 +468,9 @@ class DDragon(DataSource):
         locale = query["locale"] if "locale" in query else query["platform"].default_locale
         query["locale"] = locale
 
-        ahash = self.calculate_hash(query)
+        key = query["platform"], query["version"], locale
         try:
-            return self._cache[RuneListDto][ahash]
+            return self._cache[RuneListDto][key]
         except KeyError:
             pass
 
@@ -416,7 +479,7 @@ class DDragon(DataSource):
             locale=locale
         )
         try:
-            body = json.loads(self._client.get(url)[0])
+            body = self._get_json(url)
         except HTTPError as e:
             raise NotFoundError(str(e)) from e
 
@@ -437,7 +500,8 @@ class DDragon(DataSource):
         body["version"] = query["version"]
         body["includedData"] = {"all"}
         result = RuneListDto(body)
-        self._cache[RuneListDto][ahash] = result
+        self._cache[RuneListDto][key] = result
+        self._index(RuneListDto, query["version"], locale, result)
         return result
 
     #########
@@ -454,35 +518,14 @@ class DDragon(DataSource):
     @get.register(ItemDto)
     @validate_query(_validate_get_item_query, convert_region_to_platform)
     def get_item(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> ItemDto:
-        items_query = copy.deepcopy(query)
-        if "id" in items_query:
-            items_query.pop("id")
-        if "name" in items_query:
-            items_query.pop("name")
-        items = context[context.Keys.PIPELINE].get(ItemListDto, query=items_query)
-
-        def find_matching_attribute(list_of_dtos, attrname, attrvalue):
-            for dto in list_of_dtos:
-                if dto.get(attrname, None) == attrvalue:
-                    return dto
-
-        # The `data` is a list of item data instances
-        if "id" in query:
-            find = "id", query["id"]
-        elif "name" in query:
-            find = "name", query["name"]
-        else:
-            raise RuntimeError("Impossible!")
-        item = find_matching_attribute(items["data"].values(), *find)
-        if item is None:
-            raise NotFoundError
+        item = ItemDto(self._find(ItemListDto, query, context))
         item["region"] = query["platform"].region.value
         item["version"] = query["version"]
         if "locale" in query:
             item["locale"] = query["locale"]
         if "includedData" in query:
             item["includedData"] = query["includedData"]
-        return ItemDto(item)
+        return item
 
     _validate_get_item_list_query = Query. \
         has("platform").as_(Platform).also. \
@@ -496,9 +539,9 @@ class DDragon(DataSource):
         locale = query["locale"] if "locale" in query else query["platform"].default_locale
         query["locale"] = locale
 
-        ahash = self.calculate_hash(query)
+        key = query["platform"], query["version"], locale
         try:
-            return self._cache[ItemListDto][ahash]
+            return self._cache[ItemListDto][key]
         except KeyError:
             pass
 
@@ -507,7 +550,7 @@ class DDragon(DataSource):
             locale=locale
         )
         try:
-            body = json.loads(self._client.get(url)[0])
+            body = self._get_json(url)
         except HTTPError as e:
             raise NotFoundError(str(e)) from e
 
@@ -538,7 +581,8 @@ class DDragon(DataSource):
         body["locale"] = locale
         body["includedData"] = {"all"}
         result = ItemListDto(body)
-        self._cache[ItemListDto][ahash] = result
+        self._cache[ItemListDto][key] = result
+        self._index(ItemListDto, query["version"], locale, result)
         return result
 
     ###################
@@ -555,35 +599,14 @@ class DDragon(DataSource):
     @get.register(SummonerSpellDto)
     @validate_query(_validate_get_summoner_spell_query, convert_region_to_platform)
     def get_summoner_spell(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> SummonerSpellDto:
-        summoner_spells_query = copy.deepcopy(query)
-        if "id" in summoner_spells_query:
-            summoner_spells_query.pop("id")
-        if "name" in summoner_spells_query:
-            summoner_spells_query.pop("name")
-        summoner_spells = context[context.Keys.PIPELINE].get(SummonerSpellListDto, query=summoner_spells_query)
-
-        def find_matching_attribute(list_of_dtos, attrname, attrvalue):
-            for dto in list_of_dtos:
-                if dto.get(attrname, None) == attrvalue:
-                    return dto
-
-        # The `data` is a list of summoner_spell data instances
-        if "id" in query:
-            find = "id", query["id"]
-        elif "name" in query:
-            find = "name", query["name"]
-        else:
-            raise RuntimeError("Impossible!")
-        summoner_spell = find_matching_attribute(summoner_spells["data"].values(), *find)
-        if summoner_spell is None:
-            raise NotFoundError
+        summoner_spell = SummonerSpellDto(self._find(SummonerSpellListDto, query, context))
         summoner_spell["region"] = query["platform"].region.value
         summoner_spell["version"] = query["version"]
         if "locale" in query:
             summoner_spell["locale"] = query["locale"]
         if "includedData" in query:
             summoner_spell["includedData"] = query["includedData"]
-        return SummonerSpellDto(summoner_spell)
+        return summoner_spell
 
     _validate_get_summoner_spell_list_query = Query. \
         has("platform").as_(Platform).also. \
@@ -597,9 +620,9 @@ class DDragon(DataSource):
         locale = query["locale"] if "locale" in query else query["platform"].default_locale
         query["locale"] = locale
 
-        ahash = self.calculate_hash(query)
+        key = query["platform"], query["version"], locale
         try:
-            return self._cache[SummonerSpellListDto][ahash]
+            return self._cache[SummonerSpellListDto][key]
         except KeyError:
             pass
 
@@ -608,7 +631,7 @@ class DDragon(DataSource):
             locale=locale
         )
         try:
-            body = json.loads(self._client.get(url)[0])
+            body = self._get_json(url)
         except HTTPError as e:
             raise NotFoundError(str(e)) from e
 
@@ -629,7 +652,8 @@ class DDragon(DataSource):
         body["locale"] = locale
         body["includedData"] = {"all"}
         result = SummonerSpellListDto(body)
-        self._cache[SummonerSpellListDto][ahash] = result
+        self._cache[SummonerSpellListDto][key] = result
+        self._index(SummonerSpellListDto, query["version"], locale, result)
         return result
 
     #################
@@ -651,7 +675,7 @@ class DDragon(DataSource):
             locale=locale
         )
         try:
-            body = json.loads(self._client.get(url)[0])
+            body = self._get_json(url)
         except HTTPError as e:
             raise NotFoundError(str(e)) from e
 
@@ -1,11 +1,12 @@
 from typing import Iterable, Set, Dict
 import os
+import hashlib
 
 from datapipelines import CompositeDataSource
-from .common import RiotAPIService, RiotAPIRateLimiter
+from .common import RiotAPIService, RiotAPIRateLimiter, RequestScheduler, request_priority
 
 
-def _default_services(api_key: str, limiting_share: float = 1.0, request_by_id: bool = True, request_error_handling: Dict = None) -> Set[RiotAPIService]:
+def _default_services(api_key: str, limiting_share: float = 1.0, request_by_id: bool = True, request_error_handling: Dict = None, max_concurrent_requests: int = 16, adaptive_rate_limiting: bool = False, shared_rate_limits: str = None) -> Set[RiotAPIService]:
     from ..common import HTTPClient
     from ..image import ImageDataSource
     from .staticdata import StaticDataAPI
@@ -18,34 +19,38 @@ def _default_services(api_key: str, limiting_share: float = 1.0, request_by_id:
     from .leagues import LeaguesAPI
     from .thirdpartycode import ThirdPartyCodeAPI
 
-    app_rate_limiter = RiotAPIRateLimiter(limiting_share=limiting_share)
+    # Processes only share rate limits with others that use the same API key
+    app_rate_limiter = RiotAPIRateLimiter(limiting_share=limiting_share, adaptive=adaptive_rate_limiting, shared_directory=shared_rate_limits, name=hashlib.sha1(str(api_key).encode("utf-8")).hexdigest())
+
+    # Every service sends its requests through the same application rate limiter, so they share one scheduler for it
+    scheduler = RequestScheduler(app_rate_limiter)
 
     client = HTTPClient()
     services = {
         ImageDataSource(client),
-        ChampionAPI(api_key, app_rate_limiter=app_rate_limiter, request_by_id=request_by_id, request_error_handling=request_error_handling, http_client=client),
-        StaticDataAPI(api_key, app_rate_limiter=app_rate_limiter, request_by_id=request_by_id, request_error_handling=request_error_handling, http_client=client),
-        SummonerAPI(api_key, app_rate_limiter=app_rate_limiter, request_by_id=request_by_id, request_error_handling=request_error_handling, http_client=client),
-        ChampionMasteryAPI(api_key, app_rate_limiter=app_rate_limiter, request_by_id=request_by_id, request_error_handling=request_error_handling, http_client=client),
-        MatchAPI(api_key, app_rate_limiter=app_rate_limiter, request_by_id=request_by_id, request_error_handling=request_error_handling, http_client=client),
-        SpectatorAPI(api_key, app_rate_limiter=app_rate_limiter, request_by_id=request_by_id, request_error_handling=request_error_handling, http_client=client),
-        StatusAPI(api_key, app_rate_limiter=app_rate_limiter, request_by_id=request_by_id, request_error_handling=request_error_handling, http_client=client),
-        LeaguesAPI(api_key, app_rate_limiter=app_rate_limiter, request_by_id=request_by_id, request_error_handling=request_error_handling, http_client=client),
-        ThirdPartyCodeAPI(api_key, app_rate_limiter=app_rate_limiter, request_by_id=request_by_id, request_error_handling=request_error_handling, http_client=client)
+        ChampionAPI(api_key, app_rate_limiter=app_rate_limiter, request_by_id=request_by_id, request_error_handling=request_error_handling, http_client=client, max_concurrent_requests=max_concurrent_requests, scheduler=scheduler),
+        StaticDataAPI(api_key, app_rate_limiter=app_rate_limiter, request_by_id=request_by_id, request_error_handling=request_error_handling, http_client=client, max_concurrent_requests=max_concurrent_requests, scheduler=scheduler),
+        SummonerAPI(api_key, app_rate_limiter=app_rate_limiter, request_by_id=request_by_id, request_error_handling=request_error_handling, http_client=client, max_concurrent_requests=max_concurrent_requests, scheduler=scheduler),
+        ChampionMasteryAPI(api_key, app_rate_limiter=app_rate_limiter, request_by_id=request_by_id, request_error_handling=request_error_handling, http_client=client, max_concurrent_requests=max_concurrent_requests, scheduler=scheduler),
+        MatchAPI(api_key, app_rate_limiter=app_rate_limiter, request_by_id=request_by_id, request_error_handling=request_error_handling, http_client=client, max_concurrent_requests=max_concurrent_requests, scheduler=scheduler),
+        SpectatorAPI(api_key, app_rate_limiter=app_rate_limiter, request_by_id=request_by_id, request_error_handling=request_error_handling, http_client=client, max_concurrent_requests=max_concurrent_requests, scheduler=scheduler),
+        StatusAPI(api_key, app_rate_limiter=app_rate_limiter, request_by_id=request_by_id, request_error_handling=request_error_handling, http_client=client, max_concurrent_requests=max_concurrent_requests, scheduler=scheduler),
+        LeaguesAPI(api_key, app_rate_limiter=app_rate_limiter, request_by_id=request_by_id, request_error_handling=request_error_handling, http_client=client, max_concurrent_requests=max_concurrent_requests, scheduler=scheduler),
+        ThirdPartyCodeAPI(api_key, app_rate_limiter=app_rate_limiter, request_by_id=request_by_id, request_error_handling=request_error_handling, http_client=client, max_concurrent_requests=max_concurrent_requests, scheduler=scheduler)
     }
 
     return services
 
 
 class RiotAPI(CompositeDataSource):
-    def __init__(self, api_key: str = None, services: Iterable[RiotAPIService] = None, limiting_share: float = 1.0, request_by_id: bool = True, request_error_handling: Dict = None) -> None:
+    def __init__(self, api_key: str = None, services: Iterable[RiotAPIService] = None, limiting_share: float = 1.0, request_by_id: bool = True, request_error_handling: Dict = None, max_concurrent_requests: int = 16, adaptive_rate_limiting: bool = False, shared_rate_limits: str = None) -> None:
         if api_key is None:
             api_key = "RIOT_API_KEY"  # Use this env variable.
         if not api_key.startswith("RGAPI"):
             api_key = os.environ.get(api_key, None)
 
         if services is None:
-            services = _default_services(api_key=api_key, limiting_share=limiting_share, request_by_id=request_by_id, request_error_handling=request_error_handling)
+            services = _default_services(api_key=api_key, limiting_share=limiting_share, request_by_id=request_by_id, request_error_handling=request_error_handling, max_concurrent_requests=max_concurrent_requests, adaptive_rate_limiting=adaptive_rate_limiting, shared_rate_limits=shared_rate_limits)
 
         super().__init__(services)
 
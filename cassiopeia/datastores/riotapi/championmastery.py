@@ -90,24 +90,23 @@ class ChampionMasteryAPI(RiotAPIService):
 
     _validate_get_many_champion_mastery_list_query = Query. \
         has("platform").as_(Platform).also. \
-        has("summoner.ids").as_(Iterable)
+        has("summoner.ids").as_(Iterable).also. \
+        can_have("ordered").with_default(True)
 
     @get_many.register(ChampionMasteryListDto)
     @validate_query(_validate_get_many_champion_mastery_list_query, convert_region_to_platform)
     def get_many_champion_mastery_list(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> Generator[ChampionMasteryListDto, None, None]:
         def generator():
-            for summoner_id in query["summoner.ids"]:
-                url = "https://{platform}.api.riotgames.com/lol/champion-mastery/v3/champion-masteries/by-summoner/{summonerId}".format(platform=query["platform"].value.lower(), summonerId=summoner_id)
-                try:
-                    data = self._get(url, {}, self._get_rate_limiter(query["platform"], "champion-masteries/by-summoner/summonerId"))
-                except APINotFoundError as error:
-                    raise NotFoundError(str(error)) from error
-
-                yield ChampionMasteryListDto({
-                    "masteries": data,
-                    "summonerId": summoner_id,
-                    "region": query["platform"].region.value
-                })
+            requests = [(summoner_id, "https://{platform}.api.riotgames.com/lol/champion-mastery/v3/champion-masteries/by-summoner/{summonerId}".format(platform=query["platform"].value.lower(), summonerId=summoner_id), {}) for summoner_id in query["summoner.ids"]]
+            try:
+                for summoner_id, data in self._get_many(requests, self._get_rate_limiter(query["platform"], "champion-masteries/by-summoner/summonerId"), ordered=query["ordered"]):
+                    yield ChampionMasteryListDto({
+                        "masteries": data,
+                        "summonerId": summoner_id,
+                        "region": query["platform"].region.value
+                    })
+            except APINotFoundError as error:
+                raise NotFoundError(str(error)) from error
 
         return generator()
 
@@ -132,23 +131,22 @@ class ChampionMasteryAPI(RiotAPIService):
 
     _validate_get_many_champion_mastery_score_query = Query. \
         has("platform").as_(Platform).also. \
-        has("summoner.ids").as_(Iterable)
+        has("summoner.ids").as_(Iterable).also. \
+        can_have("ordered").with_default(True)
 
     @get_many.register(ChampionMasteryScoreDto)
     @validate_query(_validate_get_many_champion_mastery_score_query, convert_region_to_platform)
     def get_many_champion_mastery_score(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> Generator[ChampionMasteryScoreDto, None, None]:
         def generator():
-            for summoner_id in query["summoner.ids"]:
-                url = "https://{platform}.api.riotgames.com/lol/champion-mastery/v3/scores/by-summoner/{summonerId}".format(platform=query["platform"].value.lower(), summonerId=summoner_id)
-                try:
-                    data = self._get(url, {}, self._get_rate_limiter(query["platform"], "scores/by-summoner/summonerId"))
-                except APINotFoundError as error:
-                    raise NotFoundError(str(error)) from error
-
-                yield ChampionMasteryScoreDto({
-                    "region": query["platform"].region.value,
-                    "summonerId": summoner_id,
-                    "score": data
-                })
+            requests = [(summoner_id, "https://{platform}.api.riotgames.com/lol/champion-mastery/v3/scores/by-summoner/{summonerId}".format(platform=query["platform"].value.lower(), summonerId=summoner_id), {}) for summoner_id in query["summoner.ids"]]
+            try:
+                for summoner_id, data in self._get_many(requests, self._get_rate_limiter(query["platform"], "scores/by-summoner/summonerId"), ordered=query["ordered"]):
+                    yield ChampionMasteryScoreDto({
+                        "region": query["platform"].region.value,
+                        "summonerId": summoner_id,
+                        "score": data
+                    })
+            except APINotFoundError as error:
+                raise NotFoundError(str(error)) from error
 
         return generator()
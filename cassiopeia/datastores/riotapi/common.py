@@ -1,14 +1,21 @@
+import os
 import time
 import copy
+import mmap
+import struct
+import asyncio
+import hashlib
 import functools
 import collections
 from abc import abstractmethod, ABC
-from typing import MutableMapping, Any, Union, TypeVar, Iterable, Type, List, Tuple, Dict, Callable
+from threading import Lock, Condition, local
+from contextlib import contextmanager
+from typing import MutableMapping, Any, Union, TypeVar, Iterable, Type, List, Tuple, Dict, Callable, Generator, Optional
 
 from datapipelines import DataSource, PipelineContext
-from merakicommons.ratelimits import FixedWindowRateLimiter, MultiRateLimiter
+from merakicommons.ratelimits import RateLimiter, FixedWindowRateLimiter, MultiRateLimiter
 
-from ..common import HTTPClient, HTTPError, Curl
+from ..common import HTTPClient, HTTPError, Curl, _event_loop, _enter_on_worker_thread
 from ...data import Platform
 
 
@@ -44,15 +51,197 @@ _ERROR_CODES = {
 T = TypeVar("T")
 
 
+class AdaptiveRateLimiter(RateLimiter):
+    """Spreads a window's permits evenly over the window and corrects itself with the counts the server reports.
+
+    This is a token bucket that holds up to `burst` (a fraction) of the window's permits and refills the rest at a
+    steady rate, so that no span of `window_seconds` gets more than `window_permits` permits. When the server reports
+    how many requests it has counted in its current window, which includes requests from other processes using the
+    same API key, the bucket is drained down to what the server says is left. Reconciling only ever removes tokens,
+    so a stale report can't let extra requests through.
+    """
+    def __init__(self, window_seconds: int, window_permits: int, burst: float = 0.1) -> None:
+        self._window_seconds = window_seconds
+        self._burst = burst
+        self._lock = Lock()
+        self._configure(window_permits)
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._total_permits_issued = 0
+
+    def _configure(self, permits: float) -> None:
+        self._window_permits = permits
+        if permits > 1:
+            # The burst and what refills over a window add up to exactly `permits`
+            self._capacity = max(1.0, min(permits - 1, permits * self._burst))
+            self._rate = (permits - self._capacity) / self._window_seconds
+        else:
+            # Too few permits to split (e.g. after scaling by a small limiting share): one request at a time, with the
+            # next one allowed window_seconds / permits later, so no window gets more than one
+            self._capacity = 1.0
+            self._rate = max(permits, 0) / self._window_seconds
+
+    def _refill(self, now: float) -> None:
+        # The caller holds the lock
+        if now > self._updated:
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+
+    def __enter__(self) -> "AdaptiveRateLimiter":
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._updated and self._tokens >= 1:
+                    self._tokens -= 1
+                    self._total_permits_issued += 1
+                    return self
+                wait = max(self._updated - now, 0)
+                # A rate of 0 (no permits at all) never refills, so check again after every window until the permits change
+                wait += (1 - self._tokens) / self._rate if self._rate > 0 else self._window_seconds
+            time.sleep(wait)
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        pass
+
+    def set_permits(self, permits: int) -> None:
+        with self._lock:
+            self._refill(time.monotonic())
+            self._configure(permits)
+            self._tokens = min(self._tokens, self._capacity)
+
+    def restrict_for(self, seconds: int) -> None:
+        with self._lock:
+            # Start refilling from empty once the restriction is over
+            self._tokens = min(self._tokens, 0)
+            self._updated = max(self._updated, time.monotonic() + seconds)
+
+    def reconcile(self, count: int, server_permits: float) -> None:
+        """Drains the bucket down to what the server says is left of this process's permits.
+
+        `count` is the number of requests the server has counted in its current window, from every process using the
+        API key, and `server_permits` is the part of the server's limit that this process may use (the server's limit
+        scaled by the limiting share, the same as the permits given to `set_permits`).
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, server_permits - count)
+
+    @property
+    def permits_issued(self) -> int:
+        with self._lock:
+            return self._total_permits_issued
+
+    def reset_permits_issued(self) -> None:
+        with self._lock:
+            self._total_permits_issued = 0
+
+
+class SharedWindowRateLimiter(RateLimiter):
+    """A fixed window rate limiter whose window is shared by every process on this host that uses the same file.
+
+    The window's start time and the number of permits issued in it are kept in a small memory-mapped file and only
+    changed under an exclusive file lock, so processes draw from one budget instead of each reserving a fixed share of
+    it. A restriction (e.g. after a 429) also applies to every process. Only available on POSIX systems.
+
+    The number of permits isn't in the file: each process compares the shared count with its own `window_permits`, so
+    every process using a file should be configured with the same permits (they are, if they use the same limiting
+    share, because the permits come from Riot's response headers).
+
+    The file stays open until `close` is called or the limiter is garbage collected.
+    """
+    _STATE = struct.Struct("=dq")  # Window start (seconds since the epoch), permits issued in the window
+
+    def __init__(self, path: str, window_seconds: int, window_permits: int) -> None:
+        import fcntl
+        self._fcntl = fcntl
+        self._window_seconds = window_seconds
+        self._window_permits = window_permits
+        self._lock = Lock()  # flock doesn't keep out other threads that use the same file descriptor
+        self._state = None  # type: mmap.mmap
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        if os.fstat(self._fd).st_size < self._STATE.size:
+            os.ftruncate(self._fd, self._STATE.size)
+        self._state = mmap.mmap(self._fd, self._STATE.size)
+        self._total_permits_issued = 0
+
+    @contextmanager
+    def _shared_state(self):
+        with self._lock:
+            self._fcntl.flock(self._fd, self._fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                self._fcntl.flock(self._fd, self._fcntl.LOCK_UN)
+
+    def __enter__(self) -> "SharedWindowRateLimiter":
+        while True:
+            with self._shared_state():
+                now = time.time()
+                start, issued = self._STATE.unpack(self._state)
+                if now >= start + self._window_seconds:
+                    start, issued = now, 0
+                if issued < self._window_permits:
+                    self._STATE.pack_into(self._state, 0, start, issued + 1)
+                    self._total_permits_issued += 1
+                    return self
+                wait = start + self._window_seconds - now
+            time.sleep(wait)
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        pass
+
+    def set_permits(self, permits: int) -> None:
+        # Under the lock, so that a permit being issued sees either the old or the new limit
+        with self._shared_state():
+            self._window_permits = permits
+
+    def close(self) -> None:
+        if self._state is not None:
+            self._state.close()
+            self._state = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __del__(self) -> None:
+        # __init__ may have failed before opening the file
+        if getattr(self, "_fd", None) is not None:
+            self.close()
+
+    def restrict_for(self, seconds: int) -> None:
+        with self._shared_state():
+            # Use up the current window and make it end in `seconds`
+            self._STATE.pack_into(self._state, 0, time.time() + seconds - self._window_seconds, 2 ** 62)
+
+    @property
+    def permits_issued(self) -> int:
+        return self._total_permits_issued
+
+    def reset_permits_issued(self) -> None:
+        self._total_permits_issued = 0
+
 
 class RiotAPIRateLimiter(MultiRateLimiter):
     # The application limiter and method limiters will each be an instance of this.
+    # If `shared_directory` is set, the limits are shared with other processes through files in that directory.
 
-    def __init__(self, limiting_share):
+    def __init__(self, limiting_share, adaptive: bool = False, shared_directory: str = None, name: str = "application"):
         self.limiting_share = limiting_share
+        self.adaptive = adaptive
+        self.shared_directory = shared_directory
+        self.name = name
         super().__init__()  # Initialize with no underlying limiters
         self._limiters = []  # Make it a list rather than a tuple so we can append
 
+    async def __aenter__(self) -> "RiotAPIRateLimiter":
+        # Waiting for a window to reset blocks, so do the waiting on a worker thread instead of the event loop
+        await _enter_on_worker_thread(self, asyncio.get_event_loop())
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.__exit__(exc_type, exc_val, exc_tb)
+
     def restrict_for(self, seconds: int) -> None:
         for limiter in self._limiters:
             limiter.restrict_for(seconds)
@@ -62,9 +251,15 @@ class RiotAPIRateLimiter(MultiRateLimiter):
         assert len(self._limiters) == 0
         # Create the rate limiters
         for permits, window in limits:
-            self._limiters.append(
-                FixedWindowRateLimiter(window_seconds=window, window_permits=permits)
-            )
+            if self.shared_directory is not None:
+                os.makedirs(self.shared_directory, exist_ok=True)
+                path = os.path.join(self.shared_directory, "{}-{}.limit".format(hashlib.sha1(self.name.encode("utf-8")).hexdigest()[:16], window))
+                limiter = SharedWindowRateLimiter(path, window_seconds=window, window_permits=permits)
+            elif self.adaptive:
+                limiter = AdaptiveRateLimiter(window_seconds=window, window_permits=permits)
+            else:
+                limiter = FixedWindowRateLimiter(window_seconds=window, window_permits=permits)
+            self._limiters.append(limiter)
 
     def adjust_rate_limits_if_necessary(self, limits: List[List[int]]) -> None:
         if len(self._limiters) == 0:
@@ -75,12 +270,133 @@ class RiotAPIRateLimiter(MultiRateLimiter):
             if permits != for_window._window_permits:
                 for_window.set_permits(permits)
 
-    def _get_specific_limiter_for_window(self, window: int) -> FixedWindowRateLimiter:
+    def reconcile_counts(self, limits: List[List[int]], counts: List[List[int]]) -> None:
+        # Only adaptive limiters can use the server's counts; fixed windows assume they agree with the server
+        # Like adjust_rate_limits_if_necessary, the server's limits are scaled down to this process's share of them
+        server_permits = {window: permits * self.limiting_share for permits, window in limits}
+        for count, window in counts:
+            limiter = self._get_specific_limiter_for_window(window)
+            if isinstance(limiter, AdaptiveRateLimiter) and window in server_permits:
+                limiter.reconcile(count, server_permits[window])
+
+    def _get_specific_limiter_for_window(self, window: int) -> Union[FixedWindowRateLimiter, AdaptiveRateLimiter]:
         for limiter in self._limiters:
             if limiter._window_seconds == window:
                 return limiter
 
 
+_PRIORITIES = ("interactive", "normal", "background")
+_thread_priority = local()
+
+
+@contextmanager
+def request_priority(priority: str):
+    """Sends the Riot API requests this thread makes inside the block with the given priority, one of "interactive",
+    "normal" (the default) or "background".
+    """
+    if priority not in _PRIORITIES:
+        raise ValueError("Unknown request priority \"{}\"; use one of {}.".format(priority, ", ".join(_PRIORITIES)))
+    previous = getattr(_thread_priority, "priority", None)
+    _thread_priority.priority = priority
+    try:
+        yield
+    finally:
+        _thread_priority.priority = previous
+
+
+def _current_priority() -> str:
+    return getattr(_thread_priority, "priority", None) or "normal"
+
+
+class RequestScheduler(object):
+    # Decides the order in which waiting requests enter the application rate limiter.
+    # Requests wait in a queue per method bucket (one per platform and endpoint). The highest priority class with anything
+    # waiting always goes first, and within a class the platforms take turns, as do the buckets of each platform, so one
+    # busy platform or endpoint can't starve the others.
+    # Only one request at a time waits inside the application limiter, so a request that arrives while a window is full
+    # goes ahead of any lower priority requests that are queued behind it.
+
+    def __init__(self, app_rate_limiter: RiotAPIRateLimiter):
+        self._app_rate_limiter = app_rate_limiter
+        self._condition = Condition()
+        self._waiting = {priority: collections.OrderedDict() for priority in _PRIORITIES}  # type: Dict[str, Dict[Platform, Dict[RateLimiter, collections.deque]]]
+        self._admitting = False
+
+    def limiter(self, platform: Platform, bucket: RateLimiter, priority: str = None) -> "_ScheduledRateLimiter":
+        return _ScheduledRateLimiter(self, platform, bucket, priority or _current_priority())
+
+    def _next(self) -> object:
+        for priority in _PRIORITIES:
+            for buckets in self._waiting[priority].values():
+                for tickets in buckets.values():
+                    if tickets:
+                        return tickets[0]
+
+    def _enqueue(self, platform: Platform, bucket: RateLimiter, priority: str, ticket: object) -> None:
+        # Platforms and buckets that haven't had a turn yet go to the front of the line
+        platforms = self._waiting[priority]
+        if platform not in platforms:
+            platforms[platform] = collections.OrderedDict()
+            platforms.move_to_end(platform, last=False)
+        buckets = platforms[platform]
+        if bucket not in buckets:
+            buckets[bucket] = collections.deque()
+            buckets.move_to_end(bucket, last=False)
+        buckets[bucket].append(ticket)
+
+    def _take_turn(self, platform: Platform, bucket: RateLimiter, priority: str) -> None:
+        # Send this bucket and platform to the back of the line for their priority class
+        platforms = self._waiting[priority]
+        platforms[platform][bucket].popleft()
+        platforms[platform].move_to_end(bucket)
+        platforms.move_to_end(platform)
+
+    def acquire(self, platform: Platform, bucket: RateLimiter, priority: str) -> None:
+        ticket = object()
+        with self._condition:
+            self._enqueue(platform, bucket, priority, ticket)
+            while self._admitting or self._next() is not ticket:
+                self._condition.wait()
+            self._take_turn(platform, bucket, priority)
+            self._admitting = True
+        try:
+            self._app_rate_limiter.__enter__()
+        finally:
+            with self._condition:
+                self._admitting = False
+                self._condition.notify_all()
+
+    def release(self, exc_type=None, exc_val=None, exc_tb=None) -> None:
+        self._app_rate_limiter.__exit__(exc_type, exc_val, exc_tb)
+
+
+class _ScheduledRateLimiter(RateLimiter):
+    # The application rate limiter as seen by one request, which waits its turn in the scheduler before entering it
+
+    def __init__(self, scheduler: RequestScheduler, platform: Platform, bucket: RateLimiter, priority: str):
+        self._scheduler = scheduler
+        self._platform = platform
+        self._bucket = bucket
+        self._priority = priority
+
+    def __enter__(self) -> "_ScheduledRateLimiter":
+        self._scheduler.acquire(self._platform, self._bucket, self._priority)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._scheduler.release(exc_type, exc_val, exc_tb)
+
+    def restrict_for(self, seconds: int) -> None:
+        self._scheduler._app_rate_limiter.restrict_for(seconds)
+
+    @property
+    def permits_issued(self) -> int:
+        return self._scheduler._app_rate_limiter.permits_issued
+
+    def reset_permits_issued(self) -> None:
+        self._scheduler._app_rate_limiter.reset_permits_issued()
+
+
 def _split_rate_limit_header(header):
     rates = []
     for pw in header.split(","):
@@ -92,9 +408,11 @@ def _split_rate_limit_header(header):
 
 
 class RiotAPIService(DataSource):
-    def __init__(self, api_key: str, app_rate_limiter: RiotAPIRateLimiter, request_by_id: bool = True, request_error_handling: Dict = None, http_client: HTTPClient = None):
+    def __init__(self, api_key: str, app_rate_limiter: RiotAPIRateLimiter, request_by_id: bool = True, request_error_handling: Dict = None, http_client: HTTPClient = None, max_concurrent_requests: int = 16, scheduler: RequestScheduler = None):
         self._limiting_share = app_rate_limiter.limiting_share
+        self._app_rate_limiter = app_rate_limiter
         self._request_by_id = request_by_id
+        self._max_concurrent_requests = max_concurrent_requests
 
         if http_client is None:
             self._client = HTTPClient()
@@ -109,6 +427,10 @@ class RiotAPIService(DataSource):
         self._rate_limiters = {
             "application": app_rate_limiter
         }
+        self._platforms = {}  # type: Dict[RiotAPIRateLimiter, Platform]
+        if scheduler is None:
+            scheduler = RequestScheduler(app_rate_limiter)
+        self._scheduler = scheduler
 
         default_request_error_handling = {
             "404": {
@@ -191,21 +513,33 @@ class RiotAPIService(DataSource):
         try:
             limiter = self._rate_limiters[(platform, endpoint)]
         except KeyError:
-            limiter = RiotAPIRateLimiter(self._limiting_share)
+            app = self._app_rate_limiter
+            limiter = RiotAPIRateLimiter(self._limiting_share, app.adaptive, app.shared_directory, name="{} {} {}".format(app.name, platform.value, endpoint))
             self._rate_limiters[(platform, endpoint)] = limiter
+            self._platforms[limiter] = platform
         return limiter
 
+    def _request_rate_limiters(self, rate_limiter: RiotAPIRateLimiter, priority: str = None) -> List[RateLimiter]:
+        # The method limiter is entered first so that waiting for its window doesn't hold up other buckets in the scheduler
+        return [rate_limiter, self._scheduler.limiter(self._platforms.get(rate_limiter), rate_limiter, priority)]
+
     def _adjust_rate_limiters_from_headers(self, rate_limiter, response_headers):
         # If Riot changes the # of permits allowed in their response headers, change our rate limiters.
-        # We are currently ignoring the X-*-Rate-Limit-Count headers and assuming our rate limiter logic agrees.
-        if "X-App-Rate-Limit" in response_headers:
-            limits = _split_rate_limit_header(response_headers["X-App-Rate-Limit"])
-            self._rate_limiters["application"].adjust_rate_limits_if_necessary(limits)
-        if "X-Method-Rate-Limit" in response_headers:
-            limits = _split_rate_limit_header(response_headers["X-Method-Rate-Limit"])
-            rate_limiter.adjust_rate_limits_if_necessary(limits)
+        # Adaptive rate limiters also catch up with the X-*-Rate-Limit-Count headers, which count requests from every
+        # process using this API key; fixed window rate limiters assume that they agree with the server.
+        for limiter, prefix in ((self._rate_limiters["application"], "X-App-Rate-Limit"), (rate_limiter, "X-Method-Rate-Limit")):
+            if prefix in response_headers:
+                limits = _split_rate_limit_header(response_headers[prefix])
+                limiter.adjust_rate_limits_if_necessary(limits)
+                if prefix + "-Count" in response_headers:
+                    limiter.reconcile_counts(limits, _split_rate_limit_header(response_headers[prefix + "-Count"]))
 
     def _get(self, url: str, parameters: MutableMapping[str, Any] = None, rate_limiter: RiotAPIRateLimiter = None, connection: Curl = None) -> Union[dict, list, Any]:
+        # If this lookup is being run for asyncio code, send the request on the caller's event loop and wait for it here.
+        loop = _event_loop()
+        if loop is not None:
+            return asyncio.run_coroutine_threadsafe(self._get_async(url, parameters, rate_limiter, _current_priority()), loop).result()
+
         # Make a new RiotAPIRequest and run it until it returns or fails.
         # If it returns, return the result.
         # If it fails, throw an appropriate error.
@@ -213,22 +547,84 @@ class RiotAPIService(DataSource):
         try:
             return request()
         except HTTPError as error:
-            # The error handlers didn't work, so raise an appropriate error.
-            new_error_type = _ERROR_CODES[error.code]
-            if new_error_type is RuntimeError:
-                new_error = RuntimeError("Encountered an HTTP error code {code} with message \"{message}\" which should have already been handled. Report this to the Cassiopeia team.".format(code=error.code, message=str(error)))
-            elif new_error_type is APIError:
-                new_error = APIError("The Riot API experienced an internal error on the request. You may want to retry the request after a short wait or continue without the result. The received error was {code}: \"{message}\"".format(code=error.code, message=str(error)), error.code)
-            elif new_error_type is APINotFoundError:
-                new_error = APINotFoundError("The Riot API returned a NOT FOUND error for the request. The received error was {code}: \"{message}\"".format(code=error.code, message=str(error)), error.code)
-            elif new_error_type is APIRequestError:
-                new_error = APIRequestError("The Riot API returned an error on the request. The received error was {code}: \"{message}\"".format(code=error.code, message=str(error)), error.code)
-            elif new_error_type is APIForbiddenError:
-                new_error = APIForbiddenError("The Riot API returned a FORBIDDEN error for the request. The received error was {code}: \"{message}\"".format(code=error.code, message=str(error)), error.code)
-            else:
-                new_error = new_error_type(str(error))
+            raise self._convert_error(error) from error
 
-            raise new_error from error
+    async def _get_async(self, url: str, parameters: MutableMapping[str, Any] = None, rate_limiter: RiotAPIRateLimiter = None, priority: str = None) -> Union[dict, list, Any]:
+        request = RiotAPIRequest(service=self, url=url, parameters=parameters, rate_limiter=rate_limiter, connection=None, priority=priority)
+        try:
+            return await request.call_async()
+        except HTTPError as error:
+            raise self._convert_error(error) from error
+
+    @staticmethod
+    def _convert_error(error: HTTPError) -> Exception:
+        # The error handlers didn't work, so raise an appropriate error.
+        new_error_type = _ERROR_CODES[error.code]
+        if new_error_type is RuntimeError:
+            new_error = RuntimeError("Encountered an HTTP error code {code} with message \"{message}\" which should have already been handled. Report this to the Cassiopeia team.".format(code=error.code, message=str(error)))
+        elif new_error_type is APIError:
+            new_error = APIError("The Riot API experienced an internal error on the request. You may want to retry the request after a short wait or continue without the result. The received error was {code}: \"{message}\"".format(code=error.code, message=str(error)), error.code)
+        elif new_error_type is APINotFoundError:
+            new_error = APINotFoundError("The Riot API returned a NOT FOUND error for the request. The received error was {code}: \"{message}\"".format(code=error.code, message=str(error)), error.code)
+        elif new_error_type is APIRequestError:
+            new_error = APIRequestError("The Riot API returned an error on the request. The received error was {code}: \"{message}\"".format(code=error.code, message=str(error)), error.code)
+        elif new_error_type is APIForbiddenError:
+            new_error = APIForbiddenError("The Riot API returned a FORBIDDEN error for the request. The received error was {code}: \"{message}\"".format(code=error.code, message=str(error)), error.code)
+        else:
+            new_error = new_error_type(str(error))
+
+        return new_error
+
+    def _get_many(self, requests: Iterable[Tuple[Any, str, MutableMapping[str, Any]]], rate_limiter: RiotAPIRateLimiter = None, ordered: bool = True) -> Generator[Tuple[Any, Union[dict, list, Any]], None, None]:
+        # Make the requests concurrently and yield (key, body) pairs, either in the order they were given or as they complete.
+        # Failed requests go through the same error handlers as a single request, but instead of sleeping through a
+        # backoff they are parked by the HTTPClient while the rest of the requests carry on.
+        # Anything the handlers can't deal with is re-run through _get so that it raises the same error as a single request.
+        requests = list(requests)
+        if self._max_concurrent_requests <= 1 or len(requests) <= 1:
+            for key, url, parameters in requests:
+                yield key, self._get(url, parameters, rate_limiter)
+            return
+
+        rate_limiters = self._request_rate_limiters(rate_limiter)
+        handlers = collections.defaultdict(list)  # type: Dict[int, List[FailedRequestHandler]]
+        gave_up = set()
+
+        def retry(index: int, error: Exception) -> Optional[float]:
+            if not isinstance(error, HTTPError):
+                return None
+            key, url, parameters = requests[index]
+            request = RiotAPIRequest(service=self, url=url, parameters=parameters, rate_limiter=rate_limiter, connection=None)
+            try:
+                handler = request._new_handler(error, handlers[index])
+            except (KeyError, ValueError):
+                return None
+            delay = None if handler.stop else handler.delay(error, self._headers, rate_limiters)
+            if delay is None:
+                gave_up.add(index)
+            elif handler not in handlers[index]:
+                handlers[index].append(handler)
+            return delay
+
+        responses = self._client.get_many(requests=[(url, parameters) for key, url, parameters in requests],
+                                          headers=self._headers,
+                                          rate_limiters=rate_limiters,
+                                          max_in_flight=self._max_concurrent_requests,
+                                          ordered=ordered,
+                                          retry=retry)
+        try:
+            for index, response in responses:
+                key, url, parameters = requests[index]
+                if isinstance(response, HTTPError) and index in gave_up:
+                    raise self._convert_error(response) from response
+                elif isinstance(response, Exception):
+                    yield key, self._get(url, parameters, rate_limiter)
+                else:
+                    body, response_headers = response
+                    self._adjust_rate_limiters_from_headers(rate_limiter, response_headers)
+                    yield key, body
+        finally:
+            responses.close()
 
     @abstractmethod
     def get(self, type: Type[T], query: MutableMapping[str, Any], context: PipelineContext = None) -> T:
@@ -241,52 +637,90 @@ class RiotAPIService(DataSource):
 
 
 class RiotAPIRequest(object):
-    def __init__(self, service: RiotAPIService, url: str, parameters: MutableMapping[str, Any], rate_limiter: RiotAPIRateLimiter, connection: Curl):
+    def __init__(self, service: RiotAPIService, url: str, parameters: MutableMapping[str, Any], rate_limiter: RiotAPIRateLimiter, connection: Curl, priority: str = None):
         self.service = service
         self.url = url
         self.parameters = parameters
         self.rate_limiter = rate_limiter
         self.connection = connection
+        self.priority = priority or _current_priority()
 
     def __call__(self):
         try:
             body, response_headers = self.service._client.get(url=self.url,
                                                       parameters=self.parameters,
                                                       headers=self.service._headers,
-                                                      rate_limiters=[self.service._rate_limiters["application"], self.rate_limiter],
+                                                      rate_limiters=self.service._request_rate_limiters(self.rate_limiter, self.priority),
                                                       connection=self.connection)
             self.service._adjust_rate_limiters_from_headers(self.rate_limiter, response_headers)
             return body
         except HTTPError as error:
             return self._retry_request_by_handling_error(error)
 
+    async def call_async(self):
+        try:
+            body, response_headers = await self.service._client.get_async(url=self.url,
+                                                                          parameters=self.parameters,
+                                                                          headers=self.service._headers,
+                                                                          rate_limiters=self.service._request_rate_limiters(self.rate_limiter, self.priority))
+            self.service._adjust_rate_limiters_from_headers(self.rate_limiter, response_headers)
+            return body
+        except HTTPError as error:
+            return await self._retry_request_by_handling_error_async(error)
+
+    def _new_handler(self, error: HTTPError, handlers: List["FailedRequestHandler"]) -> "FailedRequestHandler":
+        # Try to properly handling the 429 and retry the call after the appropriate time limit.
+        if error.code == 429:
+            # Identify which rate limit was hit (application, method, or service)
+            if "X-Rate-Limit-Type" not in error.response_headers:
+                rate_limiting_type = "service"
+            elif error.response_headers["X-Rate-Limit-Type"] == "application":
+                rate_limiting_type = "application"
+            elif error.response_headers["X-Rate-Limit-Type"] == "method":
+                rate_limiting_type = "method"
+            elif error.response_headers["X-Rate-Limit-Type"] == "service":
+                rate_limiting_type = "service"
+            else:
+                raise ValueError("Unknown cause of rate limit; aborting. Headers were: {}".format(error.response_headers))
+
+            # Create a new handler
+            new_handler = self.service._handlers[429][rate_limiting_type]()  # type: FailedRequestHandler
+        else:
+            new_handler = self.service._handlers[error.code]()
+
+        # If we will handle the new error in the same way as we did previously, don't use a new instance
+        for handler in handlers:
+            if isinstance(new_handler, handler.__class__):
+                new_handler = handler
+                break
+        return new_handler
+
+    async def _retry_request_by_handling_error_async(self, error: HTTPError, handlers=None):
+        if handlers is None:
+            handlers = []
+        new_handler = self._new_handler(error, handlers)
+
+        if new_handler.stop:
+            raise error
+        else:
+            try:
+                body, response_headers = await new_handler.call_async(error=error,
+                                                                      requester=self.service._client.get_async,
+                                                                      url=self.url,
+                                                                      parameters=self.parameters,
+                                                                      headers=self.service._headers,
+                                                                      rate_limiters=self.service._request_rate_limiters(self.rate_limiter, self.priority))
+                self.service._adjust_rate_limiters_from_headers(self.rate_limiter, response_headers)
+                return body
+            except HTTPError as error:
+                if new_handler not in handlers:
+                    handlers.append(new_handler)
+                return await self._retry_request_by_handling_error_async(error, handlers=handlers)
+
     def _retry_request_by_handling_error(self, error: HTTPError, handlers=None):
             if handlers is None:
                 handlers = []
-            # Try to properly handling the 429 and retry the call after the appropriate time limit.
-            if error.code == 429:
-                # Identify which rate limit was hit (application, method, or service)
-                if "X-Rate-Limit-Type" not in error.response_headers:
-                    rate_limiting_type = "service"
-                elif error.response_headers["X-Rate-Limit-Type"] == "application":
-                    rate_limiting_type = "application"
-                elif error.response_headers["X-Rate-Limit-Type"] == "method":
-                    rate_limiting_type = "method"
-                elif error.response_headers["X-Rate-Limit-Type"] == "service":
-                    rate_limiting_type = "service"
-                else:
-                    raise ValueError("Unknown cause of rate limit; aborting. Headers were: {}".format(error.response_headers))
-
-                # Create a new handler
-                new_handler = self.service._handlers[429][rate_limiting_type]()  # type: FailedRequestHandler
-            else:
-                new_handler = self.service._handlers[error.code]()
-
-            # If we will handle the new error in the same way as we did previously, don't use a new instance
-            for handler in handlers:
-                if isinstance(new_handler, handler.__class__):
-                    new_handler = handler
-                    break
+            new_handler = self._new_handler(error, handlers)
 
             if new_handler.stop:
                 raise error
@@ -297,7 +731,7 @@ class RiotAPIRequest(object):
                                                      url=self.url,
                                                      parameters=self.parameters,
                                                      headers=self.service._headers,
-                                                     rate_limiters=[self.service._rate_limiters["application"], self.rate_limiter],
+                                                     rate_limiters=self.service._request_rate_limiters(self.rate_limiter, self.priority),
                                                      connection=self.connection
                                                      )
                     self.service._adjust_rate_limiters_from_headers(self.rate_limiter, response_headers)
@@ -309,10 +743,31 @@ class RiotAPIRequest(object):
 
 
 class FailedRequestHandler(ABC):
+    stop = False
+
     @abstractmethod
-    def __call__(self, error, requester, url, parameters, headers, rate_limiters, connection) -> Tuple[Union[dict, list, str, bytes], dict]:
+    def delay(self, error, headers, rate_limiters) -> Optional[float]:
+        """Returns how many seconds to wait before retrying the failed request, or None if it shouldn't be retried.
+
+        Handlers don't wait themselves, so a caller that has other work to do (like HTTPClient.get_many) can park the
+        request and carry on until it is due.
+        """
         pass
 
+    def __call__(self, error, requester, url, parameters, headers, rate_limiters, connection) -> Tuple[Union[dict, list, str, bytes], dict]:
+        delay = self.delay(error, headers, rate_limiters)
+        if delay is None:
+            raise error
+        time.sleep(delay)
+        return requester(url, parameters, headers, rate_limiters, connection)
+
+    async def call_async(self, error, requester, url, parameters, headers, rate_limiters) -> Tuple[Union[dict, list, str, bytes], dict]:
+        delay = self.delay(error, headers, rate_limiters)
+        if delay is None:
+            raise error
+        await asyncio.sleep(delay)
+        return await requester(url, parameters, headers, rate_limiters)
+
 
 class ExponentialBackoff(FailedRequestHandler):
     def __init__(self, initial_backoff: int, backoff_factor: int, max_attempts: int):
@@ -322,39 +777,39 @@ class ExponentialBackoff(FailedRequestHandler):
         self.attempts = 0
         self.stop = False
 
-    def __call__(self, error, requester, url, parameters, headers, rate_limiters, connection) ->  Tuple[Union[dict, list, str, bytes], dict]:
+    def delay(self, error, headers, rate_limiters) -> Optional[float]:
         if self.attempts >= self.max_attempts:
             self.stop = True
-            raise error
+            return None
         print("INFO: Unexpected {} error ({}), backing off for {} seconds.".format(headers.get('X-Rate-Limit-Type', 'service'), error.code, self.backoff))
-        time.sleep(self.backoff)
+        backoff = self.backoff
         self.backoff = self.backoff * self.factor
         self.attempts += 1
-        return requester(url, parameters, headers, rate_limiters, connection)
+        return backoff
 
 
-class RetryFromHeaders(object):
+class RetryFromHeaders(FailedRequestHandler):
     def __init__(self, max_attempts: int):
         self.max_attempts = int(max_attempts)
         self.attempts = 0
         self.stop = False
 
-    def __call__(self, error, requester, url, parameters, headers, rate_limiters, connection) -> Tuple[Union[dict, list, str, bytes], dict]:
+    def delay(self, error, headers, rate_limiters) -> Optional[float]:
         if self.attempts >= self.max_attempts:
             self.stop = True
-            raise error
+            return None
         backoff = int(error.response_headers["Retry-After"])
         print("INFO: Unexpected {} rate limit, backing off for {} seconds (from headers).".format(headers.get('X-Rate-Limit-Type', 'service'), backoff))
-        time.sleep(backoff)
+        # Restrict the rate limiters straight away so that every other request sharing them waits out the same window
         for rate_limiter in rate_limiters:
             rate_limiter.restrict_for(backoff)
         self.attempts += 1
-        return requester(url, parameters, headers, rate_limiters, connection)
+        return backoff
 
 
 class ThrowException(FailedRequestHandler):
     def __init__(self):
         self.stop  = True
 
-    def __call__(self, error, requester, url, parameters, headers, rate_limiters, connection) -> Tuple[Union[dict, list, str, bytes], dict]:
-        raise error
+    def delay(self, error, headers, rate_limiters) -> Optional[float]:
+        return None
@@ -42,25 +42,24 @@ class LeaguesAPI(RiotAPIService):
 
     _validate_get_many_league_positions_query = Query. \
         has("summoner.ids").as_(Iterable).also. \
-        has("platform").as_(Platform)
+        has("platform").as_(Platform).also. \
+        can_have("ordered").with_default(True)
 
     @get_many.register(LeaguePositionsDto)
     @validate_query(_validate_get_many_league_positions_query, convert_region_to_platform)
     def get_leagues(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> Generator[LeaguePositionsDto, None, None]:
         def generator():
-            for id in query["summoner.ids"]:
-                url = "https://{platform}.api.riotgames.com/lol/league/v3/positions/by-summoner/{summonerId}".format(platform=query["platform"].value.lower(), summonerId=id)
-                try:
-                    data = self._get(url, {}, self._get_rate_limiter(query["platform"], "positions/by-summoner/summonerId {}".format(query["platform"].value)))
-                except APINotFoundError as error:
-                    raise NotFoundError(str(error)) from error
-
-                data = {"positions": data}
-                data["region"] = query["platform"].region.value
-                data["summonerId"] = id
-                for position in data["positions"]:
-                    position["region"] = data["region"]
-                yield LeaguePositionsDto(data)
+            requests = [(id, "https://{platform}.api.riotgames.com/lol/league/v3/positions/by-summoner/{summonerId}".format(platform=query["platform"].value.lower(), summonerId=id), {}) for id in query["summoner.ids"]]
+            try:
+                for id, data in self._get_many(requests, self._get_rate_limiter(query["platform"], "positions/by-summoner/summonerId {}".format(query["platform"].value)), ordered=query["ordered"]):
+                    data = {"positions": data}
+                    data["region"] = query["platform"].region.value
+                    data["summonerId"] = id
+                    for position in data["positions"]:
+                        position["region"] = data["region"]
+                    yield LeaguePositionsDto(data)
+            except APINotFoundError as error:
+                raise NotFoundError(str(error)) from error
 
         return generator()
 
@@ -87,49 +86,47 @@ class LeaguesAPI(RiotAPIService):
 
     _validate_get_many_leagues_by_summoner_query = Query. \
         has("summoner.ids").as_(Iterable).also. \
-        has("platform").as_(Platform)
+        has("platform").as_(Platform).also. \
+        can_have("ordered").with_default(True)
 
     @get_many.register(LeaguesListDto)
     @validate_query(_validate_get_many_leagues_by_summoner_query, convert_region_to_platform)
     def get_many_leagues_list(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> Generator[LeaguesListDto, None, None]:
         def generator():
-            for id in query["summoner.ids"]:
-                url = "https://{platform}.api.riotgames.com/lol/league/v3/leagues/by-summoner/{summonerId}".format(platform=query["platform"].value.lower(), summonerId=id)
-                try:
-                    data = self._get(url, {}, self._get_rate_limiter(query["platform"], "leagues/by-summoner/summonerId {}".format(query["platform"].value)))
-                except APINotFoundError as error:
-                    raise NotFoundError(str(error)) from error
-
-                data["region"] = query["platform"].region.value
-                data["summonerId"] = id
-                for entry in data["entries"]:
-                    entry["region"] = data["region"]
-                yield LeaguesListDto(data)
+            requests = [(id, "https://{platform}.api.riotgames.com/lol/league/v3/leagues/by-summoner/{summonerId}".format(platform=query["platform"].value.lower(), summonerId=id), {}) for id in query["summoner.ids"]]
+            try:
+                for id, data in self._get_many(requests, self._get_rate_limiter(query["platform"], "leagues/by-summoner/summonerId {}".format(query["platform"].value)), ordered=query["ordered"]):
+                    data["region"] = query["platform"].region.value
+                    data["summonerId"] = id
+                    for entry in data["entries"]:
+                        entry["region"] = data["region"]
+                    yield LeaguesListDto(data)
+            except APINotFoundError as error:
+                raise NotFoundError(str(error)) from error
 
         return generator()
 
     _validate_get_many_leagues_query = Query. \
         has("ids").as_(Iterable).also. \
-        has("platform").as_(Platform)
+        has("platform").as_(Platform).also. \
+        can_have("ordered").with_default(True)
 
     @get_many.register(LeagueListDto)
     @validate_query(_validate_get_many_leagues_query, convert_region_to_platform)
     def get_many_leagues_list(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> Generator[LeagueListDto, None, None]:
         def generator():
-            for id in query["ids"]:
-                url = "https://{platform}.api.riotgames.com/lol/league/v3/leagues/{leagueId}".format(platform=query["platform"].value.lower(), leagueId=id)
-                try:
-                    data = self._get(url, {}, self._get_rate_limiter(query["platform"], "leagues/leagueId {}".format(query["platform"].value)))
-                except APINotFoundError as error:
-                    raise NotFoundError(str(error)) from error
-
-                data = {"leagues": data}
-                data["region"] = query["platform"].region.value
-                for league in data["leagues"]:
-                    league["region"] = data["region"]
-                    for entry in league["entries"]:
-                        entry["region"] = data["region"]
-                yield LeagueListDto(data)
+            requests = [(id, "https://{platform}.api.riotgames.com/lol/league/v3/leagues/{leagueId}".format(platform=query["platform"].value.lower(), leagueId=id), {}) for id in query["ids"]]
+            try:
+                for id, data in self._get_many(requests, self._get_rate_limiter(query["platform"], "leagues/leagueId {}".format(query["platform"].value)), ordered=query["ordered"]):
+                    data = {"leagues": data}
+                    data["region"] = query["platform"].region.value
+                    for league in data["leagues"]:
+                        league["region"] = data["region"]
+                        for entry in league["entries"]:
+                            entry["region"] = data["region"]
+                    yield LeagueListDto(data)
+            except APINotFoundError as error:
+                raise NotFoundError(str(error)) from error
 
         return generator()
 
@@ -155,25 +152,24 @@ class LeaguesAPI(RiotAPIService):
 
     _validate_get_many_challenger_league_query = Query. \
         has("queues").as_(Iterable).also. \
-        has("platform").as_(Platform)
+        has("platform").as_(Platform).also. \
+        can_have("ordered").with_default(True)
 
     @get_many.register(ChallengerLeagueListDto)
     @validate_query(_validate_get_many_challenger_league_query, convert_region_to_platform)
     def get_challenger_leagues_list(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> Generator[ChallengerLeagueListDto, None, None]:
         def generator():
-            for queue in query["queues"]:
-                url = "https://{platform}.api.riotgames.com/lol/league/v3/challengerleagues/by-queue/{queueName}".format(platform=query["platform"].value.lower(), queueName=queue.value)
-                try:
-                    data = self._get(url, {}, self._get_rate_limiter(query["platform"], "challengerleagues/by-queue {}".format(query["platform"].value)))
-                except APINotFoundError as error:
-                    raise NotFoundError(str(error)) from error
-
-                data = {"leagues": data}
-                data["region"] = query["platform"].region.value
-                data["queue"] = queue.value
-                for entry in data["entries"]:
-                    entry["region"] = data["region"]
-                yield ChallengerLeagueListDto(data)
+            requests = [(queue, "https://{platform}.api.riotgames.com/lol/league/v3/challengerleagues/by-queue/{queueName}".format(platform=query["platform"].value.lower(), queueName=queue.value), {}) for queue in query["queues"]]
+            try:
+                for queue, data in self._get_many(requests, self._get_rate_limiter(query["platform"], "challengerleagues/by-queue {}".format(query["platform"].value)), ordered=query["ordered"]):
+                    data = {"leagues": data}
+                    data["region"] = query["platform"].region.value
+                    data["queue"] = queue.value
+                    for entry in data["entries"]:
+                        entry["region"] = data["region"]
+                    yield ChallengerLeagueListDto(data)
+            except APINotFoundError as error:
+                raise NotFoundError(str(error)) from error
 
         return generator()
 
@@ -199,24 +195,23 @@ class LeaguesAPI(RiotAPIService):
 
     _validate_get_many_master_league_query = Query. \
         has("queues").as_(Iterable).also. \
-        has("platform").as_(Platform)
+        has("platform").as_(Platform).also. \
+        can_have("ordered").with_default(True)
 
     @get_many.register(MasterLeagueListDto)
     @validate_query(_validate_get_many_master_league_query, convert_region_to_platform)
     def get_master_leagues_list(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> Generator[MasterLeagueListDto, None, None]:
         def generator():
-            for queue in query["queues"]:
-                url = "https://{platform}.api.riotgames.com/lol/league/v3/masterleagues/by-queue/{queueName}".format(platform=query["platform"].value.lower(), queueName=queue.value)
-                try:
-                    data = self._get(url, {}, self._get_rate_limiter(query["platform"], "masterleagues/by-queue {}".format(query["platform"].value)))
-                except APINotFoundError as error:
-                    raise NotFoundError(str(error)) from error
-
-                data = {"leagues": data}
-                data["region"] = query["platform"].region.value
-                data["queue"] = queue.value
-                for entry in data["entries"]:
-                    entry["region"] = data["region"]
-                yield MasterLeagueListDto(data)
+            requests = [(queue, "https://{platform}.api.riotgames.com/lol/league/v3/masterleagues/by-queue/{queueName}".format(platform=query["platform"].value.lower(), queueName=queue.value), {}) for queue in query["queues"]]
+            try:
+                for queue, data in self._get_many(requests, self._get_rate_limiter(query["platform"], "masterleagues/by-queue {}".format(query["platform"].value)), ordered=query["ordered"]):
+                    data = {"leagues": data}
+                    data["region"] = query["platform"].region.value
+                    data["queue"] = queue.value
+                    for entry in data["entries"]:
+                        entry["region"] = data["region"]
+                    yield MasterLeagueListDto(data)
+            except APINotFoundError as error:
+                raise NotFoundError(str(error)) from error
 
         return generator()
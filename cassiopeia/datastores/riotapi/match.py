@@ -50,29 +50,28 @@ class MatchAPI(RiotAPIService):
 
     _validate_get_many_match_query = Query. \
         has("ids").as_(Iterable).also. \
-        has("platform").as_(Platform)
+        has("platform").as_(Platform).also. \
+        can_have("ordered").with_default(True)
 
     @get_many.register(MatchDto)
     @validate_query(_validate_get_many_match_query, convert_region_to_platform)
     def get_many_match(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> Generator[MatchDto, None, None]:
         def generator():
-            for id in query["ids"]:
-                url = "https://{platform}.api.riotgames.com/lol/match/v3/matches/{id}".format(platform=query["platform"].value.lower(), id=id)
-                try:
-                    data = self._get(url, {}, self._get_rate_limiter(query["platform"], "matches/id"))
-                except APINotFoundError as error:
-                    raise NotFoundError(str(error)) from error
-                
-                for participant in data["participants"]:
-                    participant.setdefault("runes", [])
-                for p in data["participantIdentities"]:
-                    aid = p.get("player", {}).get("currentAccountId", None)
-                    if aid == 0:
-                        p["player"]["bot"] = True
-
-                data["gameId"] = id
-                data["region"] = query["platform"].region.value
-                yield MatchDto(data)
+            requests = [(id, "https://{platform}.api.riotgames.com/lol/match/v3/matches/{id}".format(platform=query["platform"].value.lower(), id=id), {}) for id in query["ids"]]
+            try:
+                for id, data in self._get_many(requests, self._get_rate_limiter(query["platform"], "matches/id"), ordered=query["ordered"]):
+                    for participant in data["participants"]:
+                        participant.setdefault("runes", [])
+                    for p in data["participantIdentities"]:
+                        aid = p.get("player", {}).get("currentAccountId", None)
+                        if aid == 0:
+                            p["player"]["bot"] = True
+
+                    data["gameId"] = id
+                    data["region"] = query["platform"].region.value
+                    yield MatchDto(data)
+            except APINotFoundError as error:
+                raise NotFoundError(str(error)) from error
 
         return generator()
 
@@ -179,23 +178,22 @@ class MatchAPI(RiotAPIService):
         can_have("endIndex").as_(int).also. \
         can_have("seasons").as_(Iterable).also. \
         can_have("champion.ids").as_(Iterable).also. \
-        can_have("queues").as_(Iterable)
+        can_have("queues").as_(Iterable).also. \
+        can_have("ordered").with_default(True)
 
     @get_many.register(MatchListDto)
     @validate_query(_validate_get_many_match_list_query, convert_region_to_platform)
     def get_many_match_list(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> Generator[MatchListDto, None, None]:
         if query["recent"]:
             def generator():
-                for id in query["account.ids"]:
-                    url = "https://{platform}.api.riotgames.com/lol/match/v3/matchlists/by-account/{accountId}/recent".format(platform=query["platform"].value.lower(), accountId=id)
-                    try:
-                        data = self._get(url, {}, self._get_rate_limiter(query["platform"], "matchlists/by-account/accountId/recent"))
-                    except APINotFoundError as error:
-                        raise NotFoundError(str(error)) from error
-
-                    data["account.id"] = id
-                    data["region"] = query["platform"].region.value
-                    yield MatchListDto(data)
+                requests = [(id, "https://{platform}.api.riotgames.com/lol/match/v3/matchlists/by-account/{accountId}/recent".format(platform=query["platform"].value.lower(), accountId=id), {}) for id in query["account.ids"]]
+                try:
+                    for id, data in self._get_many(requests, self._get_rate_limiter(query["platform"], "matchlists/by-account/accountId/recent"), ordered=query["ordered"]):
+                        data["account.id"] = id
+                        data["region"] = query["platform"].region.value
+                        yield MatchListDto(data)
+                except APINotFoundError as error:
+                    raise NotFoundError(str(error)) from error
         else:
             params = {}
 
@@ -221,26 +219,24 @@ class MatchAPI(RiotAPIService):
                 queues = set()
 
             def generator():
-                for id in query["account.ids"]:
-                    url = "https://{platform}.api.riotgames.com/lol/match/v3/matchlists/by-account/{accountId}".format(platform=query["platform"].value.lower(), accountId=id)
-                    try:
-                        data = self._get(url, params, self._get_rate_limiter(query["platform"], "matchlists/by-account/accountId"))
-                    except APINotFoundError as error:
-                        raise NotFoundError(str(error)) from error
-
-                    data["account.id"] = id
-                    data["region"] = query["platform"].region.value
-                    if "beginIndex" in query:
-                        data["beginIndex"] = query["beginIndex"]
-                    if "endIndex" in query:
-                        data["endIndex"] = query["endIndex"]
-                    if "seasons" in query:
-                        data["seasons"] = seasons
-                    if "champion.ids" in query:
-                        data["champion"] = params["champion"]
-                    if "queues" in query:
-                        params["queue"] = queues
-                    yield MatchListDto(data)
+                requests = [(id, "https://{platform}.api.riotgames.com/lol/match/v3/matchlists/by-account/{accountId}".format(platform=query["platform"].value.lower(), accountId=id), params) for id in query["account.ids"]]
+                try:
+                    for id, data in self._get_many(requests, self._get_rate_limiter(query["platform"], "matchlists/by-account/accountId"), ordered=query["ordered"]):
+                        data["account.id"] = id
+                        data["region"] = query["platform"].region.value
+                        if "beginIndex" in query:
+                            data["beginIndex"] = query["beginIndex"]
+                        if "endIndex" in query:
+                            data["endIndex"] = query["endIndex"]
+                        if "seasons" in query:
+                            data["seasons"] = seasons
+                        if "champion.ids" in query:
+                            data["champion"] = params["champion"]
+                        if "queues" in query:
+                            data["queue"] = queues
+                        yield MatchListDto(data)
+                except APINotFoundError as error:
+                    raise NotFoundError(str(error)) from error
 
         return generator()
 
@@ -263,21 +259,20 @@ class MatchAPI(RiotAPIService):
 
     _validate_get_many_timeline_query = Query. \
         has("ids").as_(Iterable).also. \
-        has("platform").as_(Platform)
+        has("platform").as_(Platform).also. \
+        can_have("ordered").with_default(True)
 
     @get_many.register(TimelineDto)
     @validate_query(_validate_get_many_timeline_query, convert_region_to_platform)
     def get_many_match_timeline(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> Generator[TimelineDto, None, None]:
         def generator():
-            for id in query["ids"]:
-                url = "https://{platform}.api.riotgames.com/lol/match/v3/timelines/by-match/{id}".format(platform=query["platform"].value.lower(), id=id)
-                try:
-                    data = self._get(url, {}, self._get_rate_limiter(query["platform"], "timelines/by-match/id"))
-                except APINotFoundError as error:
-                    raise NotFoundError(str(error)) from error
-
-                data["matchId"] = id
-                data["region"] = query["platform"].region.value
-                yield TimelineDto(data)
+            requests = [(id, "https://{platform}.api.riotgames.com/lol/match/v3/timelines/by-match/{id}".format(platform=query["platform"].value.lower(), id=id), {}) for id in query["ids"]]
+            try:
+                for id, data in self._get_many(requests, self._get_rate_limiter(query["platform"], "timelines/by-match/id"), ordered=query["ordered"]):
+                    data["matchId"] = id
+                    data["region"] = query["platform"].region.value
+                    yield TimelineDto(data)
+            except APINotFoundError as error:
+                raise NotFoundError(str(error)) from error
 
         return generator()
@@ -19,9 +19,17 @@ T = TypeVar("T")
 
 
 def _get_latest_version(query: MutableMapping[str, Any], context: PipelineContext) -> str:
+    from ...core.common import get_latest_version, memoized_latest_versions
+    if context is None:
+        return get_latest_version(region=query["platform"].region, endpoint=None)
     pipeline = context[PipelineContext.Keys.PIPELINE]
-    realms = pipeline.get(RealmDto, {"platform": query["platform"]})
-    return realms["v"]
+
+    def load():
+        realms = pipeline.get(RealmDto, {"platform": query["platform"]})
+        return realms["v"], realms["n"]
+
+    version, _ = memoized_latest_versions(pipeline, query["platform"].region, load)
+    return version
 
 
 def _get_default_locale(query: MutableMapping[str, Any], context: PipelineContext) -> str:
@@ -0,0 +1,335 @@
+from typing import Type, TypeVar, MutableMapping, Mapping, Any, Iterable, Callable, Generator, Tuple, List, Dict, Optional
+import datetime
+import sqlite3
+import time
+import zlib
+from threading import Event, Lock, Thread
+from weakref import ref
+
+from datapipelines import DataSource, DataSink, PipelineContext, validate_query, NotFoundError
+
+from . import uniquekeys
+from ..dto.championmastery import ChampionMasteryListDto
+from ..dto.league import LeaguePositionsDto
+from ..dto.match import MatchDto, TimelineDto
+from ..dto.summoner import SummonerDto
+
+try:
+    import ujson as json
+except ImportError:
+    import json
+
+T = TypeVar("T")
+
+
+# The same lifetimes as the Cache, except that a match never changes once it has been played
+default_expirations = {
+    ChampionMasteryListDto: datetime.timedelta(days=7),
+    LeaguePositionsDto: datetime.timedelta(hours=6),
+    MatchDto: -1,
+    TimelineDto: -1,
+    SummonerDto: datetime.timedelta(days=1),
+}
+
+
+class SQLiteStore(DataSource, DataSink):
+    """Persists Riot API responses in a SQLite database so they survive restarts.
+
+    Values are stored as zlib-compressed JSON and keyed by the functions in `uniquekeys`. The store can be shared
+    between threads; all access goes through one connection guarded by a lock.
+
+    Writes are buffered and committed in one transaction once `batch_size` of them are waiting or the oldest has
+    waited `flush_interval` seconds. Buffered writes are visible to reads immediately. The default batch size of 1
+    writes through on every put.
+    """
+    def __init__(self, path: str = "cassiopeia.sqlite", expirations: Mapping[type, float] = None, compression_level: int = 6, batch_size: int = 1, flush_interval: float = 1.0) -> None:
+        if batch_size < 1:
+            raise ValueError("The batch size must be at least 1.")
+        self._path = path
+        self._compression_level = compression_level
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._pending = {}  # type: Dict[Tuple[str, str], Tuple[bytes, Optional[float]]]
+        self._pending_since = None  # type: Optional[float]
+        self._lock = Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            if path != ":memory:":
+                self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS entries (type TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, expires REAL, PRIMARY KEY (type, key)) WITHOUT ROWID")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS entries_expires ON entries (expires) WHERE expires IS NOT NULL")
+
+        self._expirations = dict(default_expirations)
+        if expirations is not None:
+            for key, value in expirations.items():
+                if isinstance(key, str):
+                    key = globals()[key]
+                self._expirations[key] = value
+        for key, value in self._expirations.items():
+            if value != -1 and isinstance(value, datetime.timedelta):
+                self._expirations[key] = value.seconds + 24 * 60 * 60 * value.days
+
+        self._flusher = None
+        if batch_size > 1 and flush_interval is not None:
+            self._flusher = _Flusher(self, flush_interval)
+            self._flusher.start()
+
+    def __str__(self) -> str:
+        return "SQLiteStore({})".format(self._path)
+
+    @DataSource.dispatch
+    def get(self, type: Type[T], query: MutableMapping[str, Any], context: PipelineContext = None) -> T:
+        pass
+
+    @DataSource.dispatch
+    def get_many(self, type: Type[T], query: MutableMapping[str, Any], context: PipelineContext = None) -> Iterable[T]:
+        pass
+
+    @DataSink.dispatch
+    def put(self, type: Type[T], item: T, context: PipelineContext = None) -> None:
+        pass
+
+    @DataSink.dispatch
+    def put_many(self, type: Type[T], items: Iterable[T], context: PipelineContext = None) -> None:
+        pass
+
+    @staticmethod
+    def _key(key: Any) -> str:
+        return json.dumps(key)
+
+    def _encode(self, item: Any) -> bytes:
+        return zlib.compress(json.dumps(item).encode("utf-8"), self._compression_level)
+
+    @staticmethod
+    def _decode(type: Type[T], value: bytes) -> T:
+        return type(json.loads(zlib.decompress(value).decode("utf-8")))
+
+    def _lookup(self, type: Type[T], keys: List[Any]) -> List[T]:
+        names = [self._key(key) for key in keys]
+        now = time.time()
+        with self._lock:
+            rows = {}
+            missing = []
+            for name in names:
+                try:
+                    value, expires = self._pending[type.__name__, name]
+                    if expires is None or expires > now:
+                        rows[name] = value
+                except KeyError:
+                    missing.append(name)
+            # Stay under SQLite's limit on the number of parameters in one statement
+            for i in range(0, len(missing), 500):
+                chunk = missing[i:i + 500]
+                cursor = self._connection.execute("SELECT key, value FROM entries WHERE type = ? AND (expires IS NULL OR expires > ?) AND key IN ({})".format(", ".join("?" * len(chunk))), [type.__name__, now] + chunk)
+                rows.update(cursor.fetchall())
+        try:
+            return [self._decode(type, rows[name]) for name in names]
+        except KeyError:
+            raise NotFoundError
+
+    def _get(self, type: Type[T], query: Mapping[str, Any], key_function: Callable[[Mapping[str, Any]], Any], context: PipelineContext = None) -> T:
+        return self._lookup(type, [key_function(query)])[0]
+
+    def _get_many(self, type: Type[T], query: Mapping[str, Any], key_generator: Callable[[Mapping[str, Any]], Any], context: PipelineContext = None) -> Generator[T, None, None]:
+        # Look everything up before returning so that a partial hit falls through to the next source
+        items = self._lookup(type, list(key_generator(query)))
+        return (item for item in items)
+
+    def _put_many(self, type: Type[T], items: Iterable[Tuple[Any, T]], context: PipelineContext = None) -> None:
+        expire_seconds = self._expirations.get(type, -1)
+        if expire_seconds == 0:
+            return
+        now = time.time()
+        expires = None if expire_seconds == -1 else now + expire_seconds
+        # Encode outside of the lock; it is the expensive part
+        rows = [((type.__name__, self._key(key)), (self._encode(item), expires)) for key, item in items]
+        with self._lock:
+            if not self._pending:
+                self._pending_since = now
+            self._pending.update(rows)
+            if len(self._pending) >= self._batch_size or (self._flush_interval is not None and now - self._pending_since >= self._flush_interval):
+                self._flush()
+
+    def _flush(self) -> None:
+        # The caller holds the lock
+        if self._pending:
+            with self._connection:
+                self._connection.executemany("INSERT OR REPLACE INTO entries (type, key, value, expires) VALUES (?, ?, ?, ?)",
+                                             [(type, key, value, expires) for (type, key), (value, expires) in self._pending.items()])
+            self._pending = {}
+
+    def flush(self) -> None:
+        """Writes all buffered puts to the database."""
+        with self._lock:
+            self._flush()
+
+    def _flush_if_due(self, interval: float) -> None:
+        with self._lock:
+            if self._pending and time.time() - self._pending_since >= interval:
+                self._flush()
+
+    def _put(self, type: Type[T], item: T, key_function: Callable[[T], Any], context: PipelineContext = None) -> None:
+        self._put_many(type, [(key_function(item), item)], context)
+
+    def _type_names(self, type: Type[T] = None) -> List[str]:
+        if type is None:
+            return [t.__name__ for t in self._expirations]
+        elif type in self._expirations:
+            return [type.__name__]
+        return []
+
+    def clear(self, type: Type[T] = None):
+        with self._lock:
+            self._flush()
+            with self._connection:
+                for name in self._type_names(type):
+                    self._connection.execute("DELETE FROM entries WHERE type = ?", (name,))
+
+    def expire(self, type: Type[T] = None):
+        now = time.time()
+        with self._lock:
+            self._flush()
+            with self._connection:
+                for name in self._type_names(type):
+                    self._connection.execute("DELETE FROM entries WHERE type = ? AND expires <= ?", (name, now))
+
+    def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.stop()
+        with self._lock:
+            self._flush()
+            self._connection.close()
+
+    ########################
+    # Champion Mastery API #
+    ########################
+
+    @get.register(ChampionMasteryListDto)
+    @validate_query(uniquekeys.validate_champion_mastery_list_dto_query, uniquekeys.convert_region_to_platform)
+    def get_champion_mastery_list(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> ChampionMasteryListDto:
+        return self._get(ChampionMasteryListDto, query, uniquekeys.for_champion_mastery_list_dto_query, context)
+
+    @get_many.register(ChampionMasteryListDto)
+    @validate_query(uniquekeys.validate_many_champion_mastery_list_dto_query, uniquekeys.convert_region_to_platform)
+    def get_many_champion_mastery_list(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> Generator[ChampionMasteryListDto, None, None]:
+        return self._get_many(ChampionMasteryListDto, query, uniquekeys.for_many_champion_mastery_list_dto_query, context)
+
+    @put.register(ChampionMasteryListDto)
+    def put_champion_mastery_list(self, item: ChampionMasteryListDto, context: PipelineContext = None) -> None:
+        self._put(ChampionMasteryListDto, item, uniquekeys.for_champion_mastery_list_dto, context)
+
+    @put_many.register(ChampionMasteryListDto)
+    def put_many_champion_mastery_list(self, items: Iterable[ChampionMasteryListDto], context: PipelineContext = None) -> None:
+        self._put_many(ChampionMasteryListDto, ((uniquekeys.for_champion_mastery_list_dto(item), item) for item in items), context)
+
+    ##############
+    # League API #
+    ##############
+
+    @get.register(LeaguePositionsDto)
+    @validate_query(uniquekeys.validate_league_positions_dto_query, uniquekeys.convert_region_to_platform)
+    def get_league_positions(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> LeaguePositionsDto:
+        return self._get(LeaguePositionsDto, query, uniquekeys.for_league_positions_dto_query, context)
+
+    @get_many.register(LeaguePositionsDto)
+    @validate_query(uniquekeys.validate_many_league_positions_dto_query, uniquekeys.convert_region_to_platform)
+    def get_many_league_positions(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> Generator[LeaguePositionsDto, None, None]:
+        return self._get_many(LeaguePositionsDto, query, uniquekeys.for_many_league_positions_dto_query, context)
+
+    @put.register(LeaguePositionsDto)
+    def put_league_positions(self, item: LeaguePositionsDto, context: PipelineContext = None) -> None:
+        self._put(LeaguePositionsDto, item, uniquekeys.for_league_positions_dto, context)
+
+    @put_many.register(LeaguePositionsDto)
+    def put_many_league_positions(self, items: Iterable[LeaguePositionsDto], context: PipelineContext = None) -> None:
+        self._put_many(LeaguePositionsDto, ((uniquekeys.for_league_positions_dto(item), item) for item in items), context)
+
+    #############
+    # Match API #
+    #############
+
+    @get.register(MatchDto)
+    @validate_query(uniquekeys.validate_match_dto_query, uniquekeys.convert_region_to_platform)
+    def get_match(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> MatchDto:
+        return self._get(MatchDto, query, uniquekeys.for_match_dto_query, context)
+
+    @get_many.register(MatchDto)
+    @validate_query(uniquekeys.validate_many_match_dto_query, uniquekeys.convert_region_to_platform)
+    def get_many_match(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> Generator[MatchDto, None, None]:
+        return self._get_many(MatchDto, query, uniquekeys.for_many_match_dto_query, context)
+
+    @put.register(MatchDto)
+    def put_match(self, item: MatchDto, context: PipelineContext = None) -> None:
+        self._put(MatchDto, item, uniquekeys.for_match_dto, context)
+
+    @put_many.register(MatchDto)
+    def put_many_match(self, items: Iterable[MatchDto], context: PipelineContext = None) -> None:
+        self._put_many(MatchDto, ((uniquekeys.for_match_dto(item), item) for item in items), context)
+
+    @get.register(TimelineDto)
+    @validate_query(uniquekeys.validate_match_timeline_dto_query, uniquekeys.convert_region_to_platform)
+    def get_match_timeline(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> TimelineDto:
+        return self._get(TimelineDto, query, uniquekeys.for_match_timeline_dto_query, context)
+
+    @get_many.register(TimelineDto)
+    @validate_query(uniquekeys.validate_many_match_timeline_dto_query, uniquekeys.convert_region_to_platform)
+    def get_many_match_timeline(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> Generator[TimelineDto, None, None]:
+        return self._get_many(TimelineDto, query, uniquekeys.for_many_match_timeline_dto_query, context)
+
+    @put.register(TimelineDto)
+    def put_match_timeline(self, item: TimelineDto, context: PipelineContext = None) -> None:
+        self._put(TimelineDto, item, uniquekeys.for_match_timeline_dto, context)
+
+    @put_many.register(TimelineDto)
+    def put_many_match_timeline(self, items: Iterable[TimelineDto], context: PipelineContext = None) -> None:
+        self._put_many(TimelineDto, ((uniquekeys.for_match_timeline_dto(item), item) for item in items), context)
+
+    ################
+    # Summoner API #
+    ################
+
+    @get.register(SummonerDto)
+    @validate_query(uniquekeys.validate_summoner_dto_query, uniquekeys.convert_region_to_platform)
+    def get_summoner(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> SummonerDto:
+        return self._get(SummonerDto, query, uniquekeys.for_summoner_dto_query, context)
+
+    @get_many.register(SummonerDto)
+    @validate_query(uniquekeys.validate_many_summoner_dto_query, uniquekeys.convert_region_to_platform)
+    def get_many_summoner(self, query: MutableMapping[str, Any], context: PipelineContext = None) -> Generator[SummonerDto, None, None]:
+        return self._get_many(SummonerDto, query, uniquekeys.for_many_summoner_dto_query, context)
+
+    @staticmethod
+    def _summoner_keys(items: Iterable[SummonerDto]) -> Generator[Tuple[Any, SummonerDto], None, None]:
+        # A summoner can be looked up by any of its identifiers, so it is stored under each of them
+        for item in items:
+            for identifier in ("id", "accountId", "name"):
+                yield uniquekeys.for_summoner_dto(item, identifier), item
+
+    @put.register(SummonerDto)
+    def put_summoner(self, item: SummonerDto, context: PipelineContext = None) -> None:
+        self._put_many(SummonerDto, self._summoner_keys([item]), context)
+
+    @put_many.register(SummonerDto)
+    def put_many_summoner(self, items: Iterable[SummonerDto], context: PipelineContext = None) -> None:
+        self._put_many(SummonerDto, self._summoner_keys(items), context)
+
+
+class _Flusher(Thread):
+    # Commits buffered writes that have waited too long; only holds a weak reference to the store
+    def __init__(self, store: SQLiteStore, interval: float) -> None:
+        super().__init__(name="cassiopeia-sqlite-flusher", daemon=True)
+        self._store = ref(store)
+        self._interval = interval
+        self._stopped = Event()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self._interval):
+            store = self._store()
+            if store is None:
+                return
+            store._flush_if_due(self._interval)
+            del store
+
+    def stop(self) -> None:
+        self._stopped.set()
@@ -6,7 +6,7 @@ from ..data import Region, Platform, Queue, Tier, Season
 
 from ..dto.champion import ChampionListDto as ChampionStatusListDto, ChampionDto as ChampionStatusDto
 from ..dto.championmastery import ChampionMasteryDto, ChampionMasteryListDto, ChampionMasteryScoreDto
-from ..dto.league import LeagueListDto, LeaguePositionDto
+from ..dto.league import LeagueListDto, LeaguePositionsDto
 from ..dto.staticdata import ChampionDto, ChampionListDto, ItemDto, ItemListDto, LanguageStringsDto, LanguagesDto, ProfileIconDataDto, ProfileIconDetailsDto, RealmDto, RuneDto, RuneListDto, SummonerSpellDto, SummonerSpellListDto, MapDto, MapListDto, VersionListDto
 from ..dto.status import ShardStatusDto
 from ..dto.match import MatchDto, MatchReferenceDto, TimelineDto
@@ -177,24 +177,24 @@ def for_many_champion_mastery_dto_query(query: Query) -> Generator[Tuple[str, in
 
 validate_champion_mastery_list_dto_query = Query. \
     has("platform").as_(Platform).also. \
-    has("playerId").as_(int)
+    has("summoner.id").as_(int)
 
 
 validate_many_champion_mastery_list_dto_query = Query. \
     has("platform").as_(Platform).also. \
-    has("playerIds").as_(Iterable)
+    has("summoner.ids").as_(Iterable)
 
 
 def for_champion_mastery_list_dto(champion_mastery_list: ChampionMasteryListDto) -> Tuple[str, int]:
-    return champion_mastery_list["platform"], champion_mastery_list["playerId"]
+    return Region(champion_mastery_list["region"]).platform.value, champion_mastery_list["summonerId"]
 
 
 def for_champion_mastery_list_dto_query(query: Query) -> Tuple[str, int]:
-    return query["platform"].value, query["playerId"]
+    return query["platform"].value, query["summoner.id"]
 
 
 def for_many_champion_mastery_list_dto_query(query: Query) -> Generator[Tuple[str, int], None, None]:
-    for summoner_id in query["playerIds"]:
+    for summoner_id in query["summoner.ids"]:
         try:
             summoner_id = int(summoner_id)
             yield query["platform"].value, summoner_id
@@ -267,24 +267,24 @@ def for_many_league_list_dto_query(query: Query) -> Generator[Tuple[str, str, st
 
 validate_league_positions_dto_query = Query. \
     has("platform").as_(Platform).also. \
-    has("summonerId").as_(int)
+    has("summoner.id").as_(int)
 
 
 validate_many_league_positions_dto_query = Query. \
     has("platform").as_(Platform).also. \
-    has("summonerIds").as_(Iterable)
+    has("summoner.ids").as_(Iterable)
 
 
-def for_league_positions_dto(league_positions: LeaguePositionDto) -> Tuple[str, int]:
-    return league_positions["platform"], league_positions["summonerId"]
+def for_league_positions_dto(league_positions: LeaguePositionsDto) -> Tuple[str, int]:
+    return Region(league_positions["region"]).platform.value, league_positions["summonerId"]
 
 
 def for_league_positions_dto_query(query: Query) -> Tuple[str, int]:
-    return query["platform"].value, query["summonerId"]
+    return query["platform"].value, query["summoner.id"]
 
 
 def for_many_league_positions_dto_query(query: Query) -> Generator[Tuple[str, int], None, None]:
-    for summoner_id in query["summonerIds"]:
+    for summoner_id in query["summoner.ids"]:
         try:
             summoner_id = int(summoner_id)
             yield query["platform"].value, summoner_id
@@ -852,24 +852,24 @@ def for_many_shard_status_dto_query(query: Query) -> Generator[str, None, None]:
 
 validate_match_dto_query = Query. \
     has("platform").as_(Platform).also. \
-    has("gameId").as_(int)
+    has("id").as_(int)
 
 
 validate_many_match_dto_query = Query. \
     has("platform").as_(Platform).also. \
-    has("gameIds").as_(Iterable)
+    has("ids").as_(Iterable)
 
 
 def for_match_dto(match: MatchDto) -> Tuple[str, int]:
-    return match["platform"], match["gameId"]
+    return Region(match["region"]).platform.value, match["gameId"]
 
 
 def for_match_dto_query(query: Query) -> Tuple[str, int]:
-    return query["platform"].value, query["gameId"]
+    return query["platform"].value, query["id"]
 
 
 def for_many_match_dto_query(query: Query) -> Generator[Tuple[str, int], None, None]:
-    for game_id in query["gameIds"]:
+    for game_id in query["ids"]:
         try:
             game_id = int(game_id)
             yield query["platform"].value, game_id
@@ -906,24 +906,24 @@ def for_many_match_reference_dto_query(query: Query) -> Generator[Tuple[str, int
 
 validate_match_timeline_dto_query = Query. \
     has("platform").as_(Platform).also. \
-    has("matchId").as_(int)
+    has("id").as_(int)
 
 
 validate_many_match_timeline_dto_query = Query. \
     has("platform").as_(Platform).also. \
-    has("matchIds").as_(Iterable)
+    has("ids").as_(Iterable)
 
 
 def for_match_timeline_dto(match_timeline: TimelineDto) -> Tuple[str, int]:
-    return match_timeline["platform"], match_timeline["matchId"]
+    return Region(match_timeline["region"]).platform.value, match_timeline["matchId"]
 
 
 def for_match_timeline_dto_query(query: Query) -> Tuple[str, int]:
-    return query["platform"].value, query["matchId"]
+    return query["platform"].value, query["id"]
 
 
 def for_many_match_timeline_dto_query(query: Query) -> Generator[Tuple[str, int], None, None]:
-    for match_id in query["matchIds"]:
+    for match_id in query["ids"]:
         try:
             match_id = int(match_id)
             yield query["platform"].value, match_id
@@ -995,39 +995,39 @@ def for_many_featured_games_dto_query(query: Query) -> Generator[str, None, None
 
 validate_summoner_dto_query = Query. \
     has("platform").as_(Platform).also. \
-    has("id").as_(int).or_("accountId").as_(int).or_("name").as_(str)
+    has("id").as_(int).or_("account.id").as_(int).or_("name").as_(str)
 
 
 validate_many_summoner_dto_query = Query. \
     has("platform").as_(Platform).also. \
-    has("ids").as_(Iterable).or_("accountIds").as_(Iterable).or_("names").as_(Iterable)
+    has("ids").as_(Iterable).or_("account.ids").as_(Iterable).or_("names").as_(Iterable)
 
 
-def for_summoner_dto(summoner: SummonerDto, identifier: str = "id") -> Tuple[str, Union[int, str]]:
-    return summoner["platform"], summoner[identifier]
+# Summoner and account IDs share a number space, so the key says which one it is
+def for_summoner_dto(summoner: SummonerDto, identifier: str = "id") -> Tuple[str, str, Union[int, str]]:
+    return Region(summoner["region"]).platform.value, identifier, summoner[identifier]
 
 
-def for_summoner_dto_query(query: Query) -> Tuple[str, Union[int, str]]:
+def for_summoner_dto_query(query: Query) -> Tuple[str, str, Union[int, str]]:
     if "id" in query:
-        identifier = "id"
-    elif "accountId" in query:
-        identifier = "accountId"
+        return query["platform"].value, "id", query["id"]
+    elif "account.id" in query:
+        return query["platform"].value, "accountId", query["account.id"]
     else:
-        identifier = "name"
-    return query["platform"].value, query[identifier]
+        return query["platform"].value, "name", query["name"]
 
 
-def for_many_summoner_dto_query(query: Query) -> Generator[Tuple[str, Union[int, str]], None, None]:
+def for_many_summoner_dto_query(query: Query) -> Generator[Tuple[str, str, Union[int, str]], None, None]:
     if "ids" in query:
-        identifiers, identifier_type = query["ids"], int
-    elif "accountIds" in query:
-        identifiers, identifier_type = query["accountIds"], int
+        identifiers, identifier, identifier_type = query["ids"], "id", int
+    elif "account.ids" in query:
+        identifiers, identifier, identifier_type = query["account.ids"], "accountId", int
     else:
-        identifiers, identifier_type = query["names"], str
-    for identifier in identifiers:
+        identifiers, identifier, identifier_type = query["names"], "name", str
+    for value in identifiers:
         try:
-            identifier = identifier_type(identifier)
-            yield query["platform"].value, identifier
+            value = identifier_type(value)
+            yield query["platform"].value, identifier, value
         except ValueError as e:
             raise QueryValidationError from e
 
@@ -0,0 +1,24 @@
+"""Times constructing a Match that is already in the cache, which is what happens for every match in a match history.
+
+Run it from the repository root with ``python -m test.benchmark_construction``.
+"""
+import inspect
+import timeit
+
+import cassiopeia
+from cassiopeia.core.common import GetFromPipeline
+
+
+def _time(function, number=5000):
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1000000
+
+
+def main():
+    cassiopeia.Match(id=1, region="NA")
+    print("Match(id=...):                      {:.1f} us".format(_time(lambda: cassiopeia.Match(id=1, region="NA"))))
+    print("per-class construction metadata:    {:.1f} us".format(_time(lambda: GetFromPipeline._construction[cassiopeia.Match])))
+    print("inspecting the signature each time: {:.1f} us".format(_time(lambda: inspect.signature(cassiopeia.Match.__get_query_from_kwargs__))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Times Match.to_dict and Match.to_json on a full MatchData.
+
+Run it from the repository root with ``python -m test.benchmark_to_json``.
+"""
+import json
+import timeit
+
+import cassiopeia.core.common
+from cassiopeia.core.common import CoreData, CassiopeiaJsonEncoder, _slot_names
+
+from .test_serialization import _match
+
+
+class _Unslotted(CoreData):
+    _renamed = {}
+
+
+def _unslotted(value):
+    # A copy of the data made of CoreData objects without __slots__, which the old to_dict can read
+    if isinstance(value, CoreData):
+        attributes = {name: getattr(value, name) for name in _slot_names(type(value)) if hasattr(value, name)}
+        attributes.update(getattr(value, "__dict__", {}))
+        return _Unslotted(**{name: _unslotted(v) for name, v in attributes.items()})
+    elif isinstance(value, dict):
+        return {k: _unslotted(v) for k, v in value.items()}
+    elif isinstance(value, list):
+        return [_unslotted(v) for v in value]
+    return value
+
+
+def _dir_to_dict(data):
+    # How CoreData.to_dict used to find the attributes of an object
+    d = {}
+    attrs = {attrname for attrname in dir(data)} - {attrname for attrname in dir(data.__class__)}
+    for attr in attrs:
+        v = getattr(data, attr)
+        if isinstance(v, CoreData):
+            v = _dir_to_dict(v)
+        elif hasattr(v, "__iter__") and not isinstance(v, str):
+            if isinstance(v, dict):
+                v = {k: _dir_to_dict(vi) if isinstance(vi, CoreData) else vi for k, vi in v.items()}
+            else:
+                v = [_dir_to_dict(vi) if isinstance(vi, CoreData) else vi for vi in v]
+        d[attr] = v
+    return d
+
+
+def _time(function, number=200):
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1000
+
+
+def main():
+    match = _match()
+    data = list(match._data.values())[0]
+    json_library = "orjson" if cassiopeia.core.common.orjson is not None else "ujson" if cassiopeia.core.common.ujson is not None else None
+
+    unslotted = _unslotted(data)
+    print("to_dict with dir():           {:.3f} ms".format(_time(lambda: _dir_to_dict(unslotted))))
+    print("to_json with dir():           {:.3f} ms".format(_time(lambda: json.dumps(_dir_to_dict(unslotted), cls=CassiopeiaJsonEncoder))))
+    print("to_dict:                      {:.3f} ms".format(_time(match.to_dict)))
+    print("to_json with the json module: {:.3f} ms".format(_time(lambda: json.dumps(match.to_dict(), cls=CassiopeiaJsonEncoder))))
+    if json_library is not None:
+        print("to_json with {}:{}{:.3f} ms".format(json_library, " " * (16 - len(json_library)), _time(lambda: match.to_json(fast=True))))
+
+
+if __name__ == "__main__":
+    main()
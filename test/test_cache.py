@@ -0,0 +1,267 @@
+import threading
+import time
+from typing import Type, TypeVar, Mapping, Any, Iterable
+
+import pytest
+from datapipelines import DataSource, PipelineContext, NotFoundError
+
+from cassiopeia._configuration import CassiopeiaPipeline
+from cassiopeia.datastores.cache import Cache
+from cassiopeia.datastores.cachestore import CacheStore
+
+T = TypeVar("T")
+
+
+def test_store_counts_hits_misses_and_inserts():
+    store = CacheStore(stripes=4)
+    store.put(int, 1, "one")
+    assert store.get(int, 1) == "one"
+    with pytest.raises(KeyError):
+        store.get(int, 2)
+
+    stats = store.statistics(int)[int]
+    assert (stats["hits"], stats["misses"], stats["inserts"], stats["size"]) == (1, 1, 1, 1)
+
+
+def test_store_expires_entries():
+    store = CacheStore()
+    store.put(int, 1, "one", timeout=0.01)
+    store.put(int, 2, "two")
+    time.sleep(0.02)
+    store.expire()
+    assert not store.contains(int, 1)
+    assert store.get(int, 2) == "two"
+    assert store.statistics(int)[int]["expirations"] == 1
+
+
+def test_store_is_safe_to_share_between_threads():
+    store = CacheStore(stripes=4)
+
+    def work(offset):
+        for i in range(2000):
+            store.put(int, offset + i, i)
+            assert store.get(int, offset + i) == i
+        store.clear(str)
+
+    threads = [threading.Thread(target=work, args=(n * 10000,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert store.statistics(int)[int]["size"] == 8 * 2000
+
+
+class _SlowSource(DataSource):
+    def __init__(self):
+        self.calls = 0
+
+    @DataSource.dispatch
+    def get(self, type: Type[T], query: Mapping[str, Any], context: PipelineContext = None) -> T:
+        pass
+
+    @DataSource.dispatch
+    def get_many(self, type: Type[T], query: Mapping[str, Any], context: PipelineContext = None) -> Iterable[T]:
+        pass
+
+    @get.register(str)
+    def get_string(self, query: Mapping[str, Any], context: PipelineContext = None) -> str:
+        self.calls += 1
+        time.sleep(0.1)
+        if query["id"] < 0:
+            raise NotFoundError
+        return str(query["id"])
+
+
+def _pipeline(source, single_flight):
+    cache = Cache(single_flight=single_flight)
+    pipeline = CassiopeiaPipeline([source])
+    pipeline._cache = cache
+    return pipeline
+
+
+def _get_concurrently(pipeline, query, threads=16):
+    results = []
+
+    def get():
+        try:
+            results.append(pipeline.get(str, dict(query)))
+        except NotFoundError as error:
+            results.append(error)
+
+    workers = [threading.Thread(target=get) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return results
+
+
+def test_concurrent_misses_share_one_fetch():
+    source = _SlowSource()
+    results = _get_concurrently(_pipeline(source, single_flight=True), {"id": 7})
+    assert results == ["7"] * 16
+    assert source.calls == 1
+
+
+def test_concurrent_misses_share_one_failure():
+    source = _SlowSource()
+    results = _get_concurrently(_pipeline(source, single_flight=True), {"id": -1})
+    assert all(isinstance(result, NotFoundError) for result in results)
+    assert source.calls == 1
+
+
+def test_single_flight_can_be_disabled():
+    source = _SlowSource()
+    _get_concurrently(_pipeline(source, single_flight=False), {"id": 7}, threads=4)
+    assert source.calls == 4
+
+
+@pytest.mark.parametrize("policy", ["lru", "lfu", "tinylfu"])
+def test_store_stays_within_max_entries(policy):
+    store = CacheStore(stripes=1, max_entries={int: 100}, eviction_policy=policy)
+    for i in range(1000):
+        try:
+            store.get(int, i)
+        except KeyError:
+            store.put(int, i, i)
+    stats = store.statistics(int)[int]
+    assert stats["size"] == 100
+    assert stats["evictions"] + stats["rejections"] == 900
+
+
+@pytest.mark.parametrize("max_entries", [1, 10, 40])
+def test_max_entries_is_a_bound_with_the_default_stripes(max_entries):
+    store = CacheStore(max_entries={int: max_entries})
+    for i in range(1000):
+        store.put(int, i, i)
+    assert store.statistics(int)[int]["size"] == max_entries
+
+
+def test_lru_evicts_least_recently_used():
+    store = CacheStore(stripes=1, max_entries={int: 2}, eviction_policy="lru")
+    store.put(int, 1, 1)
+    store.put(int, 2, 2)
+    store.get(int, 1)
+    store.put(int, 3, 3)
+    assert store.contains(int, 1) and not store.contains(int, 2)
+
+
+def test_lfu_evicts_least_frequently_used():
+    store = CacheStore(stripes=1, max_entries={int: 2}, eviction_policy="lfu")
+    store.put(int, 1, 1)
+    store.put(int, 2, 2)
+    store.get(int, 2)
+    store.get(int, 1)
+    store.get(int, 1)
+    store.put(int, 3, 3)
+    assert store.contains(int, 1) and not store.contains(int, 2)
+
+
+def _popular_hits_during_scan(policy):
+    store = CacheStore(stripes=1, max_entries={int: 10}, eviction_policy=policy)
+    hits = 0
+    for i in range(3000):
+        # Every third lookup is one of 8 popular keys, the rest are a scan over keys that are never used again
+        key = (i // 3) % 8 if i % 3 == 0 else 1000 + i
+        try:
+            store.get(int, key)
+            hits += key < 8
+        except KeyError:
+            store.put(int, key, key)
+    return hits
+
+
+def test_tinylfu_keeps_popular_entries_during_a_scan():
+    assert _popular_hits_during_scan("tinylfu") > 0.8 * 1000
+    assert _popular_hits_during_scan("tinylfu") > _popular_hits_during_scan("lru")
+
+
+def test_unknown_eviction_policy():
+    with pytest.raises(ValueError):
+        CacheStore(eviction_policy="fifo")
+
+
+def test_expire_is_bounded_and_skips_replaced_entries():
+    store = CacheStore(stripes=2)
+    for i in range(10):
+        store.put(int, i, i, timeout=0.01)
+    store.put(int, 0, 0)  # Replaced without a timeout, so its old deadline is stale
+    time.sleep(0.02)
+    assert store.expire(limit=4) <= 4
+    store.expire()
+    assert store.contains(int, 0)
+    assert store.statistics(int)[int]["size"] == 1
+
+
+def test_bounded_expire_takes_turns_between_types():
+    store = CacheStore(stripes=1)
+    # ints are swept first, and keep expiring as fast as the sweeps' limit, but the strs still get their turn
+    for sweep in range(2):
+        for i in range(10):
+            store.put(int, 10 * sweep + i, i, timeout=0.01)
+            if sweep == 0:
+                store.put(str, str(i), i, timeout=0.01)
+        time.sleep(0.02)
+        store.expire(limit=10)
+    assert store.statistics(str)[str]["size"] == 0
+
+
+def test_sweeper_removes_expired_entries():
+    store = CacheStore()
+    store.put(int, 1, "one", timeout=0.01)
+    store.start_sweeper(interval=0.01, batch=10)
+    try:
+        time.sleep(0.1)
+        assert not store.contains(int, 1)
+    finally:
+        store.stop_sweeper()
+
+
+def test_put_many_respects_max_entries():
+    store = CacheStore(stripes=4, max_entries={int: 8})
+    store.put_many(int, ((i, str(i)) for i in range(100)))
+    assert store.get(int, 99) == "99"
+    stats = store.statistics(int)[int]
+    assert stats["size"] <= 8 and stats["inserts"] == 100
+
+
+class _CrossingSource(DataSource):
+    """Each thread's outer lookup needs the other thread's outer lookup."""
+    def __init__(self):
+        self.pipeline = None
+        self.barrier = threading.Barrier(2)
+        self.local = threading.local()
+
+    @DataSource.dispatch
+    def get(self, type: Type[T], query: Mapping[str, Any], context: PipelineContext = None) -> T:
+        pass
+
+    @DataSource.dispatch
+    def get_many(self, type: Type[T], query: Mapping[str, Any], context: PipelineContext = None) -> Iterable[T]:
+        pass
+
+    @get.register(str)
+    def get_string(self, query: Mapping[str, Any], context: PipelineContext = None) -> str:
+        if getattr(self.local, "nested", False):
+            return str(query["id"])
+        self.local.nested = True
+        self.barrier.wait()
+        other = self.pipeline.get(str, {"id": 3 - query["id"]})
+        return "{}>{}".format(query["id"], other)
+
+
+def test_crossing_nested_lookups_do_not_deadlock():
+    source = _CrossingSource()
+    source.pipeline = _pipeline(source, single_flight=True)
+    results = {}
+
+    def get(id):
+        results[id] = source.pipeline.get(str, {"id": id})
+
+    threads = [threading.Thread(target=get, args=(id,), daemon=True) for id in (1, 2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert not any(thread.is_alive() for thread in threads)
+    assert results[1].startswith("1>") and results[2].startswith("2>")
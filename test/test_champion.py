@@ -38,3 +38,17 @@ def test_searchable_champion_names():
         assert champion.name == name
         champion = champions[name]
         assert champion.name == name
+
+
+def test_champions_are_indexed_by_id_key_and_name():
+    from cassiopeia.core.staticdata.champion import ChampionData
+
+    data = [ChampionData(id=id, key="Key{}".format(id), name="Name {}".format(id), tags=["Mage"], region="NA", version="8.1.1", locale="en_US") for id in range(1, 150)]
+    champions = cassiopeia.Champions.from_generator(generator=(cassiopeia.Champion.from_data(d) for d in data), region="NA", version="8.1.1", locale="en_US")
+
+    assert champions[0].id == 1
+    assert champions.find(7).name == "Name 7"
+    assert champions["Key7"].id == 7
+    assert champions["name 7"].id == 7
+    assert "Key9" in champions and 150 not in champions
+    assert champions["Mage"].id == 1
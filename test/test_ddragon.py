@@ -0,0 +1,139 @@
+import json
+import os
+import tarfile
+
+import pytest
+
+from cassiopeia._configuration import CassiopeiaPipeline
+from cassiopeia.datastores.ddragon import DDragon
+from cassiopeia.dto.staticdata.realm import RealmDto
+from cassiopeia.dto.staticdata.summonerspell import SummonerSpellDto
+from cassiopeia.dto.staticdata.version import VersionListDto
+
+
+class _FakeClient(object):
+    def __init__(self, body):
+        self.body = json.dumps(body)
+        self.urls = []
+
+    def get(self, url, *args, **kwargs):
+        self.urls.append(url)
+        return self.body, {}
+
+
+def _summoner_spells():
+    data = {}
+    for id, name in ((4, "Flash"), (7, "Heal"), (14, "Ignite")):
+        data["Summoner" + name] = {"id": "Summoner" + name, "key": str(id), "name": name, "description": "", "tooltip": "",
+                                   "effectBurn": [None, "1"], "maxammo": "-1"}
+    return {"type": "summoner", "version": "8.1.1", "data": data}
+
+
+def test_single_summoner_spells_come_from_the_index():
+    client = _FakeClient(_summoner_spells())
+    pipeline = CassiopeiaPipeline([DDragon(http_client=client)])
+
+    flash = pipeline.get(SummonerSpellDto, {"region": "NA", "version": "8.1.1", "id": 4})
+    heal = pipeline.get(SummonerSpellDto, {"region": "NA", "version": "8.1.1", "name": "Heal"})
+    assert (flash["name"], flash["key"], flash["version"]) == ("Flash", "SummonerFlash", "8.1.1")
+    assert heal["id"] == 7
+    assert len(client.urls) == 1
+
+    # Results are copies, so setting their fields doesn't change the cached list
+    flash["version"] = "7.1.1"
+    assert pipeline.get(SummonerSpellDto, {"region": "NA", "version": "8.1.1", "id": 4})["version"] == "8.1.1"
+
+
+def _write_bundle(directory):
+    for version in ("8.1.1", "8.10.1", "7.24.2"):
+        data = directory / version / "data" / "en_US"
+        data.mkdir(parents=True)
+        (data / "summoner.json").write_text(json.dumps(_summoner_spells()))
+    (directory / "img").mkdir()
+    (directory / "img" / "bg.jpg").write_bytes(b"not json")
+
+
+def _offline_pipeline(bundle):
+    client = _FakeClient({})
+    ddragon = DDragon(http_client=client, bundle=bundle)
+    return CassiopeiaPipeline([ddragon]), ddragon, client
+
+
+def test_bundle_directory_serves_static_data_offline(tmp_path):
+    _write_bundle(tmp_path)
+    pipeline, ddragon, client = _offline_pipeline(str(tmp_path))
+
+    assert pipeline.get(VersionListDto, {"region": "NA"})["versions"] == ["8.10.1", "8.1.1", "7.24.2"]
+    assert pipeline.get(RealmDto, {"region": "NA"})["v"] == "8.10.1"
+    assert pipeline.get(SummonerSpellDto, {"region": "NA", "version": "8.10.1", "id": 14})["name"] == "Ignite"
+    assert pipeline.get(SummonerSpellDto, {"region": "NA", "version": "7.24.2", "name": "Flash"})["id"] == 4
+    assert client.urls == []
+
+
+def test_bundle_treats_empty_files_as_missing(tmp_path):
+    _write_bundle(tmp_path)
+    (tmp_path / "8.10.1" / "data" / "en_US" / "item.json").write_bytes(b"")
+    pipeline, ddragon, client = _offline_pipeline(str(tmp_path))
+
+    assert ddragon._bundle.load("8.10.1/data/en_US/item.json") is None
+    assert ddragon._bundle.load("8.10.1/data/en_US/summoner.json")["type"] == "summoner"
+
+
+def test_bundle_realm_takes_the_max_profile_icon_from_the_bundle(tmp_path):
+    _write_bundle(tmp_path)
+    pipeline, ddragon, client = _offline_pipeline(str(tmp_path))
+    assert "profileiconmax" not in ddragon._bundle.realm("en_US")
+
+    icons = {str(id): {"id": id, "image": {}} for id in (0, 29, 3150)}
+    (tmp_path / "8.10.1" / "data" / "en_US" / "profileicon.json").write_text(json.dumps({"type": "profileicon", "version": "8.10.1", "data": icons}))
+    assert ddragon._bundle.realm("en_US")["profileiconmax"] == 3150
+
+
+def test_bundle_archive_only_extracts_data_files(tmp_path):
+    _write_bundle(tmp_path / "dragontail")
+    archive = tmp_path / "dragontail-8.10.1.tgz"
+    with tarfile.open(str(archive), "w:gz") as tar:
+        for name in ("8.1.1", "8.10.1", "7.24.2", "img"):
+            tar.add(str(tmp_path / "dragontail" / name), arcname=name)
+    pipeline, ddragon, client = _offline_pipeline(str(archive))
+
+    assert pipeline.get(SummonerSpellDto, {"region": "NA", "version": "8.1.1", "id": 7})["name"] == "Heal"
+    assert client.urls == []
+
+    assert not os.path.exists(os.path.join(ddragon._bundle.directory, "img"))
+
+
+def test_warm_up_loads_static_data_from_a_bundle(tmp_path, monkeypatch):
+    import cassiopeia
+    _write_bundle(tmp_path)
+    monkeypatch.setattr(cassiopeia.configuration, "_settings", cassiopeia.configuration.settings)
+    cassiopeia.apply_settings({"global": {"default_region": "NA"}, "pipeline": {"Cache": {}, "DDragon": {"bundle": str(tmp_path)}},
+                               "logging": {"print_calls": False, "default": "WARNING", "core": "WARNING"}})
+
+    timings = cassiopeia.warm_up(kinds=["summoner_spells"])
+    assert set(timings) == {"versions", "summoner_spells", "total"}
+    timings = cassiopeia.warm_up(versions=["8.1.1", "7.24.2"], locales=["en_US"], kinds=["summoner_spells"])
+    assert set(timings) == {"summoner_spells", "total"}
+    assert cassiopeia.SummonerSpell(id=4, region="NA", version="7.24.2").name == "Flash"
+
+    with pytest.raises(ValueError):
+        cassiopeia.warm_up(kinds=["masteries"])
+
+
+def test_latest_versions_are_memoized(monkeypatch):
+    from cassiopeia.core import common
+    pipeline = object.__new__(CassiopeiaPipeline)
+    loads = []
+
+    def load():
+        loads.append(1)
+        return "8.10.1", {"champion": "8.10.1"}
+
+    assert common.memoized_latest_versions(pipeline, "NA", load) == ("8.10.1", {"champion": "8.10.1"})
+    assert common.memoized_latest_versions(pipeline, "NA", load)[0] == "8.10.1"
+    assert len(loads) == 1
+
+    monkeypatch.setattr(common, "LATEST_VERSION_TIMEOUT", -1)
+    common.memoized_latest_versions(pipeline, "EUW", load)
+    common.memoized_latest_versions(pipeline, "EUW", load)
+    assert len(loads) == 3
@@ -0,0 +1,349 @@
+import asyncio
+import gzip
+import json
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+from merakicommons.ratelimits import FixedWindowRateLimiter
+
+from cassiopeia.datastores.common import CurlPool, HTTPClient, HTTPError
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Responds to /<id> with {"id": <id>} after a delay that shrinks as the id grows, and to /missing with a 404.
+    # /flaky/<id> is rate limited the first time it is requested, and /gzip/<n> returns a gzipped list of n ids.
+    # /lowercase/<n> is the same as /gzip/<n>, but with lowercase header names.
+    # /riot/lol/match/v3/... returns small match and match list bodies; match 404 is missing and match 429 is flaky.
+    flaky = set()
+
+    def do_GET(self):
+        path, _, query = self.path.strip("/").partition("?")
+        if path.startswith("riot/"):
+            return self._send_riot(path, query)
+        if path == "missing":
+            code, body = 404, {"status": {"message": "Not found", "status_code": 404}}
+        elif path.startswith("gzip/"):
+            return self._send_gzipped(list(range(int(path.split("/")[-1]))))
+        elif path.startswith("lowercase/"):
+            return self._send_gzipped(list(range(int(path.split("/")[-1]))), lowercase=True)
+        elif path.startswith("flaky/") and path not in self.flaky:
+            self.flaky.add(path)
+            code, body = 429, {"status": {"message": "Rate limit exceeded", "status_code": 429}}
+        else:
+            id = int(path.split("/")[-1])
+            time.sleep(0.05 * (4 - id % 4))
+            code, body = 200, {"id": id}
+        body = json.dumps(body).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json;charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_riot(self, path, query):
+        id = int(path.split("/")[-1])
+        time.sleep(0.05 * (4 - id % 4))
+        if id == 404:
+            code, body = 404, {"status": {"message": "Data not found", "status_code": 404}}
+        elif id == 429 and path not in self.flaky:
+            self.flaky.add(path)
+            code, body = 429, {"status": {"message": "Rate limit exceeded", "status_code": 429}}
+        elif "/matchlists/" in path:
+            code, body = 200, {"matches": [], "startIndex": 0, "endIndex": 0, "totalGames": 0, "query": query}
+        else:
+            code, body = 200, {"participants": [{"participantId": 1}], "participantIdentities": [{"participantId": 1, "player": {"currentAccountId": 0}}]}
+        body = json.dumps(body).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json;charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_gzipped(self, body, lowercase=False):
+        body = gzip.compress(json.dumps(body).encode("utf-8"))
+        self.send_response(200)
+        # HTTP/2 servers send every header name in lowercase
+        name = str.lower if lowercase else str
+        self.send_header(name("Content-Type"), "application/json;charset=utf-8")
+        self.send_header(name("Content-Encoding"), "gzip")
+        self.send_header(name("Content-Length"), str(len(body)))
+        self.end_headers()
+        # Send the body in small pieces so that the client decompresses it over several writes
+        for start in range(0, len(body), 1024):
+            self.wfile.write(body[start:start + 1024])
+            self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 64
+
+
+@pytest.fixture(scope="module")
+def server():
+    httpd = _Server(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield "http://127.0.0.1:{}".format(httpd.server_port)
+    httpd.shutdown()
+
+
+def test_pool_reuses_handles_per_host():
+    pool = CurlPool()
+    url = "https://na1.api.riotgames.com/lol/summoner/v3/summoners/1"
+
+    curl = pool.acquire(url)
+    pool.release(url, curl)
+    assert pool.acquire(url) is curl
+
+    stats = pool.statistics
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+    pool.close()
+
+
+def test_pool_keeps_hosts_separate():
+    pool = CurlPool()
+    na = "https://na1.api.riotgames.com/lol/status/v3/shard-data"
+    euw = "https://euw1.api.riotgames.com/lol/status/v3/shard-data"
+
+    curl = pool.acquire(na)
+    pool.release(na, curl)
+    assert pool.acquire(euw) is not curl
+    assert pool.statistics["misses"] == 2
+    pool.close()
+
+
+def test_pool_limits_idle_handles():
+    pool = CurlPool(max_idle_per_host=1)
+    url = "https://ddragon.leagueoflegends.com/api/versions.json"
+
+    first, second = pool.acquire(url), pool.acquire(url)
+    pool.release(url, first)
+    pool.release(url, second)
+    assert pool.statistics["idle"] == 1
+    pool.close()
+
+
+def test_clients_share_the_default_pool():
+    assert HTTPClient()._pool is HTTPClient()._pool
+
+
+def test_get_decompresses_gzipped_responses_as_they_arrive(server):
+    client = HTTPClient(CurlPool())
+    body, headers = client.get(server + "/gzip/20000")
+    assert headers["Content-Encoding"] == "gzip"
+    assert body == list(range(20000))
+
+
+def test_get_reads_lowercase_header_names(server):
+    client = HTTPClient(CurlPool())
+    body, headers = client.get(server + "/lowercase/100")
+    assert body == list(range(100))
+    assert headers["Content-Encoding"] == headers.get("CONTENT-ENCODING") == "gzip"
+    assert "Content-Type" in headers
+
+
+def test_get_many_yields_in_request_order(server):
+    client = HTTPClient(CurlPool())
+    requests = [("{}/{}".format(server, i), {}) for i in range(8)]
+    responses = list(client.get_many(requests, max_in_flight=4))
+    assert [index for index, response in responses] == list(range(8))
+    assert [response[0]["id"] for index, response in responses] == list(range(8))
+
+
+def test_get_many_unordered_returns_everything(server):
+    client = HTTPClient(CurlPool())
+    requests = [("{}/{}".format(server, i), {}) for i in range(8)]
+    responses = dict(client.get_many(requests, max_in_flight=8, ordered=False))
+    assert sorted(responses) == list(range(8))
+    assert all(responses[i][0]["id"] == i for i in responses)
+
+
+def test_get_many_yields_errors(server):
+    client = HTTPClient(CurlPool())
+    responses = dict(client.get_many([(server + "/missing", {}), (server + "/1", {})]))
+    assert isinstance(responses[0], HTTPError)
+    assert responses[0].code == 404
+    assert responses[1][0] == {"id": 1}
+
+
+def test_get_many_holds_rate_limiter_permits(server):
+    client = HTTPClient(CurlPool())
+    limiter = FixedWindowRateLimiter(window_seconds=1, window_permits=2)
+    requests = [("{}/{}".format(server, i), {}) for i in range(3)]
+    start = time.time()
+    responses = list(client.get_many(requests, rate_limiters=[limiter], max_in_flight=3))
+    assert len(responses) == 3
+    assert limiter.permits_issued == 3
+    # The third request has to wait for the window to reset
+    assert time.time() - start >= 1
+
+
+def test_get_many_parks_retries_without_blocking_other_requests(server):
+    client = HTTPClient(CurlPool())
+    requests = [(server + "/flaky/3", {})] + [("{}/{}".format(server, i), {}) for i in (3, 7, 11, 15)]
+    retries = []
+
+    def retry(index, error):
+        retries.append((index, error.code))
+        return 0.5
+
+    start = time.time()
+    completed = [(index, time.time() - start) for index, response in client.get_many(requests, max_in_flight=1, ordered=False, retry=retry)]
+    assert retries == [(0, 429)]
+    assert [index for index, elapsed in completed][-1] == 0
+    # The other requests used the only slot while the failed one was waiting to be retried
+    assert all(elapsed < 0.5 for index, elapsed in completed[:-1])
+    assert completed[-1][1] >= 0.5
+
+
+def test_get_async_runs_concurrently_on_the_event_loop(server):
+    client = HTTPClient(CurlPool())
+
+    async def get_all():
+        return await asyncio.gather(*[client.get_async("{}/{}".format(server, i)) for i in range(8)])
+
+    start = time.time()
+    responses = asyncio.get_event_loop().run_until_complete(get_all())
+    assert [body["id"] for body, headers in responses] == list(range(8))
+    # Done one at a time these would take 1 second
+    assert time.time() - start < 0.75
+
+
+def test_cancelled_get_async_gives_back_its_permit(server):
+    client = HTTPClient(CurlPool())
+    limiter = FixedWindowRateLimiter(window_seconds=0.3, window_permits=1)
+    with limiter:
+        pass
+
+    async def get(timeout):
+        return await asyncio.wait_for(client.get_async(server + "/3", rate_limiters=[limiter]), timeout)
+
+    loop = asyncio.get_event_loop()
+    # Cancelled while waiting for the window to reset, after which its worker thread still gets the permit
+    with pytest.raises(asyncio.TimeoutError):
+        loop.run_until_complete(get(0.05))
+    body, headers = loop.run_until_complete(get(2))
+    assert body == {"id": 3}
+
+
+def test_get_async_raises_http_errors(server):
+    client = HTTPClient(CurlPool())
+    with pytest.raises(HTTPError) as error:
+        asyncio.get_event_loop().run_until_complete(client.get_async(server + "/missing"))
+    assert error.value.code == 404
+
+
+def test_pipeline_sends_riot_api_requests_on_the_event_loop(server):
+    from cassiopeia._configuration import CassiopeiaPipeline
+    from cassiopeia.data import Platform
+    from cassiopeia.datastores.riotapi.common import RiotAPIRateLimiter, APINotFoundError
+    from cassiopeia.datastores.riotapi.match import MatchAPI
+
+    api = MatchAPI("RGAPI-test", RiotAPIRateLimiter(1.0), http_client=HTTPClient(CurlPool()))
+    rate_limiter = api._get_rate_limiter(Platform.north_america, "test")
+    pipeline = CassiopeiaPipeline([api], max_async_workers=8)
+
+    sent_on_loop = []
+    get_async = api._get_async
+
+    async def spy(*args, **kwargs):
+        sent_on_loop.append(asyncio.get_event_loop())
+        return await get_async(*args, **kwargs)
+    api._get_async = spy
+
+    async def get_all():
+        return await asyncio.gather(*[pipeline.run_async(api._get, "{}/{}".format(server, i), {}, rate_limiter) for i in range(8)])
+
+    loop = asyncio.get_event_loop()
+    assert [body["id"] for body in loop.run_until_complete(get_all())] == list(range(8))
+    assert sent_on_loop == [loop] * 8
+
+    with pytest.raises(APINotFoundError):
+        loop.run_until_complete(pipeline.run_async(api._get, server + "/missing", {}, rate_limiter))
+
+
+class _LocalRiotClient(HTTPClient):
+    """Sends requests for the NA Riot API to the test server."""
+    def __init__(self, server):
+        super().__init__(CurlPool())
+        self.server = server
+        self.urls = []
+
+    def _local(self, url):
+        self.urls.append(url)
+        return url.replace("https://na1.api.riotgames.com", self.server + "/riot")
+
+    def get(self, url, *args, **kwargs):
+        return super().get(self._local(url), *args, **kwargs)
+
+    def get_many(self, requests, *args, **kwargs):
+        return super().get_many([(self._local(url), parameters) for url, parameters in requests], *args, **kwargs)
+
+
+def _match_api(server):
+    from cassiopeia.datastores.riotapi.common import RiotAPIRateLimiter
+    from cassiopeia.datastores.riotapi.match import MatchAPI
+    return MatchAPI("RGAPI-test", RiotAPIRateLimiter(1.0), http_client=_LocalRiotClient(server))
+
+
+def test_dto_get_many_yields_in_request_order(server):
+    from cassiopeia.dto.match import MatchDto
+    api = _match_api(server)
+    matches = list(api.get_many(MatchDto, {"region": "NA", "ids": [0, 1, 2, 3, 4, 5, 6, 7]}))
+    assert [match["gameId"] for match in matches] == list(range(8))
+    assert all(match["region"] == "NA" and match["participantIdentities"][0]["player"]["bot"] for match in matches)
+
+    matches = list(api.get_many(MatchDto, {"region": "NA", "ids": [0, 1, 2, 3, 4, 5, 6, 7], "ordered": False}))
+    assert sorted(match["gameId"] for match in matches) == list(range(8))
+    # Requests with shorter delays finish first
+    assert [match["gameId"] for match in matches] != list(range(8))
+
+
+def test_dto_get_many_converts_errors(server):
+    from datapipelines import NotFoundError
+    from cassiopeia.dto.match import MatchDto
+    api = _match_api(server)
+    matches = api.get_many(MatchDto, {"region": "NA", "ids": [1, 404, 2]})
+    assert next(matches)["gameId"] == 1
+    with pytest.raises(NotFoundError):
+        next(matches)
+
+
+def test_dto_get_many_retries_with_the_error_handlers(server):
+    from cassiopeia.datastores.riotapi.common import ExponentialBackoff
+    from cassiopeia.dto.match import MatchDto
+    api = _match_api(server)
+    # The test server's 429s don't say which limit was hit, so they are handled as service rate limits
+    api._handlers[429]["service"] = lambda: ExponentialBackoff(initial_backoff=0.3, backoff_factor=2, max_attempts=2)
+    single_requests = []
+    get = api._get
+
+    def spy(url, *args, **kwargs):
+        single_requests.append(url)
+        return get(url, *args, **kwargs)
+    api._get = spy
+
+    start = time.time()
+    matches = list(api.get_many(MatchDto, {"region": "NA", "ids": [1, 429, 2]}))
+    assert [match["gameId"] for match in matches] == [1, 429, 2]
+    # The rate limited request was parked for the handler's backoff and retried by get_many, not by a single request
+    assert time.time() - start >= 0.3
+    assert single_requests == []
+    assert api._client.urls.count("https://na1.api.riotgames.com/lol/match/v3/matches/429") == 1
+
+
+def test_dto_get_many_match_lists_keep_their_queues(server):
+    from cassiopeia.data import Queue
+    from cassiopeia.dto.match import MatchListDto
+    api = _match_api(server)
+    match_lists = list(api.get_many(MatchListDto, {"region": "NA", "account.ids": [1, 2, 3], "queues": [Queue.ranked_solo_fives]}))
+    assert [match_list["account.id"] for match_list in match_lists] == [1, 2, 3]
+    assert all(match_list["queue"] == {Queue.ranked_solo_fives} for match_list in match_lists)
+    assert all(match_list["query"] == "queue=420" for match_list in match_lists)
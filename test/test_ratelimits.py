@@ -0,0 +1,150 @@
+import gc
+import os
+import threading
+import time
+
+import pytest
+from merakicommons.ratelimits import FixedWindowRateLimiter
+
+from cassiopeia.data import Platform
+from cassiopeia.datastores.riotapi.common import AdaptiveRateLimiter, RiotAPIRateLimiter, SharedWindowRateLimiter, RequestScheduler
+
+
+def _time_permits(limiter, permits):
+    start = time.monotonic()
+    for _ in range(permits):
+        with limiter:
+            pass
+    return time.monotonic() - start
+
+
+def test_adaptive_limiter_paces_permits():
+    # A burst of 2, then the other 18 permits of the window at 18 per second
+    limiter = AdaptiveRateLimiter(window_seconds=1, window_permits=20)
+    limiter.set_permits(20)
+    elapsed = _time_permits(limiter, 11)
+    assert 0.4 < elapsed < 0.8
+    assert limiter.permits_issued == 11
+
+
+def test_adaptive_limiter_backs_off_when_the_server_has_counted_more():
+    limiter = RiotAPIRateLimiter(limiting_share=1.0, adaptive=True)
+    limiter.adjust_rate_limits_if_necessary([(10, 1)])
+    # Another process has used the whole window, so the next permit has to wait for a refill
+    limiter.reconcile_counts([(10, 1)], [(10, 1)])
+    assert _time_permits(limiter, 1) > 0.1
+
+
+def _issue_times(limiter, permits):
+    times = []
+    for _ in range(permits):
+        with limiter:
+            times.append(time.monotonic())
+    return times
+
+
+def test_adaptive_limiter_never_issues_more_than_its_permits_in_a_window():
+    for permits in (3, 1, 0.5):
+        limiter = AdaptiveRateLimiter(window_seconds=0.2, window_permits=permits)
+        # Any `per_window` permits in a row are at least this far apart (a small limit spreads one permit over several windows)
+        per_window = max(1, int(permits))
+        spacing = 0.2 * per_window / permits
+        times = _issue_times(limiter, 5)
+        assert all(later - earlier >= spacing - 0.01 for earlier, later in zip(times, times[per_window:]))
+
+
+def test_adaptive_limiter_keeps_to_a_small_limiting_share():
+    # 10 permits scaled down to half a permit per window
+    limiter = RiotAPIRateLimiter(limiting_share=0.05, adaptive=True)
+    limiter.adjust_rate_limits_if_necessary([(10, 0.2)])
+    times = _issue_times(limiter, 3)
+    assert all(later - earlier >= 0.39 for earlier, later in zip(times, times[1:]))
+
+
+def test_adaptive_limiter_reconciles_against_its_share():
+    limiter = RiotAPIRateLimiter(limiting_share=0.5, adaptive=True)
+    limiter.adjust_rate_limits_if_necessary([(10, 1)])
+    # Other processes have used this process's half of the server's 10 permits
+    limiter.reconcile_counts([(10, 1)], [(5, 1)])
+    assert _time_permits(limiter, 1) > 0.1
+
+
+def test_fixed_limiter_ignores_server_counts():
+    limiter = RiotAPIRateLimiter(limiting_share=1.0)
+    limiter.adjust_rate_limits_if_necessary([(10, 1)])
+    limiter.reconcile_counts([(10, 1)], [(10, 1)])
+    assert _time_permits(limiter, 5) < 0.1
+
+
+def test_shared_limiters_draw_from_one_window(tmpdir):
+    path = str(tmpdir.join("application-1.limit"))
+    # Two limiters on one file behave like two processes sharing a key
+    first = SharedWindowRateLimiter(path, window_seconds=1, window_permits=5)
+    second = SharedWindowRateLimiter(path, window_seconds=1, window_permits=5)
+    assert _time_permits(first, 5) < 0.1
+    assert _time_permits(second, 1) > 0.5
+
+
+def test_shared_restriction_applies_to_every_limiter(tmpdir):
+    path = str(tmpdir.join("application-1.limit"))
+    first = SharedWindowRateLimiter(path, window_seconds=1, window_permits=5)
+    second = SharedWindowRateLimiter(path, window_seconds=1, window_permits=5)
+    first.restrict_for(0.3)
+    assert 0.2 < _time_permits(second, 1) < 0.6
+
+
+def test_shared_limiter_closes_its_file(tmpdir):
+    path = str(tmpdir.join("application-1.limit"))
+    limiter = SharedWindowRateLimiter(path, window_seconds=1, window_permits=5)
+    fd = limiter._fd
+    limiter.close()
+    limiter.close()
+    with pytest.raises(OSError):
+        os.fstat(fd)
+
+    limiter = SharedWindowRateLimiter(path, window_seconds=1, window_permits=5)
+    fd = limiter._fd
+    del limiter
+    gc.collect()
+    with pytest.raises(OSError):
+        os.fstat(fd)
+
+
+def _admission_order(arrivals):
+    # The first arrival takes the only permit in the window, so the rest queue up in the scheduler until it resets
+    scheduler = RequestScheduler(FixedWindowRateLimiter(window_seconds=0.2, window_permits=1))
+    order = []
+
+    def send(name, platform, bucket, priority):
+        with scheduler.limiter(platform, bucket, priority):
+            order.append(name)
+
+    threads = []
+    for arrival in arrivals:
+        threads.append(threading.Thread(target=send, args=arrival))
+        threads[-1].start()
+        time.sleep(0.02)
+    for thread in threads:
+        thread.join()
+    return order
+
+
+def test_scheduler_admits_interactive_requests_first():
+    na = Platform.north_america
+    order = _admission_order([("first", na, "matches", "background"),
+                              ("crawl 1", na, "matches", "background"),
+                              ("crawl 2", na, "matches", "background"),
+                              ("crawl 3", na, "matches", "background"),
+                              ("profile", na, "summoners", "interactive")])
+    # "crawl 1" was already waiting in the application limiter when the profile request arrived
+    assert order == ["first", "crawl 1", "profile", "crawl 2", "crawl 3"]
+
+
+def test_scheduler_shares_turns_between_platforms():
+    na, euw = Platform.north_america, Platform.europe_west
+    order = _admission_order([("first", na, "matches", "normal"),
+                              ("na 1", na, "matches", "normal"),
+                              ("na 2", na, "matches", "normal"),
+                              ("na 3", na, "matches", "normal"),
+                              ("euw", euw, "matches", "normal")])
+    assert order == ["first", "na 1", "euw", "na 2", "na 3"]
@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+import cassiopeia.core.common
+from cassiopeia.core.match import Match, MatchData, ParticipantStatsData
+
+
+def _match_dto(id=1):
+    # A full match DTO as the Riot API returns it, with made up values
+    stats = [name for name in ParticipantStatsData.__slots__ if name not in ("__dict__", "participantId")]
+    participants, identities = [], []
+    for pid in range(1, 11):
+        participant_stats = {name: pid for name in stats}
+        participant_stats["participantId"] = pid
+        participant_stats["win"] = pid <= 5
+        participants.append({"participantId": pid, "teamId": 100 if pid <= 5 else 200, "championId": pid, "spell1Id": 4, "spell2Id": 7,
+                             "highestAchievedSeasonTier": "GOLD", "stats": participant_stats, "masteries": [], "runes": [],
+                             "timeline": {"participantId": pid, "lane": "MIDDLE", "role": "SOLO",
+                                          "goldPerMinDeltas": {"0-10": 250.5, "10-20": 400.1}, "creepsPerMinDeltas": {"0-10": 6.1, "10-20": 7.2}}})
+        identities.append({"participantId": pid, "player": {"summonerId": 1000 + pid, "accountId": 2000 + pid, "summonerName": "Player {}".format(pid),
+                                                            "platformId": "NA1", "currentPlatformId": "NA1", "profileIcon": 7,
+                                                            "matchHistoryUri": "/v1/stats/player_history/NA1/{}".format(2000 + pid)}})
+    teams = [{"teamId": side, "win": "Win" if side == 100 else "Fail", "firstBlood": side == 100, "towerKills": 7, "bans": [{"championId": 20 + i, "pickTurn": i} for i in range(5)]}
+             for side in (100, 200)]
+    return {"gameId": id, "region": "NA", "platformId": "NA1", "gameCreation": 1510000000000, "gameDuration": 1800, "queueId": 420, "mapId": 11,
+            "seasonId": 9, "gameVersion": "7.22.206.3789", "gameMode": "CLASSIC", "gameType": "MATCHED_GAME",
+            "participants": participants, "participantIdentities": identities, "teams": teams}
+
+
+def _match():
+    return Match.from_data(MatchData(**_match_dto()))
+
+
+def test_to_json_matches_the_json_encoder(monkeypatch):
+    match = _match()
+    # The default output is the json module's, byte for byte, whatever else is installed
+    assert match.to_json() == json.dumps(match.to_dict(), cls=cassiopeia.core.common.CassiopeiaJsonEncoder)
+    assert '"duration": 1800' in match.to_json()
+    fast = json.loads(match.to_json(fast=True))
+    monkeypatch.setattr(cassiopeia.core.common, "orjson", None)
+    monkeypatch.setattr(cassiopeia.core.common, "ujson", None)
+    assert fast == json.loads(match.to_json())
+    assert fast["participants"][0]["side"] == "blue"
+    assert fast["creation"].startswith("2017-11-06")
+
+
+def test_to_dict_includes_slotted_and_nested_data():
+    d = _match().to_dict()
+    assert d["participants"][3]["stats"]["kills"] == 4
+    assert d["teams"][0]["bans"] == [20, 21, 22, 23, 24]
+
+
+def test_matches_share_static_data_instances():
+    first, second = _match(), _match()
+    assert first.participants[0].champion is second.participants[0].champion
+    assert first.participants[0].summoner_spell_d is second.participants[0].summoner_spell_d
+    assert first.blue_team.bans[0] is second.blue_team.bans[0]
+
+
+def test_shared_static_data_is_bounded(monkeypatch):
+    from cassiopeia import Champion, configuration
+    from cassiopeia.core.staticdata import common
+    monkeypatch.setattr(common, "INTERNED_MAX_ENTRIES", 3)
+    for id in range(1, 5):
+        common.interned(Champion, id=id, region="NA", version="1.1.1")
+    common.interned(Champion, id=2, region="NA", version="1.1.1")
+    common.interned(Champion, id=5, region="NA", version="1.1.1")
+    # The least recently used champions were dropped
+    assert [key[1] for key in common._interned[configuration.settings.pipeline] if key[2] == "1.1.1"] == [4, 2, 5]
@@ -0,0 +1,59 @@
+import time
+
+import pytest
+from datapipelines import NotFoundError
+
+from cassiopeia.data import Platform
+from cassiopeia.datastores import SQLiteStore
+from cassiopeia.dto.match import MatchDto
+from cassiopeia.dto.summoner import SummonerDto
+
+
+def test_matches_survive_a_restart(tmpdir):
+    path = str(tmpdir.join("cassiopeia.sqlite"))
+    store = SQLiteStore(path)
+    store.put(MatchDto, MatchDto({"gameId": 1, "region": "NA", "participants": [{"participantId": 1}]}))
+    store.close()
+
+    store = SQLiteStore(path)
+    match = store.get(MatchDto, {"platform": Platform.north_america, "id": 1})
+    assert isinstance(match, MatchDto)
+    assert match["participants"] == [{"participantId": 1}]
+    with pytest.raises(NotFoundError):
+        store.get(MatchDto, {"platform": Platform.north_america, "id": 2})
+
+
+def test_get_many_needs_every_item():
+    store = SQLiteStore(":memory:")
+    store.put_many(MatchDto, [MatchDto({"gameId": id, "region": "NA"}) for id in (1, 2)])
+    assert [match["gameId"] for match in store.get_many(MatchDto, {"platform": Platform.north_america, "ids": [2, 1]})] == [2, 1]
+    with pytest.raises(NotFoundError):
+        store.get_many(MatchDto, {"platform": Platform.north_america, "ids": [1, 3]})
+
+
+def test_summoners_are_found_by_any_identifier_until_they_expire():
+    store = SQLiteStore(":memory:", expirations={"SummonerDto": 0.05})
+    store.put(SummonerDto, SummonerDto({"id": 1, "accountId": 2, "name": "Kalturi", "region": "NA"}))
+    for query in ({"id": 1}, {"account.id": 2}, {"name": "Kalturi"}):
+        query["platform"] = Platform.north_america
+        assert store.get(SummonerDto, query)["id"] == 1
+    with pytest.raises(NotFoundError):
+        store.get(SummonerDto, {"platform": Platform.north_america, "account.id": 1})
+
+    time.sleep(0.1)
+    with pytest.raises(NotFoundError):
+        store.get(SummonerDto, {"platform": Platform.north_america, "id": 1})
+
+
+def test_batched_writes_are_visible_before_they_are_flushed(tmpdir):
+    path = str(tmpdir.join("cassiopeia.sqlite"))
+    store = SQLiteStore(path, batch_size=10, flush_interval=None)
+    reader = SQLiteStore(path)
+    for id in range(9):
+        store.put(MatchDto, MatchDto({"gameId": id, "region": "NA"}))
+    assert store.get(MatchDto, {"platform": Platform.north_america, "id": 8})["gameId"] == 8
+    with pytest.raises(NotFoundError):
+        reader.get(MatchDto, {"platform": Platform.north_america, "id": 8})
+
+    store.put(MatchDto, MatchDto({"gameId": 9, "region": "NA"}))
+    assert len(list(reader.get_many(MatchDto, {"platform": Platform.north_america, "ids": range(10)}))) == 10
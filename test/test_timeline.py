@@ -0,0 +1,103 @@
+from types import SimpleNamespace
+
+import pytest
+
+from cassiopeia.core.match import Timeline, TimelineData, ParticipantTimeline, ParticipantTimelineData, ParticipantData
+
+
+def _participant_frame(id, gold, position=True):
+    frame = {"participantId": id, "totalGold": gold, "currentGold": 100, "xp": 200, "minionsKilled": 4, "jungleMinionsKilled": 0, "level": 2}
+    if position:
+        frame["position"] = {"x": 100 * id, "y": 50 * id}
+    return frame
+
+
+def _timeline():
+    frames = [
+        {"timestamp": 0, "events": [],
+         "participantFrames": {str(id): _participant_frame(id, 500) for id in range(1, 11)}},
+        {"timestamp": 60000,
+         "events": [{"type": "ITEM_PURCHASED", "timestamp": 1234, "participantId": 3, "itemId": 1055},
+                    {"type": "CHAMPION_KILL", "timestamp": 59000, "killerId": 2, "victimId": 7, "assistingParticipantIds": [1], "position": {"x": 7, "y": 8}}],
+         "participantFrames": {str(id): _participant_frame(id, 600 + id, position=False) for id in range(1, 11)}}
+    ]
+    return Timeline.from_data(TimelineData(matchId=1, region="NA", frameInterval=60000, frames=frames))
+
+
+def test_participant_frames_array():
+    numpy = pytest.importorskip("numpy")
+    array = _timeline().participant_frames_array()
+    assert array.shape == (2, 10)
+    assert array["gold_earned"][1].tolist() == [601 + i for i in range(10)]
+    assert array["level"][1].sum() == 20
+    # The last frame has no positions
+    assert array["x"][:, 2].tolist() == [300, -1]
+
+
+def test_participant_frames_array_marks_missing_participants():
+    numpy = pytest.importorskip("numpy")
+    timeline = _timeline()
+    del timeline._data[TimelineData].frames[0].participantFrames[5]
+    array = timeline.participant_frames_array()
+    assert array["gold_earned"][:, 4].tolist() == [-1, 605]
+    assert array["level"][:, 4].tolist() == [-1, 2]
+
+
+def test_timeline_arrays_are_built_once():
+    numpy = pytest.importorskip("numpy")
+    timeline = _timeline()
+    assert timeline.participant_frames_array() is timeline.participant_frames_array()
+    assert timeline.events_table() is timeline.events_table()
+    with pytest.raises(ValueError):
+        timeline.events_table()["item_id"][0] = 1
+
+
+def test_events_table():
+    numpy = pytest.importorskip("numpy")
+    events = _timeline().events_table()
+    assert events["type"].tolist() == ["ITEM_PURCHASED", "CHAMPION_KILL"]
+    assert events["frame"].tolist() == [1, 1]
+    assert events["item_id"].tolist() == [1055, -1]
+    kill = events[events["type"] == "CHAMPION_KILL"][0]
+    assert (kill["killer_id"], kill["victim_id"], kill["x"], kill["y"]) == (2, 7, 7, 8)
+
+
+def _participant_timeline(timeline, id):
+    return ParticipantTimeline.from_data(ParticipantTimelineData(participantId=id), match=SimpleNamespace(timeline=timeline))
+
+
+def test_participant_events_are_indexed_by_role():
+    timeline = _timeline()
+    killer, victim, assister, buyer = (_participant_timeline(timeline, id) for id in (2, 7, 1, 3))
+    assert [event.victim_id for event in killer.champion_kills] == [7]
+    assert [event.killer_id for event in victim.champion_deaths] == [2]
+    assert len(assister.champion_assists) == 1 and not assister.champion_kills
+    assert [event.type for event in buyer.events] == ["ITEM_PURCHASED"]
+    # The index is only built once per timeline
+    assert killer.champion_kills[0] is victim.champion_deaths[0]
+
+
+def test_participant_frames_are_computed_once():
+    timeline = _timeline()
+    participant = _participant_timeline(timeline, 4)
+    frames = participant.frames
+    assert isinstance(frames, list)
+    assert [frame.gold_earned for frame in frames] == [500, 604]
+    assert participant.frames is frames
+    assert timeline.frames is timeline.frames
+    assert _participant_timeline(timeline, 11).frames == []
+
+
+def test_changing_participant_frames_does_not_change_the_timeline():
+    timeline = _timeline()
+    _participant_timeline(timeline, 4).frames.clear()
+    assert [frame.gold_earned for frame in _participant_timeline(timeline, 4).frames] == [500, 604]
+
+
+def test_slotted_data_keeps_unknown_fields_and_raises_for_missing_ones():
+    participant = ParticipantData(participantId=1, teamId=100, stats={"kills": 3, "someNewField": 1})
+    assert participant.id == 1 and participant.stats.kills == 3
+    assert participant.stats.someNewField == 1
+    with pytest.raises(AttributeError):
+        participant.championId
+    assert participant.to_dict()["stats"] == {"kills": 3, "someNewField": 1}